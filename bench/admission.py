@@ -0,0 +1,203 @@
+"""
+1 人の顧客が大量投入（bulk import）している横で、ほかの顧客のチェックアウトの
+レイテンシがどうなるかを、アドミッション制御の有無で比べる。
+
+bulk 顧客は --bulk-concurrency 本で投げ続け（429 / 503 は --bulk-backoff-ms 待って再送）、
+interactive 顧客は --customers 人がそれぞれ 1 本ずつ、--think-ms 間隔で注文する。
+各ポートに遅延を注入してスレッドプールを埋まりやすくしている。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.admission \
+    --target oop --target fp --duration 5 --admission 8:200:100:20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+from bench.loadgen import (
+    STOCKED_SKUS,
+    TARGETS,
+    AsgiClient,
+    TargetOptions,
+    percentile,
+)
+
+
+@dataclass(frozen=True)
+class ClassStats:
+    requests: int
+    ok_rps: float
+    p50_ms: float
+    p99_ms: float
+    statuses: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class FairnessReport:
+    target: str
+    admission: str | None
+    bulk: ClassStats
+    interactive: ClassStats
+
+
+def _body(customer: str) -> bytes:
+    payload = {
+        "customer_id": customer,
+        "payment_token": "tok_ok",
+        "lines": [{"sku": STOCKED_SKUS[0], "unit_price": "1200.00", "quantity": 1}],
+    }
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+async def _drive(
+    client: AsgiClient,
+    duration: float,
+    bulk_concurrency: int,
+    customers: int,
+    think_s: float,
+    backoff_s: float,
+) -> tuple[list[tuple[int, float]], list[tuple[int, float]]]:
+    stop = time.perf_counter() + duration
+    bulk: list[tuple[int, float]] = []
+    interactive: list[tuple[int, float]] = []
+
+    # アドミッション制御はボディの customer_id で顧客を見分ける
+    headers = (("content-type", "application/json"),)
+
+    async def one(body: bytes) -> tuple[int, float]:
+        t0 = time.perf_counter()
+        status, _ = await client.request("POST", "/orders", headers, body)
+        return status, time.perf_counter() - t0
+
+    async def bulk_worker() -> None:
+        body = _body("bulk")
+        while time.perf_counter() < stop:
+            status, latency = await one(body)
+            bulk.append((status, latency))
+            if status in (429, 503):
+                await asyncio.sleep(backoff_s)
+
+    async def interactive_worker(i: int) -> None:
+        body = _body(f"c-{i}")
+        while time.perf_counter() < stop:
+            interactive.append(await one(body))
+            await asyncio.sleep(think_s)
+
+    await asyncio.gather(
+        *(bulk_worker() for _ in range(bulk_concurrency)),
+        *(interactive_worker(i) for i in range(customers)),
+    )
+    return bulk, interactive
+
+
+def _stats(samples: list[tuple[int, float]], duration: float) -> ClassStats:
+    lat = sorted(latency * 1000 for _, latency in samples)
+    statuses = Counter(status for status, _ in samples)
+    return ClassStats(
+        requests=len(samples),
+        ok_rps=statuses.get(201, 0) / duration,
+        p50_ms=percentile(lat, 50),
+        p99_ms=percentile(lat, 99),
+        statuses=dict(sorted(statuses.items())),
+    )
+
+
+def run(
+    target: str,
+    admission: str | None,
+    faults: dict[str, str],
+    duration: float,
+    bulk_concurrency: int,
+    customers: int,
+    think_ms: float,
+    backoff_ms: float,
+) -> FairnessReport:
+    app = TARGETS[target](TargetOptions(faults=faults, admission=admission))
+    client = AsgiClient(app)
+    # StdoutEventPublisher 等の print が計測を支配しないよう捨てる
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        bulk, interactive = asyncio.run(
+            _drive(
+                client,
+                duration,
+                bulk_concurrency,
+                customers,
+                think_ms / 1000,
+                backoff_ms / 1000,
+            )
+        )
+    return FairnessReport(
+        target=target,
+        admission=admission,
+        bulk=_stats(bulk, duration),
+        interactive=_stats(interactive, duration),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.admission")
+    p.add_argument("--target", action="append", choices=sorted(TARGETS), default=None)
+    p.add_argument("--duration", type=float, default=5.0, help="秒")
+    p.add_argument("--bulk-concurrency", type=int, default=128)
+    p.add_argument("--bulk-backoff-ms", type=float, default=10.0)
+    p.add_argument("--customers", type=int, default=8, help="interactive 顧客の数")
+    p.add_argument("--think-ms", type=float, default=20.0)
+    p.add_argument(
+        "--admission",
+        default="8:200:100:20",
+        help="有効時の spec（同時実行:顧客ごとの rps:burst:目標待ち ms）",
+    )
+    p.add_argument(
+        "--fault",
+        action="append",
+        default=None,
+        metavar="PORT=SPEC",
+        help="1 呼び出しごとの遅延（既定: orders=fixed:10）",
+    )
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    faults = dict(f.split("=", 1) for f in (args.fault or ["orders=fixed:10"]))
+    reports = [
+        run(
+            target,
+            admission,
+            faults,
+            args.duration,
+            args.bulk_concurrency,
+            args.customers,
+            args.think_ms,
+            args.bulk_backoff_ms,
+        )
+        for target in (args.target or ["oop", "fp"])
+        for admission in (None, args.admission)
+    ]
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return 0
+    print(
+        f"{'target':<7}{'admission':<20}{'class':<12}{'reqs':>7}{'ok rps':>9}"
+        f"{'p50 ms':>9}{'p99 ms':>9}  statuses"
+    )
+    for r in reports:
+        for name, s in (("bulk", r.bulk), ("interactive", r.interactive)):
+            statuses = " ".join(f"{k}:{v}" for k, v in s.statuses.items())
+            print(
+                f"{r.target:<7}{r.admission or 'off':<20}{name:<12}{s.requests:>7}"
+                f"{s.ok_rps:>9.1f}{s.p50_ms:>9.2f}{s.p99_ms:>9.2f}  {statuses}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+oop の place_order の純粋な前処理（検証・明細の集計・冪等ハッシュ）を、その場（inline）・
+スレッド・プロセス・サブインタプリタ（Python 3.14+）のプールで行った場合を比べる。
+
+N 本のスレッドから place_order を直接呼び、明細の行数ごとに件数 / 秒と p50 / p99 を測る。
+GIL のあるビルドでは、前処理を別のプロセス / インタプリタに出さない限り同時に 1 本しか走らない。
+出した場合は前処理が並列になる代わりに、コマンドと結果の pickle と受け渡しが 1 件ごとに乗る。
+行数が少ないと受け渡しの方が重く、行数が多いほど並列の分が効く。
+interpreter はこのインタプリタに InterpreterPoolExecutor が無ければ飛ばす。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.cpu_pool \\
+    --lines 1 --lines 20 --lines 200 -t 8 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from decimal import Decimal
+from typing import Any
+
+from bench.loadgen import STOCKED_SKUS, percentile
+
+MODES = ("inline", "thread", "process", "interpreter")
+
+
+@dataclass(frozen=True)
+class PoolPoint:
+    lines: int
+    mode: str
+    orders_per_s: float
+    p50_ms: float
+    p99_ms: float
+    speedup: float  # 同じ行数の inline に対する比
+
+
+def _commands(lines: int, threads: int) -> list[list[Any]]:
+    from internal_api_oop.core.ports.inbound.place_order import (
+        PlaceOrderCommand,
+        PlaceOrderLine,
+    )
+
+    # スレッドごとに冪等キー付き / 無しを交互に 64 件ずつ用意して使い回す（キーは毎回変える）
+    return [
+        [
+            PlaceOrderCommand(
+                customer_id=f"c-{t}",
+                lines=[
+                    PlaceOrderLine(
+                        sku=STOCKED_SKUS[j % len(STOCKED_SKUS)],
+                        unit_price=Decimal(f"{100 + (i + j) % 900}.{j % 100:02d}"),
+                        quantity=1 + j % 3,
+                    )
+                    for j in range(lines)
+                ],
+                payment_token="tok_ok",
+            )
+            for i in range(64)
+        ]
+        for t in range(threads)
+    ]
+
+
+def run_point(
+    mode: str, lines: int, threads: int, workers: int, seconds: float
+) -> PoolPoint:
+    from internal_api_oop.bootstrap import build_usecases
+
+    uc = build_usecases(
+        stock_by_sku={sku: 10**15 for sku in STOCKED_SKUS},
+        authorize_workers=0,
+        cpu_pool=None if mode == "inline" else mode,  # type: ignore[arg-type]
+        cpu_workers=workers,
+    )
+    place_order = uc.place_order.place_order
+    commands = _commands(lines, threads)
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    placed = [0] * threads
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+
+    def worker(t: int) -> None:
+        mine = commands[t]
+        lat = latencies[t]
+        n = 0
+        start.wait()
+        while not stop.is_set():
+            cmd = mine[n % len(mine)]
+            if n & 1:
+                cmd = replace(cmd, idempotency_key=f"k-{t}-{n}")
+            t0 = time.perf_counter()
+            place_order(cmd)
+            lat.append(time.perf_counter() - t0)
+            n += 1
+        placed[t] = n
+
+    threads_ = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # プロセス / インタプリタの起動と import は計測に入れない
+        for cmd in commands[0][: workers * 4]:
+            place_order(cmd)
+        for th in threads_:
+            th.start()
+        start.wait()
+        started = time.perf_counter()
+        time.sleep(seconds)
+        stop.set()
+        for th in threads_:
+            th.join()
+        elapsed = time.perf_counter() - started
+    uc.close()
+
+    lat = sorted(x for per in latencies for x in per)
+    return PoolPoint(
+        lines,
+        mode,
+        sum(placed) / elapsed,
+        percentile(lat, 50) * 1000,
+        percentile(lat, 99) * 1000,
+        0.0,
+    )
+
+
+def _available(mode: str) -> bool:
+    return mode != "interpreter" or hasattr(concurrent.futures, "InterpreterPoolExecutor")
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.cpu_pool")
+    p.add_argument(
+        "--lines", type=int, action="append", default=None,
+        help="1 注文の明細行数（複数指定可、既定 1 / 20 / 200）",
+    )
+    p.add_argument("-t", "--threads", type=int, default=8, help="place_order を呼ぶスレッド数")
+    p.add_argument("--workers", type=int, default=4, help="プールの大きさ")
+    p.add_argument("--seconds", type=float, default=2.0)
+    p.add_argument("--mode", action="append", choices=MODES, default=None)
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    modes = [m for m in args.mode or MODES if _available(m)]
+    skipped = sorted(set(args.mode or MODES) - set(modes))
+    if skipped:
+        print(f"skipped (not available here): {', '.join(skipped)}", file=sys.stderr)
+    points: list[PoolPoint] = []
+    for lines in args.lines or [1, 20, 200]:
+        base = 0.0
+        for mode in modes:
+            pt = run_point(mode, lines, args.threads, args.workers, args.seconds)
+            if mode == "inline":
+                base = pt.orders_per_s
+            speedup = pt.orders_per_s / base if base else 0.0
+            points.append(PoolPoint(**(asdict(pt) | {"speedup": speedup})))
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(f"{'lines':>6}  {'mode':<12}{'orders/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'speedup':>9}")
+    for pt in points:
+        print(
+            f"{pt.lines:>6}  {pt.mode:<12}{pt.orders_per_s:>10.0f}{pt.p50_ms:>9.2f}"
+            f"{pt.p99_ms:>9.2f}{pt.speedup:>8.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+fp の POST /orders を、同期（def ルート + IOResult、スレッドプールで実行）と
+非同期（async def ルート + FutureResult、イベントループ上で待つ）で比べる。
+
+保存・発行に遅延を注入したシナリオでは、同期版はスレッドプールの枠（anyio 既定 40）で
+同時に待てる数が頭打ちになり、非同期版は同時接続数まで待てる。遅延なしのシナリオは
+スレッドの受け渡しが無くなる分の差だけが出る。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.fp_async \\
+    -n 3000 -c 16 -c 64 -c 256 --io fixed:10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+
+from bench.loadgen import TargetOptions, WorkloadMix, plan_workload, run_target
+
+
+@dataclass(frozen=True)
+class AsyncPoint:
+    io: str  # 保存・発行に注入した遅延（none なら注入なし）
+    concurrency: int
+    mode: str  # sync | async
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    speedup: float  # 同じ条件の sync に対するスループット比
+
+
+def run(n: int, concurrencies: list[int], io_specs: list[str]) -> list[AsyncPoint]:
+    mix = WorkloadMix(post=1.0, get=0.0, list=0.0, idempotency_key_ratio=0.0)
+    plan = plan_workload(mix, n, seed=1)
+    warmup = plan_workload(mix, max(1, n // 10), seed=2)
+    points: list[AsyncPoint] = []
+    for io in io_specs:
+        faults = {} if io == "none" else {"orders": io, "events": io}
+        for concurrency in concurrencies:
+            base = 0.0
+            for mode in ("sync", "async"):
+                options = TargetOptions(faults=faults, fp_async=mode == "async")
+                report = run_target("fp", "asgi", plan, concurrency, warmup, options)
+                if mode == "sync":
+                    base = report.throughput_rps
+                points.append(
+                    AsyncPoint(
+                        io,
+                        concurrency,
+                        mode,
+                        report.throughput_rps,
+                        report.p50_ms,
+                        report.p99_ms,
+                        report.throughput_rps / base if base else 0.0,
+                    )
+                )
+    return points
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.fp_async")
+    p.add_argument("-n", "--requests", type=int, default=3000)
+    p.add_argument(
+        "-c", "--concurrency", type=int, action="append", default=None,
+        help="同時接続数（複数指定可、既定 16 / 64 / 256）",
+    )
+    p.add_argument(
+        "--io", action="append", default=None,
+        help="保存・発行に注入する遅延（latency_injection の spec、none で注入なし。既定 none と fixed:10）",
+    )
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    points = run(
+        args.requests, args.concurrency or [16, 64, 256], args.io or ["none", "fixed:10"]
+    )
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(
+        f"{'io':<12}{'conc':>6}  {'mode':<7}{'rps':>10}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'speedup':>9}"
+    )
+    for pt in points:
+        print(
+            f"{pt.io:<12}{pt.concurrency:>6}  {pt.mode:<7}{pt.throughput_rps:>10.1f}"
+            f"{pt.p50_ms:>9.2f}{pt.p99_ms:>9.2f}{pt.speedup:>8.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+oop の place_order を N 本のスレッドから直接呼び、チェックアウトのスループットがスレッド数でどう伸びるかを測る。
+
+GIL のあるビルドでは Python のコードは同時に 1 本しか走らないので、スレッドを増やしても
+ほぼ伸びない（ロックの取り合いの分だけ落ちることもある）。free-threaded のビルド
+（python3.14t など）では、ストアのロックで並ばない限り本数に応じて伸びる。
+--python で別のインタプリタを指定すると、同じ計測をそのインタプリタでも走らせて並べる
+（子プロセスに --json で走らせて結果を読む）。
+
+--skus で注文の SKU を散らす本数を変えられる。1 なら全スレッドが同じ SKU の在庫を取り合う
+（在庫の枠ロックが 1 本に集中する）。
+計測後に「減った在庫 = 成功した注文数 = 保存された注文数」を確かめ、ずれたら consistent が False になる。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.free_threading \\
+    -t 1 -t 2 -t 4 -t 8 --seconds 2 --python python3.14t
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import sysconfig
+import threading
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+
+_STOCK = 10**12
+
+
+@dataclass(frozen=True)
+class ScalingPoint:
+    python: str  # 実装とバージョン（free-threaded なら末尾に t）
+    gil_enabled: bool
+    threads: int
+    skus: int
+    orders_per_s: float
+    speedup: float  # 同じインタプリタ・SKU 数の 1 スレッドに対する比
+    failures: int
+    consistent: bool
+
+
+def _build() -> tuple[str, bool]:
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    name = f"{platform.python_implementation()} {platform.python_version()}"
+    name += "t" if free_threaded else ""
+    # free-threaded でも PYTHON_GIL=1 や GIL 前提の拡張の読み込みで有効に戻ることがある
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return name, is_enabled() if is_enabled is not None else True
+
+
+def run_point(threads: int, skus: int, seconds: float) -> ScalingPoint:
+    from internal_api_oop.bootstrap import build_usecases
+    from internal_api_oop.core.ports.inbound.place_order import (
+        PlaceOrderCommand,
+        PlaceOrderLine,
+    )
+
+    names = [f"SKU-{i}" for i in range(skus)]
+    # 与信の並行実行はスレッドの受け渡しが支配的になるので外す
+    uc = build_usecases(
+        stock_by_sku={sku: _STOCK for sku in names}, authorize_workers=0
+    )
+    place_order = uc.place_order.place_order
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+    placed = [0] * threads
+    failed = [0] * threads
+
+    def worker(i: int) -> None:
+        n = ok = 0
+        start.wait()
+        while not stop.is_set():
+            # 半分は冪等キー付きにして、冪等性ストアの start / complete も通す
+            cmd = PlaceOrderCommand(
+                customer_id=f"c-{i}",
+                lines=[
+                    PlaceOrderLine(
+                        sku=names[(i + n) % skus], unit_price=Decimal("1200"), quantity=1
+                    )
+                ],
+                payment_token="tok_ok",
+                idempotency_key=f"k-{i}-{n}" if n & 1 else None,
+            )
+            ok += place_order(cmd).map(lambda _: 1).value_or(0)
+            n += 1
+        placed[i] = ok
+        failed[i] = n - ok
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for t in workers:
+            t.start()
+        start.wait()
+        started = time.perf_counter()
+        time.sleep(seconds)
+        stop.set()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    footprints = {fp.store: fp for fp in (f() for f in uc.footprints)}
+    saved = footprints["orders"].objects["orders"]
+    # 包むアダプタを指定していないので、deps.inventory は InMemoryInventory そのもの
+    stock = uc.place_order.deps.inventory.stock_by_sku  # type: ignore[attr-defined]
+    taken = sum(_STOCK - v for v in stock.values())
+    name, gil = _build()
+    return ScalingPoint(
+        name,
+        gil,
+        threads,
+        skus,
+        sum(placed) / elapsed,
+        0.0,
+        sum(failed),
+        taken == sum(placed) == saved,
+    )
+
+
+def run(threads: list[int], skus: list[int], seconds: float) -> list[ScalingPoint]:
+    points: list[ScalingPoint] = []
+    for s in skus:
+        base = 0.0
+        for t in sorted(threads):
+            pt = run_point(t, s, seconds)
+            base = base or pt.orders_per_s
+            speedup = pt.orders_per_s / base if base else 0.0
+            points.append(ScalingPoint(**(asdict(pt) | {"speedup": speedup})))
+    return points
+
+
+def _run_elsewhere(python: str, argv: list[str]) -> list[ScalingPoint]:
+    out = subprocess.run(
+        [python, "-m", "bench.free_threading", *argv, "--json"],
+        check=True,
+        stdout=subprocess.PIPE,  # エラーはそのまま端末に出す
+        text=True,
+    ).stdout
+    return [ScalingPoint(**pt) for pt in json.loads(out)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.free_threading")
+    p.add_argument(
+        "-t", "--threads", type=int, action="append", default=None,
+        help="スレッド数（複数指定可、既定 1 / 2 / 4 / 8）",
+    )
+    p.add_argument(
+        "--skus", type=int, action="append", default=None,
+        help="注文を散らす SKU の数（複数指定可、既定 64）",
+    )
+    p.add_argument("--seconds", type=float, default=2.0)
+    p.add_argument(
+        "--python", action="append", default=[],
+        help="同じ計測を走らせる別のインタプリタ（free-threaded のビルドなど、複数指定可）",
+    )
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    threads = args.threads or [1, 2, 4, 8]
+    skus = args.skus or [64]
+    points = run(threads, skus, args.seconds)
+    forwarded = [f"-t{t}" for t in threads] + [f"--skus={s}" for s in skus]
+    forwarded.append(f"--seconds={args.seconds}")
+    for python in args.python:
+        points += _run_elsewhere(python, forwarded)
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(
+        f"{'python':<20}{'gil':>5}{'skus':>6}{'threads':>8}{'orders/s':>11}"
+        f"{'speedup':>9}{'failed':>8}  consistent"
+    )
+    for pt in points:
+        print(
+            f"{pt.python:<20}{'on' if pt.gil_enabled else 'off':>5}{pt.skus:>6}"
+            f"{pt.threads:>8}{pt.orders_per_s:>11.0f}{pt.speedup:>8.2f}x"
+            f"{pt.failures:>8}  {pt.consistent}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+oop の POST /orders のボディの取り込みを、従来の経路（model：FastAPI が json.loads して PlaceOrderRequest /
+PlaceOrderLineIn を作り、PlaceOrderCommand に写し直す）と、create_app(raw_json_ingest=True) の経路
+（raw：バイト列を TypeAdapter.validate_json で 1 度に PlaceOrderLine まで作る）で比べる。
+
+1. 同値性：不正なボディ・ヘッダの組を両方のアプリに送り、ステータスと応答のボディ（400 のエラーの
+   type / loc / msg / input / 並び）が一致するかを見る。正しいボディでは作られるコマンドが一致するかも見る
+   （一致しなければ終了コード 1）。
+2. 取り込みのコスト：明細の行数ごとに、ボディのバイト列から明細のタプルまでの時間（parse）と、
+   プロセス内 ASGI で POST /orders を 1 件通す時間（request）を、交互に走らせて最速の回で比べる。
+
+例:
+  PYTHONPATH=internal-api-oop/src python -m bench.json_ingest --sizes 1,10,100,1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+from bench.loadgen import AsgiClient
+
+SKUS = 50
+_CT = "application/json"
+_JSON = (("content-type", _CT),)
+_TIMEOUT = "X-Request-Timeout-Ms"
+
+
+@dataclass(frozen=True)
+class Equivalence:
+    case: str
+    status: int | str  # model 側のステータス（応答の前に例外が出たらその型名）
+    same: bool
+
+
+@dataclass(frozen=True)
+class IngestPoint:
+    lines: int
+    stage: str  # parse | request
+    path: str  # model | raw
+    per_request_us: float
+    speedup: float  # model に対する比
+
+
+def make_body(lines: int) -> bytes:
+    return json.dumps(
+        {
+            "customer_id": "c-bench",
+            "payment_token": "tok_ok",
+            "lines": [
+                {"sku": f"SKU-{i % SKUS}", "unit_price": "1.25", "quantity": 1 + i % 3}
+                for i in range(lines)
+            ],
+        }
+    ).encode("utf-8")
+
+
+def build_app(raw: bool) -> Any:
+    from internal_api_oop.adapters.inbound.web.fastapi_app import create_app
+    from internal_api_oop.bootstrap import build_usecases
+
+    uc = build_usecases(
+        stock_by_sku={f"SKU-{i}": 10**12 for i in range(SKUS)}, authorize_workers=0
+    )
+    return create_app(
+        uc.place_order,
+        uc.get_order,
+        uc.list_orders,
+        uc.customer_summary,
+        raw_json_ingest=raw,
+    )
+
+
+# ---- equivalence ----------------------------------------------------------------
+
+_LINE = '{"sku":"SKU-1","unit_price":"1200","quantity":1}'
+_OK = '{"customer_id":"c","payment_token":"tok_ok","lines":[%s]}' % _LINE
+
+# (名前, ボディ, ヘッダ)
+CASES: tuple[tuple[str, bytes, tuple[tuple[str, str], ...]], ...] = (
+    ("empty", b"", _JSON),
+    ("empty_bad_timeout", b"", (*_JSON, (_TIMEOUT, "0"))),
+    ("truncated", _OK[:-3].encode(), _JSON),
+    ("truncated_bad_timeout", _OK[:-3].encode(), (*_JSON, (_TIMEOUT, "x"))),
+    ("not_utf8", b'{"customer_id":"\xff"}', _JSON),
+    ("nan", _OK.replace('"1200"', "NaN").encode(), _JSON),
+    ("array", b"[1]", _JSON),
+    ("null", b"null", _JSON),
+    ("empty_object", b"{}", _JSON),
+    ("no_lines", b'{"customer_id":"c","payment_token":"t","lines":[]}', _JSON),
+    ("lines_not_list", b'{"customer_id":"c","payment_token":"t","lines":{}}', _JSON),
+    ("line_not_object", b'{"customer_id":"c","payment_token":"t","lines":[1,"x"]}', _JSON),
+    ("blank_ids", b'{"customer_id":"","payment_token":"","lines":[]}', _JSON),
+    ("ids_not_str", b'{"customer_id":1,"payment_token":null,"lines":[]}', _JSON),
+    ("bad_timeout_and_body", b'{"customer_id":"","lines":[]}', (*_JSON, (_TIMEOUT, "-5"))),
+    ("bad_timeout_only", _OK.encode(), (*_JSON, (_TIMEOUT, "1.5"))),
+)
+_BAD_LINES = (
+    ('{"sku":"","unit_price":"0","quantity":0}', "line_all_bad"),
+    ('{"unit_price":"1"}', "line_missing"),
+    ('{"sku":1,"unit_price":"abc","quantity":"2x"}', "line_wrong_types"),
+    ('{"sku":"a","unit_price":-1.5,"quantity":1.5}', "line_negative_fraction"),
+    ('{"sku":"a","unit_price":1e400,"quantity":1}', "line_inf_price"),
+    ('{"sku":"a","unit_price":true,"quantity":true}', "line_bools"),
+    ('{"sku":"a","unit_price":[],"quantity":{}}', "line_containers"),
+    ('{"sku":"a","unit_price":"1","quantity":1' + "0" * 22 + "}", "line_huge_qty"),
+)
+CASES += tuple(
+    (
+        name,
+        b'{"customer_id":"c","payment_token":"t","lines":[%s,%s]}'
+        % (_LINE.encode(), ln.encode()),
+        _JSON,
+    )
+    for ln, name in _BAD_LINES
+)
+# 受け付けるべきボディ（作られるコマンドを比べる）
+VALID: tuple[tuple[str, bytes, str], ...] = (
+    ("plain", _OK.encode(), _CT),
+    ("json_charset", _OK.encode(), "application/json; charset=utf-8"),
+    ("vendor_json", _OK.encode(), "application/vnd.orders+json"),
+    ("float_prices", _OK.replace('"1200"', "1E+3").encode(), _CT),
+    ("tiny_price", _OK.replace('"1200"', "0.1").encode(), _CT),
+    ("extra_keys", _OK.replace('"c"', '"c","x":[1]').encode(), _CT),
+    ("duplicate_keys", _OK.replace('"c"', '"a","customer_id":"c"').encode(), _CT),
+    ("utf16", _OK.encode("utf-16"), _CT),
+    ("str_quantity", _OK.replace('"quantity":1', '"quantity":"3"').encode(), _CT),
+)
+
+
+async def _call(client: AsgiClient, body: bytes, headers: Any) -> tuple[Any, Any]:
+    try:
+        status, payload = await client.request("POST", "/orders", headers, body)
+    except Exception as e:
+        return type(e).__name__, None
+    try:
+        return status, json.loads(payload)
+    except ValueError:
+        return status, payload
+
+
+def _model_lines(body: bytes) -> tuple:
+    from internal_api_oop.adapters.inbound.web.fastapi_app import PlaceOrderRequest
+
+    req = PlaceOrderRequest.model_validate(json.loads(body), from_attributes=True)
+    return req.customer_id, req.payment_token, tuple(
+        (ln.sku, ln.unit_price, ln.quantity) for ln in req.lines
+    )
+
+
+def _raw_lines(body: bytes, content_type: str) -> tuple:
+    from internal_api_oop.adapters.inbound.web.fastapi_app import parse_place_order
+
+    customer_id, payment_token, lines = parse_place_order(body, content_type)
+    return customer_id, payment_token, tuple(
+        (ln.sku, ln.unit_price, ln.quantity) for ln in lines
+    )
+
+
+def check_equivalence() -> list[Equivalence]:
+    model, raw = AsgiClient(build_app(False)), AsgiClient(build_app(True))
+    checks: list[Equivalence] = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, body, headers in CASES:
+            ref = asyncio.run(_call(model, body, headers))
+            got = asyncio.run(_call(raw, body, headers))
+            checks.append(Equivalence(name, ref[0], ref == got))
+    for name, body, content_type in VALID:
+        ref_cmd = _model_lines(body)
+        got_cmd = _raw_lines(body, content_type)
+        # Decimal は 1000 と 1.0E+3 を等しいとみなすので、冪等ハッシュに効く綴りまで比べる
+        same = ref_cmd == got_cmd and repr(ref_cmd) == repr(got_cmd)
+        checks.append(Equivalence(name, 201, same))
+    return checks
+
+
+# ---- cost -------------------------------------------------------------------------
+
+
+def _parsers(lines: int) -> dict[str, Callable[[int], Any]]:
+    from internal_api_oop.adapters.inbound.web.fastapi_app import (
+        PlaceOrderRequest,
+        parse_place_order,
+    )
+    from internal_api_oop.core.ports.inbound.place_order import PlaceOrderLine
+
+    body = make_body(lines)
+
+    def model(n: int) -> None:
+        for _ in range(n):
+            # FastAPI がルートの前にやることと、ルートでの写し替え
+            req = PlaceOrderRequest.model_validate(
+                json.loads(body), from_attributes=True
+            )
+            tuple(
+                PlaceOrderLine(
+                    sku=ln.sku, unit_price=ln.unit_price, quantity=ln.quantity
+                )
+                for ln in req.lines
+            )
+
+    def raw(n: int) -> None:
+        for _ in range(n):
+            parse_place_order(body, "application/json")
+
+    return {"model": model, "raw": raw}
+
+
+def _requests(lines: int) -> dict[str, Callable[[int], Any]]:
+    body = make_body(lines)
+    runners: dict[str, Callable[[int], Any]] = {}
+    for path in ("model", "raw"):
+        client = AsgiClient(build_app(path == "raw"))
+
+        async def many(n: int, client: AsgiClient = client) -> None:
+            for _ in range(n):
+                status, payload = await client.request("POST", "/orders", _JSON, body)
+                if status != 201:
+                    raise RuntimeError(payload[:300].decode("utf-8", "replace"))
+
+        # イベントループは回ごとに 1 つ（リクエストごとに作るとその分が支配的になる）
+        runners[path] = lambda n, many=many: asyncio.run(many(n))
+    return runners
+
+
+def measure(sizes: list[int], budget: int) -> list[IngestPoint]:
+    points: list[IngestPoint] = []
+    for lines in sizes:
+        for stage, make in (("parse", _parsers), ("request", _requests)):
+            runners = make(lines)
+            # 行数に関わらず 1 回の計測が同じくらいの明細数になるように回す
+            chunk = max(1, budget // lines // (10 if stage == "request" else 1))
+            best = {p: float("inf") for p in runners}
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                for _ in range(5):
+                    for path, run in runners.items():
+                        started = time.perf_counter()
+                        run(chunk)
+                        elapsed = time.perf_counter() - started
+                        best[path] = min(best[path], elapsed / chunk)
+            for path in runners:
+                points.append(
+                    IngestPoint(
+                        lines, stage, path, best[path] * 1e6, best["model"] / best[path]
+                    )
+                )
+    return points
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.json_ingest")
+    p.add_argument("--sizes", default="1,10,100,1000")
+    p.add_argument(
+        "--budget", type=int, default=20_000, help="1 回の計測で処理する明細の目安"
+    )
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    checks = check_equivalence()
+    points = measure([int(n) for n in args.sizes.split(",")], args.budget)
+    ok = all(c.same for c in checks)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "equivalence": [asdict(c) for c in checks],
+                    "cost": [asdict(pt) for pt in points],
+                },
+                indent=2,
+            )
+        )
+        return 0 if ok else 1
+    print(f"{'case':<26}{'status':>12}{'same':>7}")
+    for c in checks:
+        print(f"{c.case:<26}{c.status!s:>12}{c.same!s:>7}")
+    print()
+    print(f"{'lines':>7}  {'stage':<9}{'path':<7}{'µs/req':>11}{'speedup':>9}")
+    for pt in points:
+        print(
+            f"{pt.lines:>7}  {pt.stage:<9}{pt.path:<7}"
+            f"{pt.per_request_us:>11.1f}{pt.speedup:>8.2f}x"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
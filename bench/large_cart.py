@@ -0,0 +1,187 @@
+"""
+大口注文（明細 1k / 10k / 100k 行）の POST にかかる時間とピークメモリ。
+
+  /orders        Pydantic で明細リスト全体を組み立ててから処理する従来経路
+  /orders/large  ボディを逐次パースし、明細を 1 パスで検証・集計する経路
+
+先に、"lines" が重複したボディなどを両方に送り、ステータスが一致するかを見る
+（一致しなければ終了コード 1）。
+
+例:
+  PYTHONPATH=internal-api-oop/src python -m bench.large_cart --sizes 1000,10000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from bench.loadgen import AsgiClient
+
+SKUS = 500  # 明細は SKU-0..SKU-499 を巡回する（＝重複 SKU を多く含む）
+
+
+@dataclass(frozen=True)
+class Equivalence:
+    case: str
+    status: int  # /orders 側のステータス
+    same: bool
+
+
+@dataclass(frozen=True)
+class CartResult:
+    path: str
+    lines: int
+    status: int
+    best_ms: float
+    mean_ms: float
+    peak_mib: float
+
+
+def make_body(lines: int) -> bytes:
+    return json.dumps(
+        {
+            "customer_id": "c-b2b",
+            "payment_token": "tok_ok",
+            "lines": [
+                {"sku": f"SKU-{i % SKUS}", "unit_price": "1.25", "quantity": 1 + i % 3}
+                for i in range(lines)
+            ],
+        }
+    ).encode("utf-8")
+
+
+def build_app() -> Any:
+    from internal_api_oop.adapters.inbound.web.fastapi_app import create_app
+    from internal_api_oop.bootstrap import build_usecases
+
+    uc = build_usecases(stock_by_sku={f"SKU-{i}": 10**12 for i in range(SKUS)})
+    return create_app(
+        uc.place_order,
+        uc.get_order,
+        uc.list_orders,
+        uc.customer_summary,
+        metrics_sources=uc.metrics,
+    )
+
+
+async def _post(client: AsgiClient, path: str, body: bytes) -> int:
+    status, payload = await client.request(
+        "POST", path, (("content-type", "application/json"),), body
+    )
+    if status != 201:
+        print(payload[:300].decode("utf-8", "replace"), file=sys.stderr)
+    return status
+
+
+_LINE = '{"sku":"SKU-1","unit_price":"1.25","quantity":1}'
+_HEAD = '{"customer_id":"c-b2b","payment_token":"tok_ok",'
+# 重複したキーは json.loads と同じく後勝ち
+CASES: tuple[tuple[str, bytes], ...] = tuple(
+    (name, (_HEAD + rest).encode())
+    for name, rest in (
+        ("lines_then_empty", f'"lines":[{_LINE}],"lines":[]}}'),
+        ("empty_then_lines", f'"lines":[],"lines":[{_LINE}]}}'),
+        ("bad_then_lines", f'"lines":[{{"sku":""}}],"lines":[{_LINE}]}}'),
+        ("lines_then_null", f'"lines":[{_LINE}],"lines":null}}'),
+        ("null_then_lines", f'"lines":null,"lines":[{_LINE}]}}'),
+    )
+)
+
+
+def check_equivalence() -> list[Equivalence]:
+    client = AsgiClient(build_app())
+    checks: list[Equivalence] = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name, body in CASES:
+            ref, got = (
+                asyncio.run(
+                    client.request(
+                        "POST", path, (("content-type", "application/json"),), body
+                    )
+                )[0]
+                for path in ("/orders", "/orders/large")
+            )
+            checks.append(Equivalence(name, ref, ref == got))
+    return checks
+
+
+def measure(path: str, lines: int, repeat: int, chunk_size: int) -> CartResult:
+    app = build_app()
+    client = AsgiClient(app, chunk_size=chunk_size)
+    body = make_body(lines)
+
+    timings: list[float] = []
+    status = 0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            status = asyncio.run(_post(client, path, body))
+            timings.append(time.perf_counter() - t0)
+
+        # ピークメモリは別に 1 回だけ測る（tracemalloc 自体が遅いため）
+        tracemalloc.start()
+        asyncio.run(_post(client, path, body))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return CartResult(
+        path=path,
+        lines=lines,
+        status=status,
+        best_ms=min(timings) * 1000,
+        mean_ms=sum(timings) / len(timings) * 1000,
+        peak_mib=peak / 2**20,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.large_cart")
+    p.add_argument("--sizes", default="1000,10000,100000")
+    p.add_argument("--paths", default="/orders,/orders/large")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--chunk-size", type=int, default=64 * 1024)
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    checks = check_equivalence()
+    ok = all(c.same for c in checks)
+    results = [
+        measure(path, int(n), args.repeat, args.chunk_size)
+        for n in args.sizes.split(",")
+        for path in args.paths.split(",")
+    ]
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "equivalence": [asdict(c) for c in checks],
+                    "results": [asdict(r) for r in results],
+                },
+                indent=2,
+            )
+        )
+        return 0 if ok else 1
+    print(f"{'case':<20}{'status':>8}{'same':>7}")
+    for c in checks:
+        print(f"{c.case:<20}{c.status:>8}{c.same!s:>7}")
+    print()
+    print(f"{'path':<15}{'lines':>8}{'status':>8}{'best ms':>10}{'mean ms':>10}{'peak MiB':>10}")
+    for r in results:
+        print(
+            f"{r.path:<15}{r.lines:>8}{r.status:>8}{r.best_ms:>10.1f}"
+            f"{r.mean_ms:>10.1f}{r.peak_mib:>10.1f}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
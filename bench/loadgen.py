@@ -0,0 +1,903 @@
+"""
+internal_api_oop / internal_api_fp を同一ワークロードで叩く負荷生成ハーネス。
+
+transport:
+  asgi   … プロセス内で ASGI app を直接呼ぶ（ネットワーク・サーバのコストを除外）
+  socket … uvicorn をスレッドで起動し、127.0.0.1 の keep-alive 接続で叩く
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src \\
+    python -m bench.loadgen --target oop --target fp --transport asgi -n 5000 -c 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Iterator, Literal, Mapping, Protocol, Sequence
+from uuid import uuid4
+
+Op = Literal["post", "retry", "get", "list"]
+
+OK_TOKEN = "tok_ok"
+DECLINED_TOKEN = "tok_declined"
+STOCKED_SKUS = ("SKU-1", "SKU-2")
+OUT_OF_STOCK_SKU = "SKU-OOS"
+
+
+# ---- workload ----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class WorkloadMix:
+    post: float = 0.6
+    get: float = 0.3
+    list: float = 0.1
+    idempotency_key_ratio: float = 0.5  # POST のうち Idempotency-Key を付ける割合
+    retry_ratio: float = 0.1  # キー付き POST を同じキー・同じ本文で再送する割合
+    out_of_stock_ratio: float = 0.05
+    declined_ratio: float = 0.05
+    lines_per_order: int = 2
+    customers: int = 100
+
+
+@dataclass(frozen=True)
+class PlannedRequest:
+    op: Op
+    method: str
+    path: str
+    headers: tuple[tuple[str, str], ...] = ()
+    body: bytes = b""
+    pick: float = 0.0  # get: 作成済み order_id のどれを読むか（実行時に解決）
+
+
+def plan_workload(mix: WorkloadMix, n: int, seed: int) -> list[PlannedRequest]:
+    """seed が同じなら oop / fp に全く同じリクエスト列を流せる。"""
+    rng = random.Random(seed)
+    weights = (mix.post, mix.get, mix.list)
+    plan: list[PlannedRequest] = []
+
+    while len(plan) < n:
+        op = rng.choices(("post", "get", "list"), weights=weights)[0]
+        customer = f"c-{rng.randrange(mix.customers)}"
+
+        if op == "get":
+            plan.append(PlannedRequest("get", "GET", "", pick=rng.random()))
+            continue
+
+        if op == "list":
+            query = f"limit=50&sort_by={rng.choice(('created_at', 'total'))}"
+            if rng.random() < 0.5:
+                query += f"&customer_id={customer}"
+            plan.append(PlannedRequest("list", "GET", f"/orders?{query}"))
+            continue
+
+        body = _order_body(rng, mix, customer)
+        headers: tuple[tuple[str, str], ...] = (("content-type", "application/json"),)
+        keyed = rng.random() < mix.idempotency_key_ratio
+        if keyed:
+            headers += (("idempotency-key", f"k-{rng.getrandbits(64):016x}"),)
+        plan.append(PlannedRequest("post", "POST", "/orders", headers, body))
+
+        if keyed and rng.random() < mix.retry_ratio:
+            plan.append(PlannedRequest("retry", "POST", "/orders", headers, body))
+
+    return plan[:n]
+
+
+def _order_body(rng: random.Random, mix: WorkloadMix, customer: str) -> bytes:
+    token = DECLINED_TOKEN if rng.random() < mix.declined_ratio else OK_TOKEN
+    lines = [
+        {
+            "sku": rng.choice(STOCKED_SKUS),
+            "unit_price": f"{rng.randrange(100, 5000)}.00",
+            "quantity": rng.randrange(1, 4),
+        }
+        for _ in range(mix.lines_per_order)
+    ]
+    if rng.random() < mix.out_of_stock_ratio:
+        lines[-1]["sku"] = OUT_OF_STOCK_SKU
+    payload = {"customer_id": customer, "payment_token": token, "lines": lines}
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+# ---- transports ----------------------------------------------------------------
+
+
+class Client(Protocol):
+    async def request(
+        self, method: str, path: str, headers: Sequence[tuple[str, str]], body: bytes
+    ) -> tuple[int, bytes]: ...
+
+    async def aclose(self) -> None: ...
+
+
+class AsgiClient:
+    """ASGI app をプロセス内で直接呼び出す（1 リクエスト = 1 scope）。"""
+
+    def __init__(self, app: Any, chunk_size: int | None = None) -> None:
+        self._app = app
+        self._chunk_size = chunk_size  # 指定するとボディをこの大きさに分けて渡す
+
+    async def request(
+        self, method: str, path: str, headers: Sequence[tuple[str, str]], body: bytes
+    ) -> tuple[int, bytes]:
+        raw_path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": raw_path,
+            "raw_path": raw_path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": [
+                (k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers
+            ]
+            + [(b"content-length", str(len(body)).encode("latin-1"))],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        step = self._chunk_size or max(len(body), 1)
+        offset = 0
+        done = False
+        status = 0
+        chunks: list[bytes] = []
+
+        async def receive() -> dict[str, Any]:
+            nonlocal offset, done
+            if not done:
+                part = body[offset : offset + step]
+                offset += step
+                done = offset >= len(body)
+                return {"type": "http.request", "body": part, "more_body": not done}
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self._app(scope, receive, send)
+        return status, b"".join(chunks)
+
+    async def aclose(self) -> None:
+        return None
+
+
+class SocketClient:
+    """最小限の HTTP/1.1 keep-alive クライアント（1 worker = 1 接続）。"""
+
+    def __init__(self, host: str, port: int) -> None:
+        self._host = host
+        self._port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(
+        self, method: str, path: str, headers: Sequence[tuple[str, str]], body: bytes
+    ) -> tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self._host, self._port
+            )
+        assert self._reader is not None
+
+        head = [f"{method} {path} HTTP/1.1", f"host: {self._host}:{self._port}"]
+        head += [f"{k}: {v}" for k, v in headers]
+        head.append(f"content-length: {len(body)}")
+        self._writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        status = int(status_line.split()[1])
+        length, chunked, close = 0, False, False
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                close = value == "close"
+
+        data = await self._read_chunked() if chunked else await self._reader.readexactly(length)
+        if close:
+            await self.aclose()
+        return status, data
+
+    async def _read_chunked(self) -> bytes:
+        assert self._reader is not None
+        parts: list[bytes] = []
+        while True:
+            size = int((await self._reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await self._reader.readline()
+                return b"".join(parts)
+            parts.append(await self._reader.readexactly(size))
+            await self._reader.readline()
+
+    async def aclose(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            with contextlib.suppress(Exception):
+                await self._writer.wait_closed()
+        self._reader = self._writer = None
+
+
+class LocalServer:
+    """uvicorn を別スレッドで起動する（ポートは OS に割り当てさせる）。"""
+
+    def __init__(self, app: Any) -> None:
+        import uvicorn
+
+        # proto を明示しないと asyncio が受け付けた接続に TCP_NODELAY を付けず、
+        # delayed ACK で 1 往復 ~40ms 待たされる
+        self._sock = socket.socket(
+            socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP
+        )
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self.host, self.port = self._sock.getsockname()[:2]
+
+        config = uvicorn.Config(app, log_level="warning", access_log=False, lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._sock]}, daemon=True
+        )
+
+    def __enter__(self) -> "LocalServer":
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("local server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+        self._sock.close()
+
+
+# ---- targets -------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class TargetOptions:
+    """アプリ組み立て時の差し替え指定（fp は対応するポートが無いものを無視する）。"""
+
+    faults: Mapping[str, str] = field(default_factory=dict)  # port -> fault spec
+    fault_seed: int = 0
+    resilience: Mapping[str, str] = field(default_factory=dict)  # port -> policy spec
+    payment_url: str | None = None  # 外部決済（HTTP）の接続先
+    authorize_workers: int = 32  # 0 なら在庫の仮押さえ → 与信を逐次に行う
+    batch_window_ms: float = 0.0  # > 0 で PlaceOrder をまとめ処理にする
+    batch_max: int = 64
+    read_model: bool = False  # get / list を OrderPlaced で投影した読み取りモデルから返す
+    event_bus_workers: int = 0  # > 0 で OrderPlaced をイベントバス経由で非同期に配る
+    admission: str | None = None  # アドミッション制御の spec（oop / fp 共通）
+    profile_dir: str | None = None  # 指定するとリクエスト単位のプロファイルを書く
+    profile_rate: float = 0.0
+    profile_mode: Literal["deterministic", "sampling"] = "deterministic"
+    trace_ratio: float | None = None  # 指定するとトレーシングを有効にする（head sampling の割合）
+    trace_out: str | None = None  # span の NDJSON 出力先（未指定ならメモリ上のリングバッファ）
+    diagnostics_token: str | None = None  # 指定すると /debug/memory/* を有効にする（oop のみ）
+    alloc_sample_rate: float = 0.0  # tracemalloc 有効時にリクエスト単位の確保量を取る割合
+    runtime_metrics: bool = False  # GC の停止・ループの遅れ・スレッドプールを /metrics に出す
+    freeze_heap: bool = False  # 組み立て後のヒープを gc.freeze する（runtime_metrics も有効になる）
+    fp_async: bool = False  # fp の POST /orders を async def + FutureResult の経路にする
+    fp_order_store: Literal["dict", "persistent"] = "dict"
+    # 検証・明細の集計・冪等ハッシュを投げるプール（oop のみ。interpreter は Python 3.14+）
+    cpu_pool: Literal["thread", "process", "interpreter"] | None = None
+    cpu_workers: int = 4
+    raw_json_ingest: bool = False  # oop の POST /orders をバイト列から直接コマンドにする
+
+
+def build_oop_app(options: TargetOptions) -> Any:
+    from internal_api_oop.adapters.inbound.web.admission import (
+        AdmissionController,
+        parse_admission,
+    )
+    from internal_api_oop.adapters.inbound.web.diagnostics import (
+        DiagnosticsPolicy,
+        MemoryDiagnostics,
+    )
+    from internal_api_oop.adapters.inbound.web.fastapi_app import create_app
+    from internal_api_oop.adapters.inbound.web.profiling import (
+        ProfilingPolicy,
+        RequestProfiler,
+    )
+    from internal_api_oop.adapters.inbound.web.runtime import (
+        RuntimeMonitor,
+        RuntimePolicy,
+    )
+    from internal_api_oop.adapters.outbound.event_bus import SubscriberPolicy
+    from internal_api_oop.adapters.outbound.latency_injection import parse_profile
+    from internal_api_oop.adapters.outbound.resilience import parse_policy
+    from internal_api_oop.adapters.tracing import TracingPolicy
+    from internal_api_oop.bootstrap import build_usecases
+    from internal_api_oop.core.domain.service.batching_place_order_service import (
+        BatchPolicy,
+    )
+
+    # 負荷試験中に在庫切れで全件 409 にならないよう十分な在庫を積む
+    uc = build_usecases(
+        stock_by_sku={sku: 10**12 for sku in STOCKED_SKUS},
+        faults={port: parse_profile(spec) for port, spec in options.faults.items()},
+        fault_seed=options.fault_seed,
+        resilience={
+            port: parse_policy(spec) for port, spec in options.resilience.items()
+        },
+        payment_url=options.payment_url,
+        authorize_workers=options.authorize_workers,
+        batch=(
+            BatchPolicy(
+                window_seconds=options.batch_window_ms / 1000,
+                max_batch=options.batch_max,
+            )
+            if options.batch_window_ms > 0
+            else None
+        ),
+        read_model=options.read_model,
+        event_bus=(
+            SubscriberPolicy(workers=options.event_bus_workers)
+            if options.event_bus_workers > 0
+            else None
+        ),
+        tracing=(
+            TracingPolicy(**_tracing_kwargs(options))
+            if options.trace_ratio is not None
+            else None
+        ),
+        cpu_pool=options.cpu_pool,
+        cpu_workers=options.cpu_workers,
+    )
+    return create_app(
+        uc.place_order,
+        uc.get_order,
+        uc.list_orders,
+        uc.customer_summary,
+        metrics_sources=uc.metrics,
+        admission=(
+            AdmissionController(parse_admission(options.admission))
+            if options.admission
+            else None
+        ),
+        profiler=(
+            RequestProfiler(
+                ProfilingPolicy(
+                    options.profile_dir,
+                    sample_rate=options.profile_rate,
+                    mode=options.profile_mode,
+                )
+            )
+            if options.profile_dir
+            else None
+        ),
+        tracer=uc.tracer,
+        diagnostics=(
+            MemoryDiagnostics(
+                DiagnosticsPolicy(
+                    options.diagnostics_token,
+                    sample_rate=options.alloc_sample_rate,
+                ),
+                stores=uc.footprints,
+            )
+            if options.diagnostics_token
+            else None
+        ),
+        runtime=(
+            RuntimeMonitor(RuntimePolicy(freeze_heap=options.freeze_heap))
+            if options.runtime_metrics or options.freeze_heap
+            else None
+        ),
+        raw_json_ingest=options.raw_json_ingest,
+        on_shutdown=(uc.close,),
+    )
+
+
+def build_fp_app(options: TargetOptions) -> Any:
+    from internal_api_fp.adapters.inbound.admission import parse_admission
+    from internal_api_fp.adapters.inbound.profiling import ProfilingPolicy
+    from internal_api_fp.adapters.inbound.runtime import RuntimePolicy
+    from internal_api_fp.adapters.outbound.latency_injection import parse_profile
+    from internal_api_fp.adapters.tracing import TracingPolicy
+    from internal_api_fp.bootstrap import build_app
+
+    # fp には inventory/payment ポートも resilience 層も無いので、その指定は無視される
+    return build_app(
+        faults={port: parse_profile(spec) for port, spec in options.faults.items()},
+        fault_seed=options.fault_seed,
+        admission=parse_admission(options.admission) if options.admission else None,
+        profiling=(
+            ProfilingPolicy(
+                options.profile_dir,
+                sample_rate=options.profile_rate,
+                mode=options.profile_mode,
+            )
+            if options.profile_dir
+            else None
+        ),
+        tracing=(
+            TracingPolicy(**_tracing_kwargs(options))
+            if options.trace_ratio is not None
+            else None
+        ),
+        runtime=(
+            RuntimePolicy(freeze_heap=options.freeze_heap)
+            if options.runtime_metrics or options.freeze_heap
+            else None
+        ),
+        async_io=options.fp_async,
+        order_store=options.fp_order_store,
+    )
+
+
+def _tracing_kwargs(options: TargetOptions) -> dict[str, Any]:
+    if options.trace_out is None:
+        return {"sample_ratio": options.trace_ratio, "exporter": "ring"}
+    return {"sample_ratio": options.trace_ratio, "path": options.trace_out}
+
+
+TARGETS: dict[str, Callable[[TargetOptions], Any]] = {
+    "oop": build_oop_app,
+    "fp": build_fp_app,
+}
+
+# target ごとに持っているルート。持っていない op は計画から外し、外した件数を報告する
+# （fp に GET を流すと 404 / 405 が即座に返り、スループットだけが水増しされる）
+TARGET_OPS: dict[str, frozenset[Op]] = {
+    "oop": frozenset(("post", "retry", "get", "list")),
+    "fp": frozenset(("post", "retry")),
+}
+
+# スループットに数えるステータス。ワークロードが意図して起こす在庫切れ（409）・与信拒否（402）・
+# 冪等キーの処理中（409）・未作成の注文の get（404）は含め、5xx や 429 などは含めない
+EXPECTED_STATUSES: dict[Op, frozenset[int]] = {
+    "post": frozenset((201, 402, 409)),
+    "retry": frozenset((201, 402, 409)),
+    "get": frozenset((200, 404)),
+    "list": frozenset((200,)),
+}
+
+
+def supported_plan(
+    target: str, plan: Sequence[PlannedRequest]
+) -> tuple[list[PlannedRequest], dict[str, int]]:
+    """target が持っていない op を外した計画と、op ごとの外した件数を返す。"""
+    ops = TARGET_OPS[target]
+    kept = [req for req in plan if req.op in ops]
+    skipped: dict[str, int] = {}
+    for req in plan:
+        if req.op not in ops:
+            skipped[req.op] = skipped.get(req.op, 0) + 1
+    return kept, skipped
+
+
+# ---- runner --------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Sample:
+    op: Op
+    status: int
+    latency_s: float
+
+
+@dataclass(frozen=True)
+class OpStats:
+    op: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    statuses: dict[int, int]
+
+
+@dataclass(frozen=True)
+class RunReport:
+    target: str
+    transport: str
+    concurrency: int
+    requests: int
+    elapsed_s: float
+    throughput_rps: float  # 想定内のステータス（EXPECTED_STATUSES）の応答だけを数える
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    ops: tuple[OpStats, ...] = field(default_factory=tuple)
+    expected: int = 0  # 想定内のステータスだった件数
+    skipped: dict[str, int] = field(default_factory=dict)  # target に無いので流さなかった op
+
+
+async def run_workload(
+    open_client: Callable[[], Client],
+    plan: Sequence[PlannedRequest],
+    concurrency: int,
+    extra_headers: tuple[tuple[str, str], ...] = (),
+) -> tuple[list[Sample], float]:
+    created: list[str] = []
+    samples: list[Sample] = []
+    pending: Iterator[PlannedRequest] = iter(plan)
+
+    async def worker() -> None:
+        client = open_client()
+        try:
+            for req in pending:
+                path = req.path or _resolve_get(req, created)
+                t0 = time.perf_counter()
+                status, body = await client.request(
+                    req.method, path, req.headers + extra_headers, req.body
+                )
+                samples.append(Sample(req.op, status, time.perf_counter() - t0))
+                if req.op == "post" and status == 201:
+                    created.append(json.loads(body)["order_id"])
+        finally:
+            await client.aclose()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def _resolve_get(req: PlannedRequest, created: Sequence[str]) -> str:
+    if not created:
+        return f"/orders/{uuid4()}"
+    return f"/orders/{created[int(req.pick * len(created))]}"
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """nearest-rank 法。"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def summarize(
+    target: str,
+    transport: str,
+    concurrency: int,
+    samples: Sequence[Sample],
+    elapsed: float,
+    skipped: dict[str, int] | None = None,
+) -> RunReport:
+    def stats(op: str, xs: Sequence[Sample]) -> OpStats:
+        lat = sorted(s.latency_s * 1000 for s in xs)
+        statuses: dict[int, int] = {}
+        for s in xs:
+            statuses[s.status] = statuses.get(s.status, 0) + 1
+        return OpStats(
+            op=op,
+            count=len(xs),
+            p50_ms=percentile(lat, 50),
+            p95_ms=percentile(lat, 95),
+            p99_ms=percentile(lat, 99),
+            statuses=dict(sorted(statuses.items())),
+        )
+
+    total = stats("all", samples)
+    ops = tuple(
+        stats(op, [s for s in samples if s.op == op])
+        for op in ("post", "retry", "get", "list")
+        if any(s.op == op for s in samples)
+    )
+    expected = sum(1 for s in samples if s.status in EXPECTED_STATUSES[s.op])
+    return RunReport(
+        target=target,
+        transport=transport,
+        concurrency=concurrency,
+        requests=len(samples),
+        elapsed_s=elapsed,
+        throughput_rps=expected / elapsed if elapsed > 0 else 0.0,
+        p50_ms=total.p50_ms,
+        p95_ms=total.p95_ms,
+        p99_ms=total.p99_ms,
+        ops=ops,
+        expected=expected,
+        skipped=dict(skipped or {}),
+    )
+
+
+def run_target(
+    target: str,
+    transport: Literal["asgi", "socket"],
+    plan: Sequence[PlannedRequest],
+    concurrency: int,
+    warmup: Sequence[PlannedRequest] = (),
+    options: TargetOptions = TargetOptions(),
+    timeout_ms: int | None = None,
+) -> RunReport:
+    app = TARGETS[target](options)
+    plan, skipped = supported_plan(target, plan)
+    warmup, _ = supported_plan(target, warmup)
+    extra: tuple[tuple[str, str], ...] = ()
+    if timeout_ms is not None:
+        extra = (("x-request-timeout-ms", str(timeout_ms)),)
+
+    # StdoutEventPublisher 等の print が計測を支配しないよう捨てる
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if transport == "asgi":
+            factory: Callable[[], Client] = lambda: AsgiClient(app)
+            if warmup:
+                asyncio.run(run_workload(factory, warmup, concurrency, extra))
+            samples, elapsed = asyncio.run(
+                run_workload(factory, plan, concurrency, extra)
+            )
+        else:
+            with LocalServer(app) as server:
+                factory = lambda: SocketClient(server.host, server.port)
+                if warmup:
+                    asyncio.run(run_workload(factory, warmup, concurrency, extra))
+                samples, elapsed = asyncio.run(
+                    run_workload(factory, plan, concurrency, extra)
+                )
+
+    shutdown(app)
+    return summarize(target, transport, concurrency, samples, elapsed, skipped)
+
+
+def shutdown(app: Any) -> None:
+    """アプリの lifespan を回して後始末させる（AsgiClient も LocalServer も lifespan を送らない）。"""
+
+    async def run() -> None:
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(run())
+
+
+# ---- report --------------------------------------------------------------------
+
+
+def format_reports(reports: Sequence[RunReport]) -> str:
+    out = [
+        f"{'target':<8}{'op':<7}{'count':>8}{'rps':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  statuses"
+    ]
+    for r in reports:
+        out.append(
+            f"{r.target:<8}{'all':<7}{r.requests:>8}{r.throughput_rps:>10.1f}"
+            f"{r.p50_ms:>9.2f}{r.p95_ms:>9.2f}{r.p99_ms:>9.2f}"
+            f"  expected:{r.expected}"
+        )
+        for s in r.ops:
+            statuses = " ".join(f"{k}:{v}" for k, v in s.statuses.items())
+            out.append(
+                f"{'':<8}{s.op:<7}{s.count:>8}{'':>10}"
+                f"{s.p50_ms:>9.2f}{s.p95_ms:>9.2f}{s.p99_ms:>9.2f}  {statuses}"
+            )
+        for op, n in r.skipped.items():
+            out.append(f"{'':<8}{op:<7}{n:>8}  skipped (no route in {r.target})")
+    return "\n".join(out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.loadgen")
+    p.add_argument("--target", action="append", choices=sorted(TARGETS))
+    p.add_argument("--transport", choices=("asgi", "socket"), default="asgi")
+    p.add_argument("-n", "--requests", type=int, default=2000)
+    p.add_argument("-c", "--concurrency", type=int, default=16)
+    p.add_argument("--warmup", type=int, default=200)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--post", type=float, default=WorkloadMix.post)
+    p.add_argument("--get", type=float, default=WorkloadMix.get)
+    p.add_argument("--list", type=float, default=WorkloadMix.list)
+    p.add_argument(
+        "--idempotency-key-ratio", type=float, default=WorkloadMix.idempotency_key_ratio
+    )
+    p.add_argument("--retry-ratio", type=float, default=WorkloadMix.retry_ratio)
+    p.add_argument(
+        "--out-of-stock-ratio", type=float, default=WorkloadMix.out_of_stock_ratio
+    )
+    p.add_argument("--declined-ratio", type=float, default=WorkloadMix.declined_ratio)
+    p.add_argument("--lines", type=int, default=WorkloadMix.lines_per_order)
+    p.add_argument(
+        "--fault",
+        action="append",
+        default=[],
+        metavar="PORT=SPEC",
+        help="遅延注入（例: payment=lognormal:20:0.5/error=0.01/stall=0.001@2000）",
+    )
+    p.add_argument("--fault-seed", type=int, default=0)
+    p.add_argument(
+        "--timeout-ms", type=int, default=None, help="X-Request-Timeout-Ms を付与"
+    )
+    p.add_argument(
+        "--resilience",
+        action="append",
+        default=[],
+        metavar="PORT=SPEC",
+        help="bulkhead + circuit breaker（例: payment=16:5:1.0）",
+    )
+    p.add_argument(
+        "--payment-stub",
+        type=float,
+        default=None,
+        metavar="LATENCY_MS",
+        help="ローカル決済スタブを起動し oop の決済を HTTP adapter 経由にする",
+    )
+    p.add_argument(
+        "--authorize-workers",
+        type=int,
+        default=TargetOptions.authorize_workers,
+        help="与信を在庫引当と並行に走らせるスレッド数（0 で逐次、oop のみ）",
+    )
+    p.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=0.0,
+        help="PlaceOrder のまとめ処理の窓（0 で無効、oop のみ）",
+    )
+    p.add_argument("--batch-max", type=int, default=TargetOptions.batch_max)
+    p.add_argument(
+        "--read-model",
+        action="store_true",
+        help="get / list を読み取りモデル（CQRS）から返す（oop のみ）",
+    )
+    p.add_argument(
+        "--event-bus-workers",
+        type=int,
+        default=0,
+        help="OrderPlaced をイベントバスで非同期に配る（購読者ごとのワーカー数、0 で同期、oop のみ）",
+    )
+    p.add_argument(
+        "--admission",
+        metavar="SPEC",
+        default=None,
+        help="アドミッション制御（例: 32:100:200:50 = 同時実行:顧客ごとの rps:burst:目標待ち ms）",
+    )
+    p.add_argument(
+        "--profile-dir",
+        default=None,
+        help="リクエスト単位のプロファイル（.pstats / .collapsed + 内訳 .json）の出力先",
+    )
+    p.add_argument(
+        "--profile-rate", type=float, default=0.0, help="プロファイルを取る割合（0〜1）"
+    )
+    p.add_argument(
+        "--profile-mode", choices=("deterministic", "sampling"), default="deterministic"
+    )
+    p.add_argument(
+        "--trace-ratio",
+        type=float,
+        default=None,
+        help="トレーシングを有効にし、この割合のリクエストの span を取る（0〜1）",
+    )
+    p.add_argument(
+        "--trace-out",
+        default=None,
+        help="span の NDJSON 出力先（未指定ならメモリ上のリングバッファに捨てる）",
+    )
+    p.add_argument(
+        "--diagnostics-token",
+        default=None,
+        help="/debug/memory/* を有効にし、X-Diagnostics-Token にこの値を要求する（oop のみ）",
+    )
+    p.add_argument(
+        "--alloc-sample-rate",
+        type=float,
+        default=0.0,
+        help="tracemalloc 有効時にリクエスト単位の確保量を記録する割合（0〜1）",
+    )
+    p.add_argument(
+        "--runtime-metrics",
+        action="store_true",
+        help="GC の停止時間・イベントループの遅れ・スレッドプールの埋まり具合を /metrics に出す",
+    )
+    p.add_argument(
+        "--freeze-heap",
+        action="store_true",
+        help="組み立て後のヒープを gc.freeze で GC の対象から外す（--runtime-metrics も有効になる）",
+    )
+    p.add_argument(
+        "--fp-async",
+        action="store_true",
+        help="fp の POST /orders を async def + FutureResult の経路で受ける",
+    )
+    p.add_argument(
+        "--fp-order-store",
+        choices=("dict", "persistent"),
+        default="dict",
+        help="fp の注文ストア（persistent は永続 HAMT + 根の差し替え）",
+    )
+    p.add_argument(
+        "--cpu-pool",
+        choices=("thread", "process", "interpreter"),
+        default=None,
+        help="検証・明細の集計・冪等ハッシュを投げるプール（interpreter は Python 3.14+、oop のみ）",
+    )
+    p.add_argument("--cpu-workers", type=int, default=TargetOptions.cpu_workers)
+    p.add_argument(
+        "--raw-json-ingest",
+        action="store_true",
+        help="oop の POST /orders をボディのバイト列から validate_json で直接コマンドにする",
+    )
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    mix = WorkloadMix(
+        post=args.post,
+        get=args.get,
+        list=args.list,
+        idempotency_key_ratio=args.idempotency_key_ratio,
+        retry_ratio=args.retry_ratio,
+        out_of_stock_ratio=args.out_of_stock_ratio,
+        declined_ratio=args.declined_ratio,
+        lines_per_order=args.lines,
+    )
+    plan = plan_workload(mix, args.requests, seed=args.seed)
+    warmup = plan_workload(mix, args.warmup, seed=args.seed + 1) if args.warmup else []
+
+    options = TargetOptions(
+        faults=dict(f.split("=", 1) for f in args.fault),
+        fault_seed=args.fault_seed,
+        resilience=dict(r.split("=", 1) for r in args.resilience),
+        authorize_workers=args.authorize_workers,
+        batch_window_ms=args.batch_window_ms,
+        batch_max=args.batch_max,
+        read_model=args.read_model,
+        event_bus_workers=args.event_bus_workers,
+        admission=args.admission,
+        profile_dir=args.profile_dir,
+        profile_rate=args.profile_rate,
+        profile_mode=args.profile_mode,
+        trace_ratio=args.trace_ratio,
+        trace_out=args.trace_out,
+        diagnostics_token=args.diagnostics_token,
+        alloc_sample_rate=args.alloc_sample_rate,
+        runtime_metrics=args.runtime_metrics,
+        freeze_heap=args.freeze_heap,
+        fp_async=args.fp_async,
+        fp_order_store=args.fp_order_store,
+        cpu_pool=args.cpu_pool,
+        cpu_workers=args.cpu_workers,
+        raw_json_ingest=args.raw_json_ingest,
+    )
+
+    with contextlib.ExitStack() as stack:
+        if args.payment_stub is not None:
+            from bench.stub_payment_server import StubConfig, StubPaymentServer
+
+            stub = stack.enter_context(
+                StubPaymentServer(
+                    ("127.0.0.1", 0), StubConfig(latency_ms=args.payment_stub)
+                )
+            )
+            options = replace(options, payment_url=stub.url)
+
+        reports = [
+            run_target(
+                t, args.transport, plan, args.concurrency, warmup, options, args.timeout_ms
+            )
+            for t in (args.target or sorted(TARGETS))
+        ]
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+    else:
+        print(format_reports(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+oop の PlaceOrder をまとめ処理（BatchingPlaceOrderService）にしたときの
+スループット / レイテンシのトレードオフ曲線を取る。
+
+window=0 は従来の 1 件ずつの経路。各ポートには 1 呼び出しごとの遅延を注入するので、
+まとめ処理は 1 往復ぶんの遅延をバッチ全体で分け合う。
+
+例:
+  PYTHONPATH=internal-api-oop/src python -m bench.microbatch -n 4000 -t 64 \
+    --windows 0,0.5,1,2,5 --fault inventory=fixed:1 --fault orders=fixed:1
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Mapping
+
+from bench.loadgen import STOCKED_SKUS, percentile
+
+
+@dataclass(frozen=True)
+class CurvePoint:
+    window_ms: float
+    max_batch: int
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    mean_batch: float
+    failures: int
+
+
+def run_point(
+    window_ms: float,
+    max_batch: int,
+    n: int,
+    threads: int,
+    faults: Mapping[str, str],
+) -> CurvePoint:
+    from internal_api_oop.adapters.outbound.latency_injection import parse_profile
+    from internal_api_oop.bootstrap import build_usecases
+    from internal_api_oop.core.domain.service.batching_place_order_service import (
+        BatchingPlaceOrderService,
+        BatchPolicy,
+    )
+    from internal_api_oop.core.ports.inbound.place_order import (
+        PlaceOrderCommand,
+        PlaceOrderLine,
+    )
+    from returns.result import Success
+
+    uc = build_usecases(
+        stock_by_sku={sku: 10**12 for sku in STOCKED_SKUS},
+        faults={port: parse_profile(spec) for port, spec in faults.items()},
+        batch=(
+            BatchPolicy(window_seconds=window_ms / 1000, max_batch=max_batch, workers=4)
+            if window_ms > 0
+            else None
+        ),
+    )
+    service = uc.place_order
+    cmd = PlaceOrderCommand(
+        customer_id="c-bench",
+        lines=[PlaceOrderLine(sku=STOCKED_SKUS[0], unit_price=Decimal("1200"), quantity=1)],
+        payment_token="tok_ok",
+    )
+
+    latencies: list[float] = []
+    failures = 0
+    lock = threading.Lock()
+    counter = iter(range(n))
+
+    def worker() -> None:
+        nonlocal failures
+        local: list[float] = []
+        bad = 0
+        for _ in counter:
+            t0 = time.perf_counter()
+            result = service.place_order(cmd)
+            local.append(time.perf_counter() - t0)
+            bad += not isinstance(result, Success)
+        with lock:
+            latencies.extend(local)
+            failures += bad
+
+    # StdoutEventPublisher の print が計測を支配しないよう捨てる
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        ts = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    mean_batch = 1.0
+    if isinstance(service, BatchingPlaceOrderService):
+        mean_batch = service.batcher.mean_batch_size()
+    uc.close()
+
+    lat = sorted(x * 1000 for x in latencies)
+    return CurvePoint(
+        window_ms=window_ms,
+        max_batch=max_batch if window_ms > 0 else 1,
+        throughput_rps=n / elapsed,
+        p50_ms=percentile(lat, 50),
+        p99_ms=percentile(lat, 99),
+        mean_batch=mean_batch,
+        failures=failures,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.microbatch")
+    p.add_argument("-n", "--requests", type=int, default=4000)
+    p.add_argument("-t", "--threads", type=int, default=64, help="同時に place_order を呼ぶ数")
+    p.add_argument(
+        "--windows", default="0,0.5,1,2,5", help="バッチ窓（ms、カンマ区切り。0 は従来経路）"
+    )
+    p.add_argument("--max-batch", type=int, default=64)
+    p.add_argument(
+        "--fault",
+        action="append",
+        default=None,
+        metavar="PORT=SPEC",
+        help="1 呼び出しごとの遅延（既定: inventory/orders/events=fixed:1）",
+    )
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    specs = args.fault or ["inventory=fixed:1", "orders=fixed:1", "events=fixed:1"]
+    faults = dict(f.split("=", 1) for f in specs)
+    points = [
+        run_point(float(w), args.max_batch, args.requests, args.threads, faults)
+        for w in args.windows.split(",")
+    ]
+
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(
+        f"{'window ms':>10}{'max':>6}{'rps':>10}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'batch':>8}{'fail':>6}"
+    )
+    for pt in points:
+        print(
+            f"{pt.window_ms:>10.1f}{pt.max_batch:>6}{pt.throughput_rps:>10.1f}"
+            f"{pt.p50_ms:>9.2f}{pt.p99_ms:>9.2f}{pt.mean_batch:>8.1f}{pt.failures:>6}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
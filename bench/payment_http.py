@@ -0,0 +1,100 @@
+"""
+HttpPaymentGateway の keep-alive プール有無でのスループット・レイテンシ比較。
+1 回の決済 = 与信 + capture の 2 往復。
+
+例:
+  PYTHONPATH=internal-api-oop/src python -m bench.payment_http -n 4000 -t 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from returns.result import Success
+
+from bench.loadgen import percentile
+from bench.stub_payment_server import StubConfig, StubPaymentServer
+
+
+def run(keep_alive: bool, n: int, threads: int, latency_ms: float) -> dict[str, float]:
+    from internal_api_oop.adapters.outbound.http_payment import (
+        HttpPaymentConfig,
+        HttpPaymentGateway,
+    )
+    from internal_api_oop.core.domain.model.order import CustomerId, Money
+    from internal_api_oop.core.ports.outbound.payment import ChargeRequest
+
+    with StubPaymentServer(("127.0.0.1", 0), StubConfig(latency_ms=latency_ms)) as stub:
+        gateway = HttpPaymentGateway(
+            HttpPaymentConfig(
+                base_url=stub.url, max_connections_per_host=threads, keep_alive=keep_alive
+            )
+        )
+        latencies: list[float] = []
+        failures = 0
+        lock = threading.Lock()
+        counter = iter(range(n))
+
+        def worker() -> None:
+            nonlocal failures
+            local: list[float] = []
+            bad = 0
+            for i in counter:
+                req = ChargeRequest(
+                    CustomerId("c-1"),
+                    Money.of(Decimal("1200.00")),
+                    token="tok_ok",
+                    idempotency_key=f"charge-{i}",
+                )
+                t0 = time.perf_counter()
+                result = gateway.authorize(req).bind(gateway.capture)
+                local.append(time.perf_counter() - t0)
+                bad += not isinstance(result, Success)
+            with lock:
+                latencies.extend(local)
+                failures += bad
+
+        started = time.perf_counter()
+        ts = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        elapsed = time.perf_counter() - started
+        gateway.close()
+        connections = stub.stats.connections
+
+    lat = sorted(x * 1000 for x in latencies)
+    return {
+        "rps": n / elapsed,
+        "p50_ms": percentile(lat, 50),
+        "p99_ms": percentile(lat, 99),
+        "connections": connections,
+        "failures": failures,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.payment_http")
+    p.add_argument("-n", "--charges", type=int, default=4000)
+    p.add_argument("-t", "--threads", type=int, default=16)
+    p.add_argument("--latency-ms", type=float, default=1.0, help="スタブ側の処理時間")
+    args = p.parse_args(argv)
+
+    print(f"{'mode':<12}{'rps':>10}{'p50 ms':>9}{'p99 ms':>9}{'conns':>8}{'fail':>6}")
+    for keep_alive in (False, True):
+        r = run(keep_alive, args.charges, args.threads, args.latency_ms)
+        mode = "keep-alive" if keep_alive else "per-charge"
+        print(
+            f"{mode:<12}{r['rps']:>10.1f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+            f"{r['connections']:>8.0f}{r['failures']:>6.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
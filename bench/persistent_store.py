@@ -0,0 +1,210 @@
+"""
+fp の注文ストアの読み取りを、書き手が並行に走っている状態で比べる。
+
+- locked-dict: dict を 1 本のロックで守る（読み手も書き手も同じロックを取る）
+- hamt: PersistentOrderStore（読み手はロック無しで根を読むだけ、書き手は根を差し替える）
+
+読み手の数を変えながら、既存の注文を find_order で引く件数 / 秒と 1 件あたりの p99、
+同時に走らせた書き手の save_order 件数 / 秒を測る。--scanner を付けると、全件を
+なめて合計を出す読み手を 1 本足す（locked-dict は走査の間ロックを持ち続けるので、
+書き手と点読みが止まる。hamt は取った時点の版をロック無しで走査する）。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.persistent_store \\
+    --orders 50000 --writers 2 -r 1 -r 2 -r 4 -r 8 --seconds 2 --scanner
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from typing import Any, Callable
+
+from bench.loadgen import percentile
+
+
+@dataclass(frozen=True)
+class StorePoint:
+    store: str
+    readers: int
+    writers: int
+    reads_per_s: float
+    read_p99_us: float
+    writes_per_s: float
+    scans: int  # --scanner の走査回数（0 なら走らせていない）
+    scan_consistent: bool  # 走査中に件数がずれなかったか
+
+
+@dataclass
+class LockedDictOrderStore:
+    """比較用：dict を 1 本のロックで守る素直な実装。"""
+
+    _store: dict[str, Any] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def save_order(self, order: Any) -> None:
+        with self._lock:
+            self._store[str(order.order_id.value)] = order
+
+    def find_order(self, order_id: Any) -> Any:
+        with self._lock:
+            return self._store.get(str(order_id.value))
+
+    def scan(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._store), sum(o.total().amount for o in self._store.values())
+
+
+def _hamt_store() -> Any:
+    from internal_api_fp.adapters.outbound.persistent_orders import (
+        PersistentOrderStore,
+    )
+
+    store = PersistentOrderStore()
+
+    def scan() -> tuple[int, int]:
+        snapshot = store.snapshot()
+        return len(snapshot), sum(o.total().amount for _, o in snapshot.items())
+
+    store.scan = scan  # type: ignore[attr-defined]
+    return store
+
+
+STORES: dict[str, Callable[[], Any]] = {
+    "locked-dict": LockedDictOrderStore,
+    "hamt": _hamt_store,
+}
+
+
+def _new_order() -> Any:
+    from internal_api_fp.core.domain.model.order import (
+        CustomerId,
+        LineItem,
+        Money,
+        Order,
+        OrderId,
+        Sku,
+    )
+
+    order_id = OrderId.new()
+    item = LineItem(Sku("SKU-A"), Money.of(Decimal("1200")), 1)
+    return Order(order_id, CustomerId("c-bench"), (item,), order_id.created_at())
+
+
+def run_point(
+    store_name: str,
+    orders: list[Any],
+    readers: int,
+    writers: int,
+    seconds: float,
+    scanner: bool,
+) -> StorePoint:
+    store = STORES[store_name]()
+    for order in orders:
+        store.save_order(order)
+    ids = [o.order_id for o in orders]
+    stop = threading.Event()
+    start = threading.Barrier(readers + writers + scanner + 1)
+    reads = [0] * readers
+    latencies: list[list[float]] = [[] for _ in range(readers)]
+    writes = [0] * writers
+    scans = [0]
+    consistent = [True]
+
+    def reader(i: int) -> None:
+        rng = random.Random(i)
+        lat = latencies[i]
+        n = 0
+        start.wait()
+        while not stop.is_set():
+            order_id = rng.choice(ids)
+            t0 = time.perf_counter()
+            store.find_order(order_id)
+            if n & 15 == 0:  # 計測自体のコストを抑えるため 16 件に 1 件だけ記録する
+                lat.append(time.perf_counter() - t0)
+            n += 1
+        reads[i] = n
+
+    def writer(i: int) -> None:
+        n = 0
+        start.wait()
+        while not stop.is_set():
+            store.save_order(_new_order())
+            n += 1
+        writes[i] = n
+
+    def scan() -> None:
+        start.wait()
+        while not stop.is_set():
+            count, total = store.scan()
+            # 1 件 1200 円なので、一貫した版を見ていれば合計は件数 × 1200 になる
+            if total != count * 1200:
+                consistent[0] = False
+            scans[0] += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    if scanner:
+        threads.append(threading.Thread(target=scan))
+    for t in threads:
+        t.start()
+    start.wait()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    lat = sorted(x for per in latencies for x in per)
+    return StorePoint(
+        store_name,
+        readers,
+        writers,
+        sum(reads) / seconds,
+        percentile(lat, 99) * 1e6 if lat else 0.0,
+        sum(writes) / seconds,
+        scans[0],
+        consistent[0],
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.persistent_store")
+    p.add_argument("--orders", type=int, default=50_000, help="事前に入れておく注文数")
+    p.add_argument("-r", "--readers", type=int, action="append", default=None)
+    p.add_argument("-w", "--writers", type=int, default=2)
+    p.add_argument("--seconds", type=float, default=2.0)
+    p.add_argument("--scanner", action="store_true", help="全件を走査する読み手を 1 本足す")
+    p.add_argument("--store", action="append", choices=sorted(STORES), default=None)
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    orders = [_new_order() for _ in range(args.orders)]
+    points = [
+        run_point(name, orders, r, args.writers, args.seconds, args.scanner)
+        for r in args.readers or [1, 2, 4, 8]
+        for name in args.store or ["locked-dict", "hamt"]
+    ]
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(
+        f"{'store':<13}{'readers':>8}{'writers':>8}{'reads/s':>11}{'p99 µs':>9}"
+        f"{'writes/s':>10}{'scans':>7}  consistent"
+    )
+    for pt in points:
+        print(
+            f"{pt.store:<13}{pt.readers:>8}{pt.writers:>8}{pt.reads_per_s:>11.0f}"
+            f"{pt.read_p99_us:>9.1f}{pt.writes_per_s:>10.0f}{pt.scans:>7}"
+            f"  {pt.scan_consistent}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+PlaceOrderService の _run_once を、returns の flow で繋いだ参照実装（flow）と、組み立て済みの
+1 関数で回す版（fused）で比べる。
+
+1. 同値性：成功・在庫切れ・与信拒否・保存の重複・発行失敗・時間切れ・capture 中の時間切れの
+   各シナリオを、同じ order_id で両方に流し、返る Result と、終わった後の在庫・仮押さえ・与信・
+   保存件数が一致するかを見る（一致しなければ終了コード 1）。capture 中に締め切りを過ぎた注文は
+   取り消せないので、両方とも保存・通知まで進めて Success を返すことも確かめる。
+2. 1 件あたりのコスト：ポートを定数を返すだけのスタブにした場合（パイプライン自体の差だけが出る）と、
+   インメモリの adapter の場合を、chunk 件ずつ交互に走らせて chunk あたり最速の回で比べる。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.pipeline -n 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, replace
+from decimal import Decimal
+from typing import Any, Callable
+
+from returns.result import Success
+
+
+@dataclass(frozen=True)
+class Equivalence:
+    scenario: str
+    result: str  # flow 側の結果（成功なら Success、失敗ならエラーの型名）
+    same_result: bool
+    same_state: bool
+
+
+@dataclass(frozen=True)
+class OverheadPoint:
+    ports: str  # stub | in-memory
+    pipeline: str  # flow | fused
+    per_request_us: float
+    saved_us: float  # flow との差
+
+
+# ---- equivalence ----------------------------------------------------------------
+
+
+def _slow_capture(payment: Any) -> Any:
+    # capture が締め切りをまたぐ（決済は通ったが、戻ってきた時点で時間切れ）
+    capture = payment.capture
+
+    def slow(authorization: Any, *, deadline: Any = None) -> Any:
+        if deadline is not None:
+            time.sleep(deadline.remaining() + 0.001)
+        return capture(authorization, deadline=deadline)
+
+    payment.capture = slow
+    return payment
+
+
+def _deps(scenario: str, stock: int = 10) -> Any:
+    from internal_api_oop.adapters.outbound.dummy_payment import DummyPaymentGateway
+    from internal_api_oop.adapters.outbound.in_memory_idempotency import (
+        InMemoryIdempotencyRepository,
+    )
+    from internal_api_oop.adapters.outbound.in_memory_inventory import InMemoryInventory
+    from internal_api_oop.adapters.outbound.in_memory_orders import (
+        InMemoryOrderRepository,
+    )
+    from internal_api_oop.adapters.outbound.stdout_events import StdoutEventPublisher
+    from internal_api_oop.core.domain.service.place_order_service import PlaceOrderDeps
+
+    payment = DummyPaymentGateway(decline_tokens={"tok_ng"})
+    if scenario == "capture_overrun":
+        payment = _slow_capture(payment)
+    return PlaceOrderDeps(
+        inventory=InMemoryInventory({"SKU-1": stock}),
+        payment=payment,
+        orders=InMemoryOrderRepository(),
+        events=StdoutEventPublisher(fail=scenario == "publish_failed"),
+        idempotency=InMemoryIdempotencyRepository(),
+        stage_min_seconds={"capture_payment": 60.0} if scenario == "deadline" else {},
+    )
+
+
+def _command(scenario: str) -> Any:
+    from internal_api_oop.core.domain.model.deadline import Deadline
+    from internal_api_oop.core.domain.service.place_order_service import (
+        _validate_command,
+    )
+    from internal_api_oop.core.ports.inbound.place_order import (
+        PlaceOrderCommand,
+        PlaceOrderLine,
+    )
+
+    quantity = 11 if scenario == "out_of_stock" else 2
+    seconds = {"deadline": 30.0, "capture_overrun": 0.05}.get(scenario)
+    cmd = PlaceOrderCommand(
+        customer_id="c-bench",
+        lines=[PlaceOrderLine("SKU-1", Decimal("1200"), quantity)],
+        payment_token="tok_ng" if scenario == "declined" else "tok_ok",
+        deadline=Deadline.after(seconds) if seconds is not None else None,
+    )
+    return _validate_command(cmd).unwrap()
+
+
+def _state(deps: Any) -> tuple:
+    inventory = deps.inventory
+    return (
+        dict(inventory.stock_by_sku),
+        (inventory.active, inventory.confirmed, inventory.released),
+        sorted(Counter(deps.payment.holds.values()).items()),
+        deps.orders.footprint().objects["orders"],
+    )
+
+
+def _outcome(result: Any) -> Any:
+    if isinstance(result, Success):
+        return result.unwrap()
+    return result.failure()
+
+
+SCENARIOS = (
+    "ok",
+    "out_of_stock",
+    "declined",
+    "duplicate_order_id",
+    "publish_failed",
+    "deadline",
+    "capture_overrun",
+)
+# 結果が決まっているシナリオ（flow / fused の一致に加えて確かめる）
+EXPECTED = {"ok": "Success", "capture_overrun": "Success"}
+
+
+def check_equivalence() -> list[Equivalence]:
+    from internal_api_oop.core.domain.model.order import OrderId
+    from internal_api_oop.core.domain.service.place_order_service import (
+        PlaceOrderService,
+    )
+
+    checks: list[Equivalence] = []
+    for scenario in SCENARIOS:
+        order_id = OrderId.new()
+        runs = []
+        for fused in (False, True):
+            cmd = _command(scenario)  # 締め切りは実行ごとに測り直す
+            deps = replace(_deps(scenario), fused_pipeline=fused)
+            svc = PlaceOrderService(deps)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = svc._run_once(cmd, order_id, None)
+                if scenario == "duplicate_order_id":
+                    # 同じ order_id でもう一度：保存で失敗し、在庫だけ戻る
+                    result = svc._run_once(cmd, order_id, None)
+            runs.append((_outcome(result), _state(deps)))
+            deps.inventory.close()
+        (ref, ref_state), (got, got_state) = runs
+        name = type(ref).__name__ if isinstance(ref, Exception) else "Success"
+        checks.append(
+            Equivalence(
+                scenario,
+                name,
+                ref == got and EXPECTED.get(scenario, name) == name,
+                ref_state == got_state,
+            )
+        )
+    return checks
+
+
+# ---- overhead ---------------------------------------------------------------------
+
+
+def _stub_deps() -> Any:
+    from internal_api_oop.core.domain.model.order import Money
+    from internal_api_oop.core.domain.service.place_order_service import PlaceOrderDeps
+    from internal_api_oop.core.ports.outbound.inventory import Hold
+    from internal_api_oop.core.ports.outbound.payment import Authorization
+
+    hold = Success(Hold("hold_stub", ()))
+    auth = Success(Authorization("auth_stub", Money.of(1)))
+    done = Success(None)
+
+    class Ports:
+        # 在庫・決済・保存・発行をまとめて受ける。どれも作り置きの Result を返すだけ
+        def hold(self, reservations: Any, *, deadline: Any = None) -> Any:
+            return hold
+
+        def authorize(self, request: Any, *, deadline: Any = None) -> Any:
+            return auth
+
+        def save(self, order: Any, *, deadline: Any = None) -> Any:
+            return Success(order.order_id)
+
+        def confirm(self, h: Any, *, deadline: Any = None) -> Any:
+            return done
+
+        capture = publish = confirm
+
+        def release(self, h: Any, *, deadline: Any = None) -> Any:
+            return done
+
+        void = release
+
+    ports = Ports()
+    return PlaceOrderDeps(ports, ports, ports, ports, ports)  # type: ignore[arg-type]
+
+
+def measure(n: int, chunk: int) -> list[OverheadPoint]:
+    from internal_api_oop.core.domain.model.order import OrderId
+    from internal_api_oop.core.domain.service.place_order_service import (
+        PlaceOrderService,
+    )
+
+    cmd = _command("ok")
+    order_ids = [OrderId.new() for _ in range(chunk)]
+    points: list[OverheadPoint] = []
+    for ports in ("stub", "in-memory"):
+        runners: dict[str, Callable[[OrderId], Any]] = {}
+        for pipeline in ("flow", "fused"):
+            if ports == "stub":
+                deps = _stub_deps()
+            else:
+                deps = _deps("ok", stock=10**12)
+            svc = PlaceOrderService(replace(deps, fused_pipeline=pipeline == "fused"))
+            runners[pipeline] = lambda oid, svc=svc: svc._run_once(cmd, oid, None)
+        best = {p: float("inf") for p in runners}
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(max(1, n // chunk)):
+                for pipeline, once in runners.items():
+                    # in-memory は order_id の重複で保存が失敗しないよう毎回作り直す
+                    ids = order_ids if ports == "stub" else [OrderId.new() for _ in order_ids]
+                    started = time.perf_counter()
+                    for oid in ids:
+                        once(oid)
+                    best[pipeline] = min(
+                        best[pipeline], (time.perf_counter() - started) / chunk
+                    )
+        for pipeline in runners:
+            points.append(
+                OverheadPoint(
+                    ports,
+                    pipeline,
+                    best[pipeline] * 1e6,
+                    (best["flow"] - best[pipeline]) * 1e6,
+                )
+            )
+    return points
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.pipeline")
+    p.add_argument("-n", "--requests", type=int, default=100_000)
+    p.add_argument("--chunk", type=int, default=1000)
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    checks = check_equivalence()
+    points = measure(args.requests, args.chunk)
+    ok = all(c.same_result and c.same_state for c in checks)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "equivalence": [asdict(c) for c in checks],
+                    "overhead": [asdict(pt) for pt in points],
+                },
+                indent=2,
+            )
+        )
+        return 0 if ok else 1
+    print(f"{'scenario':<20}{'result':<20}{'result':>8}{'state':>8}")
+    for c in checks:
+        print(f"{c.scenario:<20}{c.result:<20}{str(c.same_result):>8}{str(c.same_state):>8}")
+    print()
+    print(f"{'ports':<11}{'pipeline':<10}{'µs/req':>9}{'saved µs':>10}")
+    for pt in points:
+        print(
+            f"{pt.ports:<11}{pt.pipeline:<10}{pt.per_request_us:>9.2f}{pt.saved_us:>10.2f}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
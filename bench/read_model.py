@@ -0,0 +1,191 @@
+"""
+oop の一覧を、書き込み側のストア（InMemoryOrderRepository.list）と、OrderPlaced から投影した
+読み取りモデル（InMemoryOrderReadModel.list_views）で比べる。
+
+1. 同値性：合計額が同じ注文（同額の並び）を多く含むデータで、並び（created_at / total）・向き・
+   顧客の絞り込み・offset / limit の組ごとに、返る注文 id の並びが一致するかを見る
+   （一致しなければ終了コード 1）。
+2. 一覧 1 ページのコスト：注文数ごとに、両方の 1 回あたりの時間を交互に走らせて最速の回で比べる。
+
+例:
+  PYTHONPATH=internal-api-oop/src python -m bench.read_model --sizes 1000,10000,100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable
+
+CUSTOMERS = 7
+PRICES = 5  # 合計額の種類。少ないほど同額の注文が増える
+
+
+@dataclass(frozen=True)
+class Equivalence:
+    case: str
+    returned: int
+    same: bool
+
+
+@dataclass(frozen=True)
+class ListPoint:
+    orders: int
+    case: str
+    path: str  # store | read_model
+    per_request_us: float
+    speedup: float  # store に対する比
+
+
+def make_orders(n: int) -> list[Any]:
+    from internal_api_oop.core.domain.model.order import (
+        CustomerId,
+        LineItem,
+        Money,
+        Order,
+        OrderId,
+        Sku,
+    )
+
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    orders = []
+    for i in range(n):
+        item = LineItem(Sku("SKU-1"), Money.of(Decimal(100 * (1 + i % PRICES))), 1)
+        orders.append(
+            Order(
+                order_id=OrderId.new(),
+                customer_id=CustomerId(f"c-{i % CUSTOMERS}"),
+                items=(item,),
+                created_at=started + timedelta(milliseconds=i),
+            )
+        )
+    return orders
+
+
+def build(orders: list[Any]) -> tuple[Any, Any]:
+    from internal_api_oop.adapters.outbound.in_memory_orders import (
+        InMemoryOrderRepository,
+    )
+    from internal_api_oop.adapters.outbound.in_memory_read_model import (
+        InMemoryOrderReadModel,
+    )
+    from internal_api_oop.core.ports.outbound.events import OrderPlaced
+
+    store, model = InMemoryOrderRepository(), InMemoryOrderReadModel()
+    for order in orders:
+        store.save(order)
+        model.publish(OrderPlaced(order.order_id, order))
+    return store, model
+
+
+def _listers(store: Any, model: Any) -> dict[str, Callable[..., list[str]]]:
+    def from_store(**kw: Any) -> list[str]:
+        return [str(o.order_id.value) for o in store.list(**kw).unwrap()]
+
+    def from_model(**kw: Any) -> list[str]:
+        return [str(v.order_id.value) for v in model.list_views(**kw).unwrap()]
+
+    return {"store": from_store, "read_model": from_model}
+
+
+# ---- equivalence ----------------------------------------------------------------
+
+
+def check_equivalence(n: int = 200) -> list[Equivalence]:
+    from internal_api_oop.core.domain.model.order import CustomerId
+
+    listers = _listers(*build(make_orders(n)))
+    checks: list[Equivalence] = []
+    for sort_by, sort_dir, customer, (offset, limit) in itertools.product(
+        ("created_at", "total"),
+        ("asc", "desc"),
+        (None, "c-3"),
+        ((0, n), (0, 10), (37, 25), (n - 5, 10)),
+    ):
+        kw = dict(
+            offset=offset,
+            limit=limit,
+            customer_id=CustomerId(customer) if customer else None,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+        )
+        ref, got = listers["store"](**kw), listers["read_model"](**kw)
+        case = f"{sort_by}/{sort_dir}/{customer or 'all'}/{offset}+{limit}"
+        checks.append(Equivalence(case, len(ref), ref == got))
+    return checks
+
+
+# ---- cost -------------------------------------------------------------------------
+
+
+def measure(sizes: list[int], repeat: int) -> list[ListPoint]:
+    from internal_api_oop.core.domain.model.order import CustomerId
+
+    points: list[ListPoint] = []
+    for n in sizes:
+        listers = _listers(*build(make_orders(n)))
+        for case, kw in (
+            ("created_desc", dict(sort_by="created_at", sort_dir="desc")),
+            ("total_desc", dict(sort_by="total", sort_dir="desc")),
+            (
+                "customer_total",
+                dict(sort_by="total", sort_dir="desc", customer_id=CustomerId("c-3")),
+            ),
+        ):
+            kw = dict(offset=0, limit=20, **kw)
+            best = {p: float("inf") for p in listers}
+            for _ in range(repeat):
+                # 交互に回して、負荷の揺れがどれかに偏らないようにする
+                for path, lister in listers.items():
+                    started = time.perf_counter()
+                    lister(**kw)
+                    best[path] = min(best[path], time.perf_counter() - started)
+            for path in listers:
+                points.append(
+                    ListPoint(n, case, path, best[path] * 1e6, best["store"] / best[path])
+                )
+    return points
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.read_model")
+    p.add_argument("--sizes", default="1000,10000,100000")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    checks = check_equivalence()
+    points = measure([int(n) for n in args.sizes.split(",")], args.repeat)
+    ok = all(c.same for c in checks)
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "equivalence": [asdict(c) for c in checks],
+                    "cost": [asdict(pt) for pt in points],
+                },
+                indent=2,
+            )
+        )
+        return 0 if ok else 1
+    print(f"{'case':<30}{'returned':>9}{'same':>7}")
+    for c in checks:
+        print(f"{c.case:<30}{c.returned:>9}{c.same!s:>7}")
+    print()
+    print(f"{'orders':>8}  {'case':<16}{'path':<12}{'µs/req':>11}{'speedup':>9}")
+    for pt in points:
+        print(
+            f"{pt.orders:>8}  {pt.case:<16}{pt.path:<12}"
+            f"{pt.per_request_us:>11.1f}{pt.speedup:>8.2f}x"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
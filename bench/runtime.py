@@ -0,0 +1,155 @@
+"""
+GC の停止・イベントループの遅れ・スレッドプールの埋まり具合を、計測なし・計測あり・計測あり + gc.freeze で比べる。
+
+同じ負荷を ASGI 経由で流し、終わった直後に同じイベントループ上で GET /metrics を取って
+gc_* / event_loop_lag_* / threadpool_* を読む。計測なしとの差が計測のコスト、
+freeze の有無の差が組み立て時のヒープを GC の対象から外した効果になる。
+gc.freeze と gc.callbacks はプロセス全体に効くので、モードごとに元へ戻す。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.runtime \\
+    -n 5000 -t 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from bench.loadgen import (
+    TARGETS,
+    AsgiClient,
+    Client,
+    TargetOptions,
+    WorkloadMix,
+    plan_workload,
+    run_workload,
+    summarize,
+    supported_plan,
+)
+
+_SAMPLE = re.compile(r'^(\w+)(?:\{generation="(\d)"\})? (\S+)$')
+
+
+@dataclass(frozen=True)
+class RuntimePoint:
+    target: str
+    mode: str  # off | runtime | freeze
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    frozen_objects: int
+    gen2_pauses: int  # 以下 gc_* は計測区間（warmup 後）の差分。max だけは起動からの最大
+    gen2_pause_max_ms: float
+    gc_pause_ms_total: float  # 全世代の停止時間の合計
+    loop_lag_max_ms: float
+    threadpool_waiting_max: int
+    threadpool_utilization: float  # 使用中の枠 × 秒 /（枠数 × 経過時間）
+
+
+def _parse(text: str) -> dict[str, float]:
+    values: dict[str, float] = {}
+    for line in text.splitlines():
+        m = _SAMPLE.match(line)
+        if m:
+            name, generation, value = m.groups()
+            key = name if generation is None else f"{name}:{generation}"
+            values[key] = float(value)
+    return values
+
+
+def run_mode(target: str, mode: str, n: int, concurrency: int) -> RuntimePoint:
+    mix = WorkloadMix(post=0.6, get=0.3, list=0.1, idempotency_key_ratio=0.5)
+    plan, skipped = supported_plan(target, plan_workload(mix, n, seed=1))
+    warmup, _ = supported_plan(target, plan_workload(mix, max(1, n // 10), seed=2))
+    options = TargetOptions(
+        runtime_metrics=mode != "off", freeze_heap=mode == "freeze"
+    )
+    callbacks = list(gc.callbacks)
+    app = TARGETS[target](options)
+    frozen = gc.get_freeze_count()
+    factory: Callable[[], Client] = lambda: AsgiClient(app)
+
+    async def scrape() -> dict[str, float]:
+        _, body = await AsgiClient(app).request("GET", "/metrics", [], b"")
+        return _parse(body.decode())
+
+    async def run() -> tuple[list, float, dict[str, float], dict[str, float]]:
+        await run_workload(factory, warmup, concurrency)
+        before = await scrape()
+        samples, elapsed = await run_workload(factory, plan, concurrency)
+        return samples, elapsed, before, await scrape()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        samples, elapsed, before, m = asyncio.run(run())
+    gc.unfreeze()
+    gc.callbacks[:] = callbacks
+    report = summarize(target, "asgi", concurrency, samples, elapsed, skipped)
+    tokens = m.get("threadpool_tokens", 0.0)
+
+
+    def delta(key: str) -> float:
+        return m.get(key, 0.0) - before.get(key, 0.0)
+
+    return RuntimePoint(
+        target,
+        mode,
+        report.throughput_rps,
+        report.p50_ms,
+        report.p99_ms,
+        frozen,
+        int(delta("gc_pauses_total:2")),
+        m.get("gc_pause_seconds_max:2", 0.0) * 1000,
+        sum(delta(f"gc_pause_seconds_sum:{g}") for g in range(3)) * 1000,
+        m.get("event_loop_lag_seconds_max", 0.0) * 1000,
+        int(m.get("threadpool_waiting_max", 0)),
+        (
+            delta("threadpool_busy_seconds_total") / (tokens * elapsed)
+            if tokens and elapsed
+            else 0.0
+        ),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.runtime")
+    p.add_argument("--target", action="append", choices=sorted(TARGETS), default=None)
+    p.add_argument("-n", "--requests", type=int, default=5000)
+    p.add_argument("-t", "--concurrency", type=int, default=64)
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    points = [
+        run_mode(target, mode, args.requests, args.concurrency)
+        for target in args.target or ["oop", "fp"]
+        for mode in ("off", "runtime", "freeze")
+    ]
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(
+        f"{'target':<7}{'mode':<9}{'rps':>9}{'p50 ms':>8}{'p99 ms':>8}{'frozen':>9}"
+        f"{'gen2 n':>8}{'gen2 max':>10}{'gc ms':>8}{'lag max':>9}{'tp wait':>9}"
+        f"{'tp util':>9}"
+    )
+    for pt in points:
+        print(
+            f"{pt.target:<7}{pt.mode:<9}{pt.throughput_rps:>9.1f}{pt.p50_ms:>8.2f}"
+            f"{pt.p99_ms:>8.2f}{pt.frozen_objects:>9}{pt.gen2_pauses:>8}"
+            f"{pt.gen2_pause_max_ms:>10.2f}{pt.gc_pause_ms_total:>8.1f}"
+            f"{pt.loop_lag_max_ms:>9.2f}{pt.threadpool_waiting_max:>9}"
+            f"{pt.threadpool_utilization:>9.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
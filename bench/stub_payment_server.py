@@ -0,0 +1,204 @@
+"""
+HttpPaymentGateway と同じプロトコルを話すローカル決済スタブ。
+
+  POST /v1/authorizations  (Idempotency-Key 任意)
+    {"customer_id", "amount", "currency", "token"}
+    200 {"id", "status": "authorized"} / 402 {"status": "declined", "reason"} / 503
+  POST /v1/authorizations/{id}/capture | /void
+    200 {"status": "captured" | "voided"} / 404 / 409 {"status", "reason"} / 503
+
+例:
+  python -m bench.stub_payment_server --port 9000 --latency-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from uuid import uuid4
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    failure_rate: float = 0.0  # 503 を返す割合（課金はしない）
+    decline_tokens: frozenset[str] = frozenset({"tok_declined"})
+    max_amount: Decimal = Decimal("1000000.00")
+    seed: int = 0
+
+
+@dataclass
+class StubStats:
+    connections: int = 0
+    requests: int = 0
+    authorizations: int = 0  # 実際に与信した件数（冪等リプレイは数えない）
+    captures: int = 0
+    voids: int = 0
+    replays: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def bump(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class StubPaymentServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 既定の 5 だと接続し直す比較で accept が溢れる
+
+    def __init__(self, address: tuple[str, int], config: StubConfig) -> None:
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = StubStats()
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+        self._by_key: dict[str, tuple[int, dict[str, Any]]] = {}
+        self._holds: dict[str, str] = {}  # 与信 ID -> authorized | captured | voided
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def roll(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def authorize(
+        self, key: str | None, payload: dict[str, Any]
+    ) -> tuple[int, dict[str, Any]]:
+        if key is not None:
+            with self._lock:
+                cached = self._by_key.get(key)
+            if cached is not None:
+                self.stats.bump("replays")
+                return cached
+
+        if payload.get("token") in self.config.decline_tokens:
+            outcome = 402, {"status": "declined", "reason": "token_blacklisted"}
+        elif Decimal(str(payload.get("amount", "0"))) > self.config.max_amount:
+            outcome = 402, {"status": "declined", "reason": "limit_exceeded"}
+        else:
+            self.stats.bump("authorizations")
+            auth_id = f"auth_{uuid4().hex}"
+            with self._lock:
+                self._holds[auth_id] = "authorized"
+            outcome = 200, {"id": auth_id, "status": "authorized"}
+
+        if key is not None:
+            with self._lock:
+                outcome = self._by_key.setdefault(key, outcome)
+        return outcome
+
+    def settle(self, auth_id: str, to: str) -> tuple[int, dict[str, Any]]:
+        with self._lock:
+            status = self._holds.get(auth_id)
+            if status is None:
+                return 404, {"status": "error", "message": "authorization not found"}
+            if status == to:
+                return 200, {"status": to}  # 同じ操作の再送
+            if status != "authorized":
+                return 409, {"status": status, "reason": f"authorization_{status}"}
+            self._holds[auth_id] = to
+        self.stats.bump("captures" if to == "captured" else "voids")
+        return 200, {"status": to}
+
+    def __enter__(self) -> "StubPaymentServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+_SETTLE = {"capture": "captured", "void": "voided"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # ヘッダと本文の別 write で delayed ACK に捕まらない
+    server: StubPaymentServer
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stats.bump("connections")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.server.stats.bump("requests")
+        length = int(self.headers.get("content-length", "0"))
+        raw = self.rfile.read(length)
+
+        parts = self.path.strip("/").split("/")
+        if parts[:2] != ["v1", "authorizations"] or len(parts) not in (2, 4):
+            self._reply(404, {"status": "error", "message": "not found"})
+            return
+        if len(parts) == 4 and parts[3] not in _SETTLE:
+            self._reply(404, {"status": "error", "message": "not found"})
+            return
+
+        cfg = self.server.config
+        if cfg.latency_ms > 0:
+            time.sleep(cfg.latency_ms / 1000)
+        if self.server.roll() < cfg.failure_rate:
+            self._reply(503, {"status": "error", "message": "unavailable"})
+            return
+
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            self._reply(400, {"status": "error", "message": "invalid json"})
+            return
+
+        if len(parts) == 4:
+            status, body = self.server.settle(parts[2], _SETTLE[parts[3]])
+        else:
+            status, body = self.server.authorize(self.headers.get("idempotency-key"), payload)
+        self._reply(status, body)
+
+    def _reply(self, status: int, body: dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.stub_payment_server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=9000)
+    p.add_argument("--latency-ms", type=float, default=0.0)
+    p.add_argument("--failure-rate", type=float, default=0.0)
+    args = p.parse_args(argv)
+
+    server = StubPaymentServer(
+        (args.host, args.port),
+        StubConfig(latency_ms=args.latency_ms, failure_rate=args.failure_rate),
+    )
+    print(f"stub payment server on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+"""
+トレーシングのコストを、無効・有効（0%）・抽出（--ratio）・全件（100%）で比べる。
+
+http: ASGI 経由で POST /orders だけを投げ、スループットとレイテンシを取る（oop / fp）。
+usecase: oop の PlaceOrderService を直接呼び、1 件あたりの処理時間（µs）を取る。
+  HTTP 層の揺れに埋もれない粒度で、採らないリクエストのコスト（contextvar の確認だけ）が見える。
+span はメモリ上のリングバッファに捨てる（--trace-out を付けると NDJSON に書く）。
+
+例:
+  PYTHONPATH=internal-api-oop/src:internal-api-fp/src python -m bench.tracing \
+    -n 3000 -t 16 --ratio 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any, Callable
+
+from bench.loadgen import (
+    STOCKED_SKUS,
+    TARGETS,
+    TargetOptions,
+    WorkloadMix,
+    percentile,
+    plan_workload,
+    run_target,
+)
+
+
+@dataclass(frozen=True)
+class OverheadPoint:
+    level: str  # http | usecase
+    target: str
+    mode: str  # off | ratio=<r>
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    us_per_op: float
+    overhead_pct: float  # off に対する 1 件あたりの時間の増分
+
+
+def _modes(ratio: float) -> list[float | None]:
+    return [None, 0.0, ratio, 1.0]
+
+
+def _label(ratio: float | None) -> str:
+    return "off" if ratio is None else f"ratio={ratio:g}"
+
+
+def run_http(
+    target: str, n: int, concurrency: int, ratio: float, trace_out: str | None
+) -> list[OverheadPoint]:
+    mix = WorkloadMix(post=1.0, get=0.0, list=0.0, idempotency_key_ratio=0.5)
+    plan = plan_workload(mix, n, seed=1)
+    warmup = plan_workload(mix, max(1, n // 10), seed=2)
+    points: list[OverheadPoint] = []
+    for r in _modes(ratio):
+        options = TargetOptions(trace_ratio=r, trace_out=trace_out)
+        report = run_target(target, "asgi", plan, concurrency, warmup, options)
+        us = 1e6 / report.throughput_rps if report.throughput_rps else 0.0
+        points.append(
+            OverheadPoint(
+                "http",
+                target,
+                _label(r),
+                report.throughput_rps,
+                report.p50_ms,
+                report.p99_ms,
+                us,
+                0.0,
+            )
+        )
+    return _with_overhead(points)
+
+
+def run_usecase(
+    n: int, ratio: float, trace_out: str | None, chunk: int
+) -> list[OverheadPoint]:
+    from internal_api_oop.adapters.tracing import TracingPolicy
+    from internal_api_oop.bootstrap import build_usecases
+    from internal_api_oop.core.ports.inbound.place_order import (
+        PlaceOrderCommand,
+        PlaceOrderLine,
+    )
+
+    cmd = PlaceOrderCommand(
+        customer_id="c-bench",
+        lines=[
+            PlaceOrderLine(sku=STOCKED_SKUS[0], unit_price=Decimal("1200"), quantity=1)
+        ],
+        payment_token="tok_ok",
+    )
+    runners: dict[float | None, Callable[[], None]] = {}
+    tracers = []
+    for r in _modes(ratio):
+        tracing = None
+        if r is not None:
+            tracing = (
+                TracingPolicy(sample_ratio=r, exporter="ring")
+                if trace_out is None
+                else TracingPolicy(sample_ratio=r, path=trace_out)
+            )
+        # 与信の並行実行はスレッドの受け渡しが支配的になるので外す
+        uc = build_usecases(
+            stock_by_sku={sku: 10**12 for sku in STOCKED_SKUS},
+            authorize_workers=0,
+            tracing=tracing,
+        )
+        if uc.tracer is not None:
+            tracers.append(uc.tracer)
+        runners[r] = _usecase_runner(uc.place_order.place_order, uc.tracer, cmd)
+
+    # モードを chunk 件ずつ交互に走らせ、chunk あたり最速の回を 1 件あたりの時間とする
+    # （この環境の揺れは大きいので、平均ではなく下限で比べる）
+    best = {r: float("inf") for r in runners}
+    latencies: dict[float | None, list[float]] = {r: [] for r in runners}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(max(1, n // chunk)):
+            for r, once in runners.items():
+                started = time.perf_counter()
+                for _ in range(chunk):
+                    t0 = time.perf_counter()
+                    once()
+                    latencies[r].append(time.perf_counter() - t0)
+                best[r] = min(best[r], (time.perf_counter() - started) / chunk)
+    for tracer in tracers:
+        tracer.close()
+
+    points: list[OverheadPoint] = []
+    for r in runners:
+        lat = sorted(latencies[r])
+        points.append(
+            OverheadPoint(
+                "usecase",
+                "oop",
+                _label(r),
+                1 / best[r],
+                percentile(lat, 50) * 1000,
+                percentile(lat, 99) * 1000,
+                best[r] * 1e6,
+                0.0,
+            )
+        )
+    return _with_overhead(points)
+
+
+def _usecase_runner(
+    place_order: Callable[[Any], Any], tracer: Any, cmd: Any
+) -> Callable[[], None]:
+    if tracer is None:
+        return lambda: place_order(cmd)
+
+    def once() -> None:
+        # HTTP の middleware と同じく、入口でサンプリングを決めてから呼ぶ
+        span = tracer.start_request("place_order", None)
+        if span is None:
+            place_order(cmd)
+            return
+        token = tracer.activate(span)
+        try:
+            place_order(cmd)
+        finally:
+            tracer.end_request(span, token)
+
+    return once
+
+
+def _with_overhead(points: list[OverheadPoint]) -> list[OverheadPoint]:
+    base = points[0].us_per_op
+    return [
+        OverheadPoint(
+            **{
+                **asdict(p),
+                "overhead_pct": (p.us_per_op / base - 1) * 100 if base else 0.0,
+            }
+        )
+        for p in points
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.tracing")
+    p.add_argument("--target", action="append", choices=sorted(TARGETS), default=None)
+    p.add_argument("-n", "--requests", type=int, default=3000)
+    p.add_argument("-t", "--concurrency", type=int, default=16)
+    p.add_argument("--ratio", type=float, default=0.01, help="抽出モードの割合")
+    p.add_argument(
+        "--level", choices=("http", "usecase", "both"), default="both"
+    )
+    p.add_argument("--chunk", type=int, default=500, help="usecase で交互に走らせる件数")
+    p.add_argument("--trace-out", default=None, help="span の NDJSON 出力先")
+    p.add_argument("--json", action="store_true", help="結果を JSON で出力")
+    args = p.parse_args(argv)
+
+    points: list[OverheadPoint] = []
+    if args.level in ("http", "both"):
+        for target in args.target or ["oop", "fp"]:
+            points += run_http(
+                target, args.requests, args.concurrency, args.ratio, args.trace_out
+            )
+    if args.level in ("usecase", "both"):
+        points += run_usecase(
+            args.requests * 10, args.ratio, args.trace_out, args.chunk
+        )
+
+    if args.json:
+        print(json.dumps([asdict(pt) for pt in points], indent=2))
+        return 0
+    print(
+        f"{'level':<9}{'target':<7}{'mode':<12}{'rps':>10}{'p50 ms':>9}"
+        f"{'p99 ms':>9}{'µs/op':>9}{'overhead':>10}"
+    )
+    for pt in points:
+        print(
+            f"{pt.level:<9}{pt.target:<7}{pt.mode:<12}{pt.throughput_rps:>10.1f}"
+            f"{pt.p50_ms:>9.3f}{pt.p99_ms:>9.3f}{pt.us_per_op:>9.1f}"
+            f"{pt.overhead_pct:>9.1f}%"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
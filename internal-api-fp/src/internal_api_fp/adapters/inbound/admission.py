@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterator, Literal, Mapping
+
+# 入口でのアドミッション制御（ASGI middleware）。スレッドプールに入る前に次の順で判定する。
+#
+# 1. 顧客ごとの token bucket（rate / burst）。空なら 429 + Retry-After（次の 1 枚が貯まるまで）
+# 2. 全体の同時実行上限 max_concurrency。空きが無ければ顧客別の待ち行列に並ぶ
+#    （start-time fair queuing。重み付きで、1 人の大量投入が他の顧客の順番を追い越さない）
+# 3. 顧客の待ち時間が target を超えて滞留しているとき（FQ-CoDel と同じく顧客ごとに、
+#    直近 interval の最小待ち時間で見る）、その顧客の新規分は並ばせずに即 503 + Retry-After。
+#    公平に順番が回る顧客は待たないので、削られるのは取り分を超えて投げている顧客だけになる。
+#    待ち上限 max_wait を超えた分も 503
+#
+# 顧客は POST /orders ならボディの customer_id（注文を付ける顧客そのもの）で決める。
+#
+# 状態は AdmissionState にまとめ、判定は状態を受け取る関数で行う（bucket と滞留の区間の
+# 更新は新しい値を返す純粋関数）。middleware は admission_middleware が partial で組み立てる。
+# すべてイベントループ上で動くのでロックは要らない。
+
+Rejection = Literal["rate_limited", "queue_delay", "queue_full", "queue_timeout"]
+_STATUS: dict[Rejection, int] = {
+    "rate_limited": 429,
+    "queue_delay": 503,
+    "queue_full": 503,
+    "queue_timeout": 503,
+}
+_MESSAGE: dict[Rejection, str] = {
+    "rate_limited": "rate limit exceeded",
+    "queue_delay": "server is overloaded",
+    "queue_full": "server is overloaded",
+    "queue_timeout": "server is overloaded",
+}
+# 顧客に紐づかないリクエスト（壊れたボディなど）が共有する bucket
+_UNKEYED = "unkeyed"
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    max_concurrency: int = 32
+    rate_per_second: float = 100.0  # 顧客ごとの補充レート
+    burst: float = 200.0  # 顧客ごとのバケット容量
+    queue_target_seconds: float = 0.05  # 滞留とみなす待ち時間
+    interval_seconds: float = 0.1  # 最小待ち時間を見る区間
+    max_wait_seconds: float = 1.0
+    max_queue: int = 4096
+    weights: Mapping[str, float] = field(default_factory=dict)  # 顧客 → 重み（既定 1）
+    max_customers: int = 100_000  # 覚えておく bucket 数（古いものから忘れる）
+    exempt_paths: frozenset[str] = frozenset({"/health", "/metrics"})
+    body_keyed_paths: frozenset[str] = frozenset({"/orders"})  # POST のボディで顧客を決める
+
+
+def parse_admission(spec: str) -> AdmissionPolicy:
+    """
+    "<max_concurrency>[:<rate>[:<burst>[:<target_ms>]]]" 形式。
+    例: "32:100:200:50"
+    """
+    max_concurrency, *rest = spec.split(":")
+    policy = AdmissionPolicy(max_concurrency=int(max_concurrency))
+    if rest:
+        policy = replace(policy, rate_per_second=float(rest[0]))
+    if len(rest) > 1:
+        policy = replace(policy, burst=float(rest[1]))
+    if len(rest) > 2:
+        policy = replace(policy, queue_target_seconds=float(rest[2]) / 1000)
+    return policy
+
+
+# ---- token bucket / 滞留の区間（純粋関数） -------------------------------------
+
+
+@dataclass(frozen=True)
+class _Bucket:
+    tokens: float
+    updated: float
+
+
+def _refill(policy: AdmissionPolicy, bucket: _Bucket | None, now: float) -> _Bucket:
+    if bucket is None:
+        return _Bucket(policy.burst, now)
+    tokens = bucket.tokens + (now - bucket.updated) * policy.rate_per_second
+    return _Bucket(min(policy.burst, tokens), now)
+
+
+def _take(policy: AdmissionPolicy, bucket: _Bucket) -> tuple[_Bucket, float | None]:
+    if bucket.tokens >= 1.0:
+        return replace(bucket, tokens=bucket.tokens - 1.0), None
+    return bucket, (1.0 - bucket.tokens) / policy.rate_per_second
+
+
+@dataclass(frozen=True)
+class _DelayWindow:
+    """直近 interval の最小待ち時間（CoDel の sojourn time）。"""
+
+    end: float = 0.0
+    current_min: float = math.inf
+    delay: float = 0.0
+
+
+def _record_delay(
+    window: _DelayWindow, waited: float, now: float, interval: float
+) -> _DelayWindow:
+    if now >= window.end:
+        delay = 0.0 if window.current_min is math.inf else window.current_min
+        return _DelayWindow(now + interval, waited, delay)
+    return replace(window, current_min=min(window.current_min, waited))
+
+
+def _standing(window: _DelayWindow, now: float, interval: float) -> float:
+    if now - window.end > interval:
+        return 0.0  # 1 区間以上だれも通っていない（古い値で棄却しない）
+    return window.delay
+
+
+# ---- 状態と判定 -----------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Admitted:
+    waited_seconds: float
+
+
+@dataclass(frozen=True)
+class Rejected:
+    reason: Rejection
+    retry_after_seconds: int
+
+
+@dataclass(eq=False)
+class AdmissionState:
+    policy: AdmissionPolicy = AdmissionPolicy()
+    clock: Callable[[], float] = time.monotonic
+    buckets: OrderedDict[str, _Bucket] = field(default_factory=OrderedDict)
+    # 待ち行列: (開始タグ, 到着順, 顧客, 到着時刻, future)
+    heap: list[tuple[float, int, str, float, asyncio.Future[float]]] = field(
+        default_factory=list
+    )
+    seq: Iterator[int] = field(default_factory=itertools.count)
+    virtual_time: float = 0.0
+    finish: dict[str, float] = field(default_factory=dict)  # 顧客ごとの最後の終了タグ
+    queued_by: dict[str, int] = field(default_factory=dict)
+    # 顧客ごとの滞留。最後に通ってから 1 区間は残す（行列が空いた直後の再投入も棄却できるように）
+    delays: OrderedDict[str, _DelayWindow] = field(default_factory=OrderedDict)
+    delay: _DelayWindow = _DelayWindow()  # 全体（メトリクス用）
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    rejected: dict[Rejection, int] = field(default_factory=dict)
+    wait_seconds_sum: float = 0.0
+
+
+async def acquire(state: AdmissionState, customer: str) -> Admitted | Rejected:
+    policy = state.policy
+    now = state.clock()
+    retry = _take_token(state, customer, now)
+    if retry is not None:
+        return _reject(state, "rate_limited", retry)
+    if state.in_flight < policy.max_concurrency and not state.queued:
+        state.in_flight += 1
+        _record_wait(state, customer, 0.0, now)
+        return Admitted(0.0)
+    if state.queued >= policy.max_queue:
+        return _reject(state, "queue_full", _retry_after(state))
+    window = state.delays.get(customer)
+    if window is not None and (
+        _standing(window, now, policy.interval_seconds) > policy.queue_target_seconds
+    ):
+        return _reject(state, "queue_delay", window.delay)
+
+    fut: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+    _enqueue(state, customer, now, fut)
+    try:
+        done, _ = await asyncio.wait({fut}, timeout=policy.max_wait_seconds)
+    except asyncio.CancelledError:
+        # 切断などで待ちを打ち切られた。席を渡された後なら返す
+        if fut.done() and not fut.cancelled():
+            release(state)
+        else:
+            _abandon(state, customer, fut)
+        raise
+    if not done:
+        _abandon(state, customer, fut)
+        return _reject(state, "queue_timeout", _retry_after(state))
+    return Admitted(fut.result())
+
+
+def release(state: AdmissionState) -> None:
+    state.in_flight -= 1
+    while state.heap and state.in_flight < state.policy.max_concurrency:
+        tag, _, customer, arrived, fut = heapq.heappop(state.heap)
+        if fut.cancelled():
+            continue  # 待ちを諦めた分（数えるのは _abandon で済んでいる）
+        state.virtual_time = tag
+        now = state.clock()
+        waited = now - arrived
+        # 行列から外す前に記録する（最後の 1 件の待ちもその顧客の区間に入れる）
+        _record_wait(state, customer, waited, now)
+        _dequeued(state, customer)
+        state.in_flight += 1
+        fut.set_result(waited)
+
+
+def queue_delay(state: AdmissionState) -> float:
+    """全体の滞留時間（直近 interval の最小待ち時間）。"""
+    return _standing(state.delay, state.clock(), state.policy.interval_seconds)
+
+
+def _take_token(state: AdmissionState, customer: str, now: float) -> float | None:
+    """取れたら None、取れなければ次の 1 枚までの秒数。"""
+    policy = state.policy
+    known = customer in state.buckets
+    bucket, retry = _take(policy, _refill(policy, state.buckets.get(customer), now))
+    state.buckets[customer] = bucket
+    if known:
+        state.buckets.move_to_end(customer)
+    elif len(state.buckets) > policy.max_customers:
+        state.buckets.popitem(last=False)
+    return retry
+
+
+def _enqueue(
+    state: AdmissionState, customer: str, now: float, fut: asyncio.Future[float]
+) -> None:
+    start = max(state.virtual_time, state.finish.get(customer, 0.0))
+    state.finish[customer] = start + 1.0 / state.policy.weights.get(customer, 1.0)
+    heapq.heappush(state.heap, (start, next(state.seq), customer, now, fut))
+    state.queued_by[customer] = state.queued_by.get(customer, 0) + 1
+    state.queued += 1
+    if customer not in state.delays:
+        state.delays[customer] = _DelayWindow()
+
+
+def _dequeued(state: AdmissionState, customer: str) -> None:
+    state.queued -= 1
+    n = state.queued_by[customer] - 1
+    if n:
+        state.queued_by[customer] = n
+    else:
+        del state.queued_by[customer]
+        if not state.queued_by:
+            # 行列が空になったら仮想時刻の履歴は要らない
+            state.finish.clear()
+
+
+def _abandon(state: AdmissionState, customer: str, fut: asyncio.Future[float]) -> None:
+    fut.cancel()  # 行列の要素自体は次の release で捨てる
+    _dequeued(state, customer)
+
+
+def _record_wait(
+    state: AdmissionState, customer: str, waited: float, now: float
+) -> None:
+    interval = state.policy.interval_seconds
+    state.admitted += 1
+    state.wait_seconds_sum += waited
+    state.delay = _record_delay(state.delay, waited, now, interval)
+    window = state.delays.get(customer)
+    if window is not None:
+        state.delays[customer] = _record_delay(window, waited, now, interval)
+        state.delays.move_to_end(customer)
+    # 並んでおらず、1 区間以上だれも通っていない顧客の区間を古い順に捨てる
+    while state.delays:
+        oldest, window = next(iter(state.delays.items()))
+        if oldest in state.queued_by or now - window.end <= interval:
+            break
+        del state.delays[oldest]
+
+
+def _retry_after(state: AdmissionState) -> float:
+    return max(state.delay.delay, state.policy.queue_target_seconds)
+
+
+def _reject(state: AdmissionState, reason: Rejection, retry_after: float) -> Rejected:
+    state.rejected[reason] = state.rejected.get(reason, 0) + 1
+    return Rejected(reason, max(1, math.ceil(retry_after)))
+
+
+# ---- ASGI middleware -------------------------------------------------------------
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+def admission_middleware(app: ASGIApp, state: AdmissionState) -> ASGIApp:
+    """app.add_middleware(admission_middleware, state=...) で使う。"""
+    return partial(_admit, app, state)
+
+
+async def _admit(
+    app: ASGIApp, state: AdmissionState, scope: Scope, receive: Receive, send: Send
+) -> None:
+    policy = state.policy
+    if scope["type"] != "http" or scope["path"] in policy.exempt_paths:
+        await app(scope, receive, send)
+        return
+    if scope["method"] == "POST" and scope["path"] in policy.body_keyed_paths:
+        messages = await _read_body(receive)
+        customer = body_customer(b"".join(m.get("body", b"") for m in messages))
+        receive = partial(_replay, iter(messages), receive)
+    else:
+        customer = customer_key(scope)
+    decision = await acquire(state, customer)
+    if isinstance(decision, Rejected):
+        await _send_rejection(send, decision)
+        return
+    try:
+        await app(scope, receive, send)
+    finally:
+        release(state)
+
+
+def customer_key(scope: Scope) -> str:
+    """ボディで決めないリクエストは X-Customer-Id ヘッダで顧客を決める。"""
+    for name, value in scope["headers"]:
+        if name == b"x-customer-id" and value:
+            return value.decode("latin-1")
+    return _UNKEYED
+
+
+def body_customer(body: bytes) -> str:
+    """POST /orders のボディの customer_id。ルートと同じく json.loads で読む。"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return _UNKEYED  # ルートが 400 を返す
+    customer = payload.get("customer_id") if isinstance(payload, dict) else None
+    return customer if isinstance(customer, str) and customer else _UNKEYED
+
+
+async def _read_body(receive: Receive) -> list[dict[str, Any]]:
+    messages = []
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request" or not message.get("more_body", False):
+            return messages
+
+
+async def _replay(
+    pending: Iterator[dict[str, Any]], receive: Receive
+) -> dict[str, Any]:
+    # 先読みした分を渡し終えたら元の receive（切断の通知など）に戻す
+    message = next(pending, None)
+    return message if message is not None else await receive()
+
+
+async def _send_rejection(send: Send, decision: Rejected) -> None:
+    body = json.dumps(
+        {
+            "type": "RateLimited" if decision.reason == "rate_limited" else "Overloaded",
+            "message": _MESSAGE[decision.reason],
+        },
+        separators=(",", ":"),  # JSONResponse と同じ
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": _STATUS[decision.reason],
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(decision.retry_after_seconds).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def render_admission_metrics(state: AdmissionState) -> str:
+    """同時実行数・待ち行列・滞留時間・棄却数を Prometheus テキスト形式で返す。"""
+    gauges = {
+        "admission_in_flight": state.in_flight,
+        "admission_limit": state.policy.max_concurrency,
+        "admission_queued": state.queued,
+        "admission_queued_customers": len(state.queued_by),
+        "admission_queue_delay_seconds": queue_delay(state),
+    }
+    counters = {
+        "admission_admitted_total": state.admitted,
+        "admission_wait_seconds_sum": state.wait_seconds_sum,
+    }
+    lines: list[str] = []
+    for kind, values in (("gauge", gauges), ("counter", counters)):
+        for name, value in values.items():
+            lines += [f"# TYPE {name} {kind}", f"{name} {value}"]
+    lines.append("# TYPE admission_rejected_total counter")
+    for reason in _STATUS:
+        n = state.rejected.get(reason, 0)
+        lines.append(f'admission_rejected_total{{reason="{reason}"}} {n}')
+    return "\n".join(lines) + "\n"
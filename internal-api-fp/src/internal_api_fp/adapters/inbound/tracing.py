@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+from internal_api_fp.adapters.tracing import Tracer
+
+# HTTP リクエストごとの root span。traceparent ヘッダがあれば trace を引き継ぐ。
+# current span は contextvar なので、スレッドプールで動く同期ルートにも引き継がれる。
+# 採ったリクエストの応答には traceresponse（W3C Trace Context Level 2）を付ける。
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        span = self.tracer.start_request(
+            f"{scope['method']} {scope['path']}", traceparent
+        )
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+        span.set("http.method", scope["method"])
+        span.set("http.target", scope["path"])
+        header = span.context.traceparent().encode()
+
+        async def send_traced(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                span.set("http.status_code", status)
+                if status >= 500:
+                    span.status = "error"
+                headers = list(message.get("headers", []))
+                headers.append((b"traceresponse", header))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = self.tracer.activate(span)
+        try:
+            await self.app(scope, receive, send_traced)
+        except BaseException as e:
+            span.status = "error"
+            span.set("exception", type(e).__name__)
+            raise
+        finally:
+            self.tracer.end_request(span, token)
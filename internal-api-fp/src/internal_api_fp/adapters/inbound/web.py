@@ -5,10 +5,26 @@ from typing import Any, Callable
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
-from returns.io import IOSuccess
+from returns.io import IOResult, IOSuccess
 
+from internal_api_fp.adapters.inbound.admission import (
+    AdmissionState,
+    admission_middleware,
+    render_admission_metrics,
+)
+from internal_api_fp.adapters.inbound.profiling import (
+    ProfilingMiddleware,
+    RequestProfiler,
+)
+from internal_api_fp.adapters.inbound.runtime import (
+    RuntimeMiddleware,
+    RuntimeMonitor,
+    render_runtime_metrics,
+)
+from internal_api_fp.adapters.inbound.tracing import TracingMiddleware
+from internal_api_fp.adapters.tracing import Tracer, render_tracing_metrics
 from internal_api_fp.core.domain.model.errors import (
     OrderError,
     PersistenceError,
@@ -82,11 +98,46 @@ def _to_http_error(err: OrderError) -> tuple[int, dict]:
     return status, ErrorResponse(type=type(err).__name__, message=str(err)).model_dump()
 
 
+def _to_http(io_result: IOResult[OrderReceipt, OrderError]) -> Any:
+    if isinstance(io_result, IOSuccess):
+        receipt: OrderReceipt = io_result._inner_value.unwrap()
+        return _to_response(receipt)
+    err: OrderError = io_result._inner_value.failure()
+    status, body = _to_http_error(err)
+    return JSONResponse(status_code=status, content=body)
+
+
 # ---- App factory -----------------------------------------------------------
 
 
-def create_fastapi_app(handle_place_order: Callable) -> FastAPI:
+def create_fastapi_app(
+    handle_place_order: Callable,
+    admission: AdmissionState | None = None,
+    profiler: RequestProfiler | None = None,
+    tracer: Tracer | None = None,
+    runtime: RuntimeMonitor | None = None,
+    handle_place_order_async: Callable | None = None,
+) -> FastAPI:
+    """
+    handle_place_order_async を渡すと POST /orders を async def のルートで受け、
+    FutureResult をイベントループ上で待つ（スレッドプールを通らない）。
+    """
     app = FastAPI(title="internal_api_fp")
+    if profiler is not None:
+        handle_place_order = profiler.wrap("place_order", handle_place_order)
+        if handle_place_order_async is not None:
+            handle_place_order_async = profiler.wrap_async(
+                "place_order", handle_place_order_async
+            )
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    if admission is not None:
+        app.add_middleware(admission_middleware, state=admission)
+    if tracer is not None:
+        # 一番外側に置き、アドミッションでの待ち・拒否も root span に含める
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+    if runtime is not None:
+        # 最初のリクエストでループの probe を起動するだけ
+        app.add_middleware(RuntimeMiddleware, monitor=runtime)
 
     @app.exception_handler(RequestValidationError)
     async def handle_request_validation(
@@ -104,15 +155,33 @@ def create_fastapi_app(handle_place_order: Callable) -> FastAPI:
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
-    @app.post("/orders", status_code=201)
-    def place_order_endpoint(req: PlaceOrderRequest) -> Any:
-        cmd = _to_command(req)
-        io_result = handle_place_order(cmd)
-        if isinstance(io_result, IOSuccess):
-            receipt: OrderReceipt = io_result._inner_value.unwrap()
-            return _to_response(receipt)
-        err: OrderError = io_result._inner_value.failure()
-        status, body = _to_http_error(err)
-        return JSONResponse(status_code=status, content=body)
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics() -> str:
+        text = render_admission_metrics(admission) if admission is not None else ""
+        if profiler is not None:
+            text += "# TYPE request_profiles_written_total counter\n" + "".join(
+                f'request_profiles_written_total{{reason="{r}"}} {profiler.written[r]}\n'
+                for r in ("header", "sampled")
+            )
+        if tracer is not None:
+            text += render_tracing_metrics(tracer)
+        if runtime is not None:
+            text += render_runtime_metrics(runtime)
+        return text
+
+    if handle_place_order_async is not None:
+        place_order_async = handle_place_order_async
+
+        @app.post("/orders", status_code=201)
+        async def place_order_endpoint_async(req: PlaceOrderRequest) -> Any:
+            return _to_http(await place_order_async(_to_command(req)))
+
+    else:
+
+        @app.post("/orders", status_code=201)
+        def place_order_endpoint(req: PlaceOrderRequest) -> Any:
+            return _to_http(handle_place_order(_to_command(req)))
 
+    if runtime is not None and runtime.policy.freeze_heap:
+        runtime.freeze_heap()
     return app
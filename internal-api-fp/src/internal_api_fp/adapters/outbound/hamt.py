@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Generic, Iterator, TypeVar
+
+# 永続（変更すると新しい版を返す）hash array mapped trie。
+#
+# ハッシュを 5 ビットずつ区切って 32 分岐の木を辿る。各ノードは使っている枝だけを
+# bitmap と詰めたタプルで持ち、set は根から葉までの経路上のノードだけを作り直して
+# 残りの部分木は前の版と共有する（1 回の set で新しく作るのは高々 13 ノード）。
+# 一度作ったノードは書き換えないので、古い版の根を持っている読み手は、その後の書き込みに
+# 関係なくその時点の内容を見続けられる。
+#
+# 枝の要素は葉（(hash, key, value) のタプル）か子ノード。ハッシュが 64 ビットとも一致する
+# キーは _Collision にまとめる。削除は今のところ使わないので持たない。
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+
+_Leaf = tuple  # (hash, key, value)
+
+
+class _Bitmap:
+    def __init__(self, bitmap: int, entries: tuple) -> None:
+        self.bitmap = bitmap
+        self.entries = entries  # 葉 / 子ノード（bitmap の立っているビットの順）
+
+
+class _Collision:
+    def __init__(self, hash_: int, pairs: tuple[tuple, ...]) -> None:
+        self.hash = hash_
+        self.pairs = pairs  # ((key, value), ...)
+
+
+_EMPTY = _Bitmap(0, ())
+_MISSING = object()
+
+
+def _hash(key: object) -> int:
+    return hash(key) & _HASH_MASK
+
+
+def _lookup(node: _Bitmap | _Collision, h: int, key: object) -> object:
+    shift = 0
+    while True:
+        if type(node) is _Collision:
+            if node.hash == h:
+                for k, v in node.pairs:
+                    if k == key:
+                        return v
+            return _MISSING
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        if type(entry) is tuple:
+            if entry[0] == h and entry[1] == key:
+                return entry[2]
+            return _MISSING
+        node = entry
+        shift += _BITS
+
+
+def _insert(
+    node: _Bitmap | _Collision, shift: int, leaf: _Leaf
+) -> tuple[_Bitmap | _Collision, bool]:
+    """leaf を入れた新しいノードと、キーが増えたかどうかを返す。"""
+    h, key, value = leaf
+    if type(node) is _Collision:
+        if node.hash != h:
+            # 衝突ノードより手前でハッシュが分かれる：衝突ノードを枝に持つノードに入れ直す
+            wrapper = _Bitmap(1 << ((node.hash >> shift) & _MASK), (node,))
+            return _insert(wrapper, shift, leaf)
+        for i, (k, _) in enumerate(node.pairs):
+            if k == key:
+                pairs = node.pairs[:i] + ((key, value),) + node.pairs[i + 1 :]
+                return _Collision(h, pairs), False
+        return _Collision(h, node.pairs + ((key, value),)), True
+
+    bit = 1 << ((h >> shift) & _MASK)
+    idx = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _Bitmap(node.bitmap | bit, entries[:idx] + (leaf,) + entries[idx:]), True
+    entry = entries[idx]
+    if type(entry) is tuple:
+        if entry[0] == h and entry[1] == key:
+            child: _Bitmap | _Collision | _Leaf = leaf
+            added = False
+        else:
+            child, added = _split(entry, leaf, shift + _BITS), True
+    else:
+        child, added = _insert(entry, shift + _BITS, leaf)
+    return _Bitmap(node.bitmap, entries[:idx] + (child,) + entries[idx + 1 :]), added
+
+
+def _split(a: _Leaf, b: _Leaf, shift: int) -> _Bitmap | _Collision:
+    if a[0] == b[0]:
+        return _Collision(a[0], ((a[1], a[2]), (b[1], b[2])))
+    ia, ib = (a[0] >> shift) & _MASK, (b[0] >> shift) & _MASK
+    if ia == ib:
+        return _Bitmap(1 << ia, (_split(a, b, shift + _BITS),))
+    entries = (a, b) if ia < ib else (b, a)
+    return _Bitmap((1 << ia) | (1 << ib), entries)
+
+
+def _walk(node: _Bitmap | _Collision) -> Iterator[tuple]:
+    if type(node) is _Collision:
+        yield from node.pairs
+        return
+    for entry in node.entries:
+        if type(entry) is tuple:
+            yield entry[1], entry[2]
+        else:
+            yield from _walk(entry)
+
+
+class Hamt(Generic[K, V]):
+    """変更しない Map。set は新しい版を返し、元の版はそのまま使える。"""
+
+    def __init__(self, _root: _Bitmap | _Collision = _EMPTY, _size: int = 0) -> None:
+        self._root = _root
+        self._size = _size
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        value = _lookup(self._root, _hash(key), key)
+        return default if value is _MISSING else value  # type: ignore[return-value]
+
+    def set(self, key: K, value: V) -> Hamt[K, V]:
+        root, added = _insert(self._root, 0, (_hash(key), key, value))
+        return Hamt(root, self._size + added)
+
+    def __contains__(self, key: object) -> bool:
+        return _lookup(self._root, _hash(key), key) is not _MISSING
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        return _walk(self._root)
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from returns.future import FutureResult
 from returns.io import IOFailure, IOResult, IOSuccess
+from returns.result import Result, Success
 
 from internal_api_fp.core.domain.model.errors import OrderError, PersistenceError
 from internal_api_fp.core.domain.model.order import Order, OrderId
@@ -10,12 +12,22 @@ from internal_api_fp.core.domain.model.order import Order, OrderId
 
 @dataclass
 class InMemoryOrderStore:
+    # 読み書きとも dict への 1 回の操作で完結するのでロックは持たない（free-threaded の
+    # インタプリタでも dict 自身が 1 操作ごとに排他する）。確かめてから書く操作を足すならロックが要る
     _store: dict[str, Order] = field(default_factory=dict)
 
     def save_order(self, order: Order) -> IOResult[None, OrderError]:
         self._store[str(order.order_id.value)] = order
         return IOSuccess(None)
 
+    def save_order_async(self, order: Order) -> FutureResult[None, OrderError]:
+        # イベントループ上からだけ呼ばれる前提（dict への書き込みは await を挟まない）
+        return FutureResult(self._save(order))
+
+    async def _save(self, order: Order) -> Result[None, OrderError]:
+        self._store[str(order.order_id.value)] = order
+        return Success(None)
+
     def find_order(self, order_id: OrderId) -> IOResult[Order, OrderError]:
         order = self._store.get(str(order_id.value))
         if order is not None:
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from returns.future import FutureResult
+from returns.io import IOFailure, IOResult
+from returns.result import Failure, Result
+
+from internal_api_fp.core.domain.model.errors import OrderError
+
+# 負荷試験用：ポート関数（SaveOrder / PublishEvent など）を包み、
+# 遅延・エラー・ストールを注入する高階関数。RNG は呼び出し側が seed 付きで渡す。
+# inject_faults_async は FutureResult を返すポート用で、遅延はスレッドを止めずに await する。
+
+A = TypeVar("A")
+B = TypeVar("B")
+
+LatencySampler = Callable[[random.Random], float]  # ms
+
+
+def fixed(delay_ms: float) -> LatencySampler:
+    return lambda _rng: delay_ms
+
+
+def lognormal(median_ms: float, sigma: float = 0.5) -> LatencySampler:
+    if median_ms <= 0:
+        return fixed(0.0)
+    mu = math.log(median_ms)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def bimodal(
+    fast: LatencySampler, slow: LatencySampler, slow_ratio: float = 0.05
+) -> LatencySampler:
+    return lambda rng: slow(rng) if rng.random() < slow_ratio else fast(rng)
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    latency: LatencySampler = fixed(0.0)
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    stall_ms: float = 0.0
+
+
+def parse_profile(spec: str) -> FaultProfile:
+    """
+    "lognormal:20:0.5/error=0.01/stall=0.001@2000" 形式（時間は ms）。
+      fixed:<ms> | lognormal:<median_ms>:<sigma>
+      | bimodal:<fast_ms>:<slow_ms>:<slow_ratio>
+    """
+    dist, *opts = spec.split("/")
+    kind, *args = dist.split(":")
+    nums = [float(a) for a in args]
+
+    if kind == "fixed":
+        latency = fixed(*nums)
+    elif kind == "lognormal":
+        latency = lognormal(*nums)
+    elif kind == "bimodal":
+        fast_ms, slow_ms, *ratio = nums
+        latency = bimodal(fixed(fast_ms), fixed(slow_ms), *ratio)
+    else:
+        raise ValueError(f"unknown latency distribution: {kind}")
+
+    error_rate, stall_rate, stall_ms = 0.0, 0.0, 0.0
+    for opt in opts:
+        name, _, value = opt.partition("=")
+        if name == "error":
+            error_rate = float(value)
+        elif name == "stall":
+            rate, _, ms = value.partition("@")
+            stall_rate, stall_ms = float(rate), float(ms)
+        else:
+            raise ValueError(f"unknown fault option: {name}")
+
+    return FaultProfile(latency, error_rate, stall_rate, stall_ms)
+
+
+def inject_faults(
+    port: Callable[[A], IOResult[B, OrderError]],
+    profile: FaultProfile,
+    rng: random.Random,
+    error: Callable[[], OrderError],
+    sleep: Callable[[float], None] = time.sleep,
+) -> Callable[[A], IOResult[B, OrderError]]:
+    lock = threading.Lock()
+
+    def wrapped(arg: A) -> IOResult[B, OrderError]:
+        with lock:
+            delay_ms, fail = _draw(profile, rng)
+
+        if delay_ms > 0:
+            sleep(delay_ms / 1000)
+        if fail:
+            return IOFailure(error())
+        return port(arg)
+
+    return wrapped
+
+
+def inject_faults_async(
+    port: Callable[[A], FutureResult[B, OrderError]],
+    profile: FaultProfile,
+    rng: random.Random,
+    error: Callable[[], OrderError],
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> Callable[[A], FutureResult[B, OrderError]]:
+    # イベントループ上でだけ呼ばれるので、乱数を引く間のロックは要らない
+    def wrapped(arg: A) -> FutureResult[B, OrderError]:
+        delay_ms, fail = _draw(profile, rng)
+
+        async def run() -> Result[B, OrderError]:
+            if delay_ms > 0:
+                await sleep(delay_ms / 1000)
+            if fail:
+                return Failure(error())
+            return (await port(arg))._inner_value
+
+        return FutureResult(run())
+
+    return wrapped
+
+
+def _draw(profile: FaultProfile, rng: random.Random) -> tuple[float, bool]:
+    # 乱数は毎回同じ個数だけ引く（失敗率を変えても遅延列がずれないように）
+    delay_ms = profile.latency(rng)
+    if rng.random() < profile.stall_rate:
+        delay_ms += profile.stall_ms
+    return delay_ms, rng.random() < profile.error_rate
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+from returns.future import FutureResult
+from returns.io import IOFailure, IOResult, IOSuccess
+from returns.result import Result
+
+from internal_api_fp.adapters.outbound.hamt import Hamt
+from internal_api_fp.core.domain.model.errors import OrderError, PersistenceError
+from internal_api_fp.core.domain.model.order import Order, OrderId
+
+OrderSnapshot = Hamt[str, Order]
+
+
+@dataclass
+class PersistentOrderStore:
+    """
+    注文を永続 HAMT に持つストア。書き込みは新しい版を作って根の参照を差し替える。
+    読み手はロックを取らずに根を 1 回読むだけで、その時点の版を最後まで一貫して見られる
+    （参照の読み書きは 1 命令なので、差し替えの途中の状態は見えない）。
+    書き手どうしは差し替えが失われないよう _write_lock で直列にする。
+    """
+
+    _root: OrderSnapshot = field(default_factory=Hamt)
+    _write_lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def snapshot(self) -> OrderSnapshot:
+        return self._root
+
+    def save_order(self, order: Order) -> IOResult[None, OrderError]:
+        key = str(order.order_id.value)
+        with self._write_lock:
+            self._root = self._root.set(key, order)
+        return IOSuccess(None)
+
+    def save_order_async(self, order: Order) -> FutureResult[None, OrderError]:
+        return FutureResult(self._save(order))
+
+    async def _save(self, order: Order) -> Result[None, OrderError]:
+        return self.save_order(order)._inner_value
+
+    def find_order(self, order_id: OrderId) -> IOResult[Order, OrderError]:
+        order = self._root.get(str(order_id.value))
+        if order is not None:
+            return IOSuccess(order)
+        return IOFailure(PersistenceError("not found"))
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from returns.future import FutureResult
 from returns.io import IOResult, IOSuccess
+from returns.result import Result, Success
 
 from internal_api_fp.core.domain.model.errors import OrderError
 from internal_api_fp.core.ports.outbound.events import OrderPlaced
@@ -9,3 +11,12 @@ from internal_api_fp.core.ports.outbound.events import OrderPlaced
 def stdout_publish_event(event: OrderPlaced) -> IOResult[None, OrderError]:
     print(f"[event] order_placed: {event.order_id.value}")
     return IOSuccess(None)
+
+
+def stdout_publish_event_async(event: OrderPlaced) -> FutureResult[None, OrderError]:
+    return FutureResult(_publish(event))
+
+
+async def _publish(event: OrderPlaced) -> Result[None, OrderError]:
+    print(f"[event] order_placed: {event.order_id.value}")
+    return Success(None)
@@ -1,25 +1,149 @@
 from __future__ import annotations
 
+import random
 from functools import partial
+from typing import Literal, Mapping
 
 from fastapi import FastAPI
 
+from internal_api_fp.adapters.inbound.admission import (
+    AdmissionPolicy,
+    AdmissionState,
+)
+from internal_api_fp.adapters.inbound.profiling import (
+    ProfilingPolicy,
+    RequestProfiler,
+)
+from internal_api_fp.adapters.inbound.runtime import RuntimeMonitor, RuntimePolicy
 from internal_api_fp.adapters.inbound.web import create_fastapi_app
 from internal_api_fp.adapters.outbound.in_memory_orders import InMemoryOrderStore
-from internal_api_fp.adapters.outbound.stdout_events import stdout_publish_event
-from internal_api_fp.core.usecase.place_order import place_order
+from internal_api_fp.adapters.outbound.persistent_orders import PersistentOrderStore
+from internal_api_fp.adapters.outbound.latency_injection import (
+    FaultProfile,
+    inject_faults,
+    inject_faults_async,
+)
+from internal_api_fp.adapters.outbound.stdout_events import (
+    stdout_publish_event,
+    stdout_publish_event_async,
+)
+from internal_api_fp.adapters.tracing import (
+    Tracer,
+    TracingPolicy,
+    traced,
+    traced_async,
+)
+from internal_api_fp.core.domain.model.errors import PersistenceError, PublishError
+from internal_api_fp.core.ports.outbound.events import AsyncPublishEvent, PublishEvent
+from internal_api_fp.core.ports.outbound.orders import AsyncSaveOrder, SaveOrder
+from internal_api_fp.core.domain.service.validation import validate_command
+from internal_api_fp.core.usecase.place_order import (
+    ValidateCommand,
+    place_order,
+    place_order_async,
+)
 
 
-def build_app() -> FastAPI:
-    store = InMemoryOrderStore()
+def build_app(
+    faults: Mapping[str, FaultProfile] | None = None,
+    fault_seed: int = 0,
+    admission: AdmissionPolicy | None = None,
+    profiling: ProfilingPolicy | None = None,
+    tracing: TracingPolicy | None = None,
+    runtime: RuntimePolicy | None = None,
+    async_io: bool = False,
+    order_store: Literal["dict", "persistent"] = "dict",
+) -> FastAPI:
+    """
+    faults: port 名（orders/events）→ FaultProfile。負荷試験用の遅延注入。
+    admission: 指定すると顧客ごとの流量制限と全体の同時実行上限を入口で掛ける。
+    profiling: 指定すると X-Profile ヘッダ / 抽出したリクエストの place_order をプロファイルする。
+    tracing: 指定するとリクエストごとの root span と、検証・保存・発行の子 span を出す。
+    runtime: 指定すると GC の停止・イベントループの遅れ・スレッドプールの埋まり具合を /metrics に出す
+      （freeze_heap なら組み立て後のヒープを gc.freeze する）。
+    async_io: True なら POST /orders を async def で受け、保存・発行を FutureResult の
+      ポートでイベントループ上で待つ（検証・注文構築は同期版と同じ関数）。
+    order_store: "persistent" なら注文を永続 HAMT に持ち、読み手はロック無しで版を読む。
+    """
+    store = PersistentOrderStore() if order_store == "persistent" else InMemoryOrderStore()
+    save_order: SaveOrder = store.save_order
+    publish_event: PublishEvent = stdout_publish_event
+    save_order_async: AsyncSaveOrder = store.save_order_async
+    publish_event_async: AsyncPublishEvent = stdout_publish_event_async
+
+    faults = faults or {}
+    if "orders" in faults:
+        save_order = inject_faults(
+            save_order,
+            faults["orders"],
+            rng=random.Random(f"{fault_seed}:orders"),
+            error=lambda: PersistenceError("injected fault"),
+        )
+        save_order_async = inject_faults_async(
+            save_order_async,
+            faults["orders"],
+            rng=random.Random(f"{fault_seed}:orders"),
+            error=lambda: PersistenceError("injected fault"),
+        )
+    if "events" in faults:
+        publish_event = inject_faults(
+            publish_event,
+            faults["events"],
+            rng=random.Random(f"{fault_seed}:events"),
+            error=lambda: PublishError("injected fault"),
+        )
+        publish_event_async = inject_faults_async(
+            publish_event_async,
+            faults["events"],
+            rng=random.Random(f"{fault_seed}:events"),
+            error=lambda: PublishError("injected fault"),
+        )
+
+    validate: ValidateCommand = validate_command
+    tracer: Tracer | None = None
+    if tracing is not None:
+        tracer = Tracer.from_policy(tracing)
+        validate = traced(
+            validate, tracer, "validate", lambda cmd: {"lines": len(cmd.lines)}
+        )
+        save_order = traced(
+            save_order,
+            tracer,
+            "persist",
+            lambda order: {"order_id": str(order.order_id.value)},
+        )
+        publish_event = traced(publish_event, tracer, "publish")
+        save_order_async = traced_async(
+            save_order_async,
+            tracer,
+            "persist",
+            lambda order: {"order_id": str(order.order_id.value)},
+        )
+        publish_event_async = traced_async(publish_event_async, tracer, "publish")
 
     # 依存を部分適用で注入（クラスではなく関数）
     handle_place_order = partial(
         place_order,
-        save_order=store.save_order,
-        publish_event=stdout_publish_event,
+        save_order=save_order,
+        publish_event=publish_event,
+        validate=validate,
+    )
+    handle_place_order_async = None
+    if async_io:
+        handle_place_order_async = partial(
+            place_order_async,
+            save_order=save_order_async,
+            publish_event=publish_event_async,
+            validate=validate,
+        )
+    return create_fastapi_app(
+        handle_place_order,
+        admission=AdmissionState(admission) if admission is not None else None,
+        profiler=RequestProfiler(profiling) if profiling is not None else None,
+        tracer=tracer,
+        runtime=RuntimeMonitor(runtime) if runtime is not None else None,
+        handle_place_order_async=handle_place_order_async,
     )
-    return create_fastapi_app(handle_place_order)
 
 
 def create_asgi_app() -> FastAPI:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Callable
 
+from returns.future import FutureResult
 from returns.io import IOResult
 
 from internal_api_fp.core.domain.model.errors import OrderError
@@ -15,3 +16,4 @@ class OrderPlaced:
 
 
 PublishEvent = Callable[[OrderPlaced], IOResult[None, OrderError]]
+AsyncPublishEvent = Callable[[OrderPlaced], FutureResult[None, OrderError]]
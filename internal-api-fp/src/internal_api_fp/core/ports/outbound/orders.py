@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Callable
 
+from returns.future import FutureResult
 from returns.io import IOResult
 
 from internal_api_fp.core.domain.model.errors import OrderError
@@ -9,3 +10,6 @@ from internal_api_fp.core.domain.model.order import Order, OrderId
 
 SaveOrder = Callable[[Order], IOResult[None, OrderError]]
 FindOrder = Callable[[OrderId], IOResult[Order, OrderError]]
+
+# イベントループ上で待つ版（async の POST ルートから使う）
+AsyncSaveOrder = Callable[[Order], FutureResult[None, OrderError]]
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from typing import Callable
+
+from returns.future import FutureResult
 from returns.io import IOResult
 from returns.result import Result, Success
 
@@ -15,8 +18,14 @@ from internal_api_fp.core.domain.model.order import (
 )
 from internal_api_fp.core.domain.service.validation import validate_command
 from internal_api_fp.core.ports.inbound.place_order import OrderReceipt, PlaceOrderCommand
-from internal_api_fp.core.ports.outbound.events import OrderPlaced, PublishEvent
-from internal_api_fp.core.ports.outbound.orders import SaveOrder
+from internal_api_fp.core.ports.outbound.events import (
+    AsyncPublishEvent,
+    OrderPlaced,
+    PublishEvent,
+)
+from internal_api_fp.core.ports.outbound.orders import AsyncSaveOrder, SaveOrder
+
+ValidateCommand = Callable[[PlaceOrderCommand], Result[PlaceOrderCommand, OrderError]]
 
 
 def _build_order(cmd: PlaceOrderCommand) -> Result[Order, OrderError]:
@@ -25,18 +34,19 @@ def _build_order(cmd: PlaceOrderCommand) -> Result[Order, OrderError]:
         LineItem(Sku(l.sku), Money.of(l.unit_price), l.quantity)
         for l in cmd.lines
     )
-    return Success(Order(OrderId.new(), CustomerId(cmd.customer_id), items, now_utc()))
+    order_id = OrderId.new()
+    created_at = order_id.created_at() or now_utc()  # id 順 = created_at 順
+    return Success(Order(order_id, CustomerId(cmd.customer_id), items, created_at))
 
 
 def place_order(
     cmd: PlaceOrderCommand,
     save_order: SaveOrder,
     publish_event: PublishEvent,
+    validate: ValidateCommand = validate_command,  # 計装（span など）を挟むときに差し替える
 ) -> IOResult[OrderReceipt, OrderError]:
     # 1. 検証＋注文構築（純粋 Result）
-    order_result: Result[Order, OrderError] = (
-        validate_command(cmd).bind(_build_order)
-    )
+    order_result: Result[Order, OrderError] = validate(cmd).bind(_build_order)
 
     # 2. IOResult に持ち上げて IO 操作を連鎖
     def persist_and_publish(order: Order) -> IOResult[OrderReceipt, OrderError]:
@@ -47,3 +57,22 @@ def place_order(
         )
 
     return IOResult.from_result(order_result).bind(persist_and_publish)
+
+
+def place_order_async(
+    cmd: PlaceOrderCommand,
+    save_order: AsyncSaveOrder,
+    publish_event: AsyncPublishEvent,
+    validate: ValidateCommand = validate_command,
+) -> FutureResult[OrderReceipt, OrderError]:
+    """place_order の FutureResult 版。検証と注文構築（純粋な部分）は同じものを使う。"""
+    order_result: Result[Order, OrderError] = validate(cmd).bind(_build_order)
+
+    def persist_and_publish(order: Order) -> FutureResult[OrderReceipt, OrderError]:
+        return (
+            save_order(order)
+            .bind(lambda _: publish_event(OrderPlaced(order.order_id)))
+            .map(lambda _: OrderReceipt(order.order_id, order.customer_id, order.total()))
+        )
+
+    return FutureResult.from_result(order_result).bind(persist_and_publish)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Literal
+
+# place_order の純粋な前処理（検証・明細の集計・冪等ハッシュ）を投げるプール。
+#
+# - thread: 同じインタプリタのスレッド。GIL のあるビルドでは並列にならず、受け渡しの分だけ遅くなる
+#   （比較の基準と、free-threaded のビルド向け）
+# - process: 別プロセス。GIL は別々だが、起動が重く、受け渡しは pickle + パイプを通る
+# - interpreter: 同じプロセス内のサブインタプリタ（Python 3.14 の InterpreterPoolExecutor）。
+#   インタプリタごとに GIL を持つので並列に走り、受け渡しは pickle だけでプロセス間の通信は無い
+#
+# 副作用のあるポート（在庫・決済・保存・発行）は呼び出し元のインタプリタに残る。
+
+CpuPoolMode = Literal["thread", "process", "interpreter"]
+
+
+def create_cpu_pool(mode: CpuPoolMode, workers: int) -> Executor:
+    if mode == "thread":
+        return ThreadPoolExecutor(workers, thread_name_prefix="prepare")
+    if mode == "process":
+        # 呼び出し元はスレッドを抱えているので fork はせず、まっさらなプロセスで import し直す
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        from concurrent.futures import InterpreterPoolExecutor  # type: ignore[attr-defined]
+    except ImportError:
+        raise RuntimeError(
+            "cpu pool 'interpreter' needs Python 3.14+ (InterpreterPoolExecutor)"
+        ) from None
+    return InterpreterPoolExecutor(workers)
@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Awaitable, Callable, Iterable, Literal, Mapping
+from urllib.parse import parse_qs
+
+from internal_api_oop.adapters.metrics import MetricSample
+
+# 入口でのアドミッション制御（ASGI middleware）。スレッドプールに入る前に次の順で判定する。
+#
+# 1. 顧客ごとの token bucket（rate / burst）。空なら 429 + Retry-After（次の 1 枚が貯まるまで）
+# 2. 全体の同時実行上限 max_concurrency。空きが無ければ顧客別の待ち行列に並ぶ
+#    （start-time fair queuing。重み付きで、1 人の大量投入が他の顧客の順番を追い越さない）
+# 3. 顧客の待ち時間が target を超えて滞留しているとき（FQ-CoDel と同じく顧客ごとに、
+#    直近 interval の最小待ち時間で見る）、その顧客の新規分は並ばせずに即 503 + Retry-After。
+#    公平に順番が回る顧客は待たないので、削られるのは取り分を超えて投げている顧客だけになる。
+#    待ち上限 max_wait を超えた分も 503
+#
+# 顧客は POST /orders ならボディの customer_id（注文を付ける顧客そのもの）で決める。
+# 逐次パースする /orders/large はボディを先読みできないので X-Customer-Id を必須にする。
+#
+# すべてイベントループ上で動くのでロックは要らない。
+
+Rejection = Literal["rate_limited", "queue_delay", "queue_full", "queue_timeout"]
+_STATUS: dict[Rejection, int] = {
+    "rate_limited": 429,
+    "queue_delay": 503,
+    "queue_full": 503,
+    "queue_timeout": 503,
+}
+_MESSAGE: dict[Rejection, str] = {
+    "rate_limited": "rate limit exceeded",
+    "queue_delay": "server is overloaded",
+    "queue_full": "server is overloaded",
+    "queue_timeout": "server is overloaded",
+}
+# 顧客に紐づかないリクエスト（id 指定の get、壊れたボディなど）が共有する bucket
+_UNKEYED = "unkeyed"
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    max_concurrency: int = 32
+    rate_per_second: float = 100.0  # 顧客ごとの補充レート
+    burst: float = 200.0  # 顧客ごとのバケット容量
+    queue_target_seconds: float = 0.05  # 滞留とみなす待ち時間
+    interval_seconds: float = 0.1  # 最小待ち時間を見る区間
+    max_wait_seconds: float = 1.0
+    max_queue: int = 4096
+    weights: Mapping[str, float] = field(default_factory=dict)  # 顧客 → 重み（既定 1）
+    max_customers: int = 100_000  # 覚えておく bucket 数（古いものから忘れる）
+    exempt_paths: frozenset[str] = frozenset({"/health", "/metrics"})
+    body_keyed_paths: frozenset[str] = frozenset({"/orders"})  # POST のボディで顧客を決める
+    header_keyed_paths: frozenset[str] = frozenset({"/orders/large"})  # ヘッダ必須
+
+
+def parse_admission(spec: str) -> AdmissionPolicy:
+    """
+    "<max_concurrency>[:<rate>[:<burst>[:<target_ms>]]]" 形式。
+    例: "32:100:200:50"
+    """
+    max_concurrency, *rest = spec.split(":")
+    policy = AdmissionPolicy(max_concurrency=int(max_concurrency))
+    if rest:
+        policy = replace(policy, rate_per_second=float(rest[0]))
+    if len(rest) > 1:
+        policy = replace(policy, burst=float(rest[1]))
+    if len(rest) > 2:
+        policy = replace(policy, queue_target_seconds=float(rest[2]) / 1000)
+    return policy
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated: float
+
+
+@dataclass
+class _DelayWindow:
+    """直近 interval の最小待ち時間（CoDel の sojourn time）。"""
+
+    interval: float
+    end: float = 0.0
+    current_min: float = math.inf
+    delay: float = 0.0
+
+    def record(self, waited: float, now: float) -> None:
+        if now >= self.end:
+            self.delay = 0.0 if self.current_min is math.inf else self.current_min
+            self.current_min = waited
+            self.end = now + self.interval
+        else:
+            self.current_min = min(self.current_min, waited)
+
+    def standing(self, now: float) -> float:
+        if now - self.end > self.interval:
+            return 0.0  # 1 区間以上だれも通っていない（古い値で棄却しない）
+        return self.delay
+
+
+@dataclass(frozen=True)
+class Admitted:
+    waited_seconds: float
+
+
+@dataclass(frozen=True)
+class Rejected:
+    reason: Rejection
+    retry_after_seconds: int
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        policy: AdmissionPolicy = AdmissionPolicy(),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.policy = policy
+        self._clock = clock
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+        # 待ち行列: (開始タグ, 到着順, 顧客, 到着時刻, future)
+        self._heap: list[tuple[float, int, str, float, asyncio.Future[float]]] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._finish: dict[str, float] = {}  # 顧客ごとの最後の終了タグ
+        self._queued: dict[str, int] = {}
+        # 顧客ごとの滞留。最後に通ってから 1 区間は残す（行列が空いた直後の再投入も棄却できるように）
+        self._delays: OrderedDict[str, _DelayWindow] = OrderedDict()
+        self._delay = _DelayWindow(policy.interval_seconds)  # 全体（メトリクス用）
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected: dict[Rejection, int] = {}
+        self.wait_seconds_sum = 0.0
+
+    async def acquire(self, customer: str) -> Admitted | Rejected:
+        now = self._clock()
+        retry = self._take_token(customer, now)
+        if retry is not None:
+            return self._reject("rate_limited", retry)
+        if self.in_flight < self.policy.max_concurrency and not self.queued:
+            self.in_flight += 1
+            self._record_wait(customer, 0.0, now)
+            return Admitted(0.0)
+        if self.queued >= self.policy.max_queue:
+            return self._reject("queue_full", self._retry_after())
+        window = self._delays.get(customer)
+        if window is not None and (
+            window.standing(now) > self.policy.queue_target_seconds
+        ):
+            return self._reject("queue_delay", window.delay)
+
+        fut: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+        self._enqueue(customer, now, fut)
+        try:
+            done, _ = await asyncio.wait({fut}, timeout=self.policy.max_wait_seconds)
+        except asyncio.CancelledError:
+            # 切断などで待ちを打ち切られた。席を渡された後なら返す
+            if fut.done() and not fut.cancelled():
+                self.release()
+            else:
+                self._abandon(customer, fut)
+            raise
+        if not done:
+            self._abandon(customer, fut)
+            return self._reject("queue_timeout", self._retry_after())
+        return Admitted(fut.result())
+
+    def queue_delay(self) -> float:
+        """全体の滞留時間（直近 interval の最小待ち時間）。"""
+        return self._delay.standing(self._clock())
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        while self._heap and self.in_flight < self.policy.max_concurrency:
+            tag, _, customer, arrived, fut = heapq.heappop(self._heap)
+            if fut.cancelled():
+                continue  # 待ちを諦めた分（数えるのは _abandon で済んでいる）
+            self._virtual_time = tag
+            now = self._clock()
+            waited = now - arrived
+            # 行列から外す前に記録する（最後の 1 件の待ちもその顧客の区間に入れる）
+            self._record_wait(customer, waited, now)
+            self._dequeued(customer)
+            self.in_flight += 1
+            fut.set_result(waited)
+
+    # ---- token bucket ------------------------------------------------------
+
+    def _take_token(self, customer: str, now: float) -> float | None:
+        """取れたら None、取れなければ次の 1 枚までの秒数。"""
+        p = self.policy
+        bucket = self._buckets.get(customer)
+        if bucket is None:
+            bucket = self._buckets[customer] = _Bucket(p.burst, now)
+            if len(self._buckets) > p.max_customers:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(customer)
+            bucket.tokens = min(
+                p.burst, bucket.tokens + (now - bucket.updated) * p.rate_per_second
+            )
+            bucket.updated = now
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            return None
+        return (1.0 - bucket.tokens) / p.rate_per_second
+
+    # ---- fair queue --------------------------------------------------------
+
+    def _weight(self, customer: str) -> float:
+        return self.policy.weights.get(customer, 1.0)
+
+    def _enqueue(self, customer: str, now: float, fut: asyncio.Future[float]) -> None:
+        start = max(self._virtual_time, self._finish.get(customer, 0.0))
+        self._finish[customer] = start + 1.0 / self._weight(customer)
+        heapq.heappush(self._heap, (start, next(self._seq), customer, now, fut))
+        self._queued[customer] = self._queued.get(customer, 0) + 1
+        self.queued += 1
+        if customer not in self._delays:
+            self._delays[customer] = _DelayWindow(self.policy.interval_seconds)
+
+    def _dequeued(self, customer: str) -> None:
+        self.queued -= 1
+        n = self._queued[customer] - 1
+        if n:
+            self._queued[customer] = n
+        else:
+            del self._queued[customer]
+            if not self._queued:
+                # 行列が空になったら仮想時刻の履歴は要らない
+                self._finish.clear()
+
+    def _abandon(self, customer: str, fut: asyncio.Future[float]) -> None:
+        fut.cancel()  # 行列の要素自体は次の release で捨てる
+        self._dequeued(customer)
+
+    # ---- queue delay -------------------------------------------------------
+
+    def _record_wait(self, customer: str, waited: float, now: float) -> None:
+        self.admitted += 1
+        self.wait_seconds_sum += waited
+        self._delay.record(waited, now)
+        window = self._delays.get(customer)
+        if window is not None:
+            window.record(waited, now)
+            self._delays.move_to_end(customer)
+        self._expire_delays(now)
+
+    def _expire_delays(self, now: float) -> None:
+        # 並んでおらず、1 区間以上だれも通っていない顧客の区間を古い順に捨てる
+        interval = self.policy.interval_seconds
+        while self._delays:
+            customer, window = next(iter(self._delays.items()))
+            if customer in self._queued or now - window.end <= interval:
+                return
+            del self._delays[customer]
+
+    def _retry_after(self) -> float:
+        return max(self._delay.delay, self.policy.queue_target_seconds)
+
+    def _reject(self, reason: Rejection, retry_after: float) -> Rejected:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return Rejected(reason, max(1, math.ceil(retry_after)))
+
+
+# ---- ASGI middleware -------------------------------------------------------------
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        exempt = self.controller.policy.exempt_paths
+        if scope["type"] != "http" or scope["path"] in exempt:
+            await self.app(scope, receive, send)
+            return
+        policy = self.controller.policy
+        if scope["method"] == "POST" and scope["path"] in policy.body_keyed_paths:
+            messages = await _read_body(receive)
+            customer = body_customer(b"".join(m.get("body", b"") for m in messages))
+            receive = _replay(messages, receive)
+        else:
+            customer = customer_key(scope, policy)
+            if customer is None:
+                await _send_missing_customer(send)
+                return
+        decision = await self.controller.acquire(customer)
+        if isinstance(decision, Rejected):
+            await _send_rejection(send, decision)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+def customer_key(
+    scope: Scope, policy: AdmissionPolicy = AdmissionPolicy()
+) -> str | None:
+    """
+    X-Customer-Id ヘッダ → ?customer_id= → /customers/{id}/... の順で顧客を決める。
+    header_keyed_paths でヘッダが無ければ None（黙って共有の bucket に入れない）。
+    """
+    for name, value in scope["headers"]:
+        if name == b"x-customer-id" and value:
+            return value.decode("latin-1")
+    if scope["path"] in policy.header_keyed_paths:
+        return None
+    query = scope.get("query_string", b"")
+    if b"customer_id=" in query:
+        values = parse_qs(query.decode("latin-1")).get("customer_id")
+        if values and values[0]:
+            return values[0]
+    path: str = scope["path"]
+    if path.startswith("/customers/"):
+        return path.split("/", 3)[2] or _UNKEYED
+    return _UNKEYED
+
+
+def body_customer(body: bytes) -> str:
+    """POST /orders のボディの customer_id。ルートと同じく json.loads で読む。"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return _UNKEYED  # ルートが 400 を返す
+    customer = payload.get("customer_id") if isinstance(payload, dict) else None
+    return customer if isinstance(customer, str) and customer else _UNKEYED
+
+
+async def _read_body(receive: Receive) -> list[dict[str, Any]]:
+    messages = []
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request" or not message.get("more_body", False):
+            return messages
+
+
+def _replay(messages: list[dict[str, Any]], receive: Receive) -> Receive:
+    # 先読みした分を渡し終えたら元の receive（切断の通知など）に戻す
+    pending = iter(messages)
+
+    async def replay() -> dict[str, Any]:
+        message = next(pending, None)
+        return message if message is not None else await receive()
+
+    return replay
+
+
+async def _send_missing_customer(send: Send) -> None:
+    body = json.dumps(
+        {
+            "type": "ValidationError",
+            "message": "X-Customer-Id header is required",
+            "details": None,
+        },
+        separators=(",", ":"),
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 400,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_rejection(send: Send, decision: Rejected) -> None:
+    body = json.dumps(
+        {
+            "type": "RateLimited" if decision.reason == "rate_limited" else "Overloaded",
+            "message": _MESSAGE[decision.reason],
+            "details": None,
+        },
+        separators=(",", ":"),  # JSONResponse と同じ
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": _STATUS[decision.reason],
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(decision.retry_after_seconds).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def admission_metrics(
+    controller: AdmissionController,
+) -> Callable[[], Iterable[MetricSample]]:
+    """同時実行数・待ち行列・滞留時間・棄却数を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        yield MetricSample("admission_in_flight", controller.in_flight)
+        yield MetricSample(
+            "admission_limit", controller.policy.max_concurrency, help="max concurrency"
+        )
+        yield MetricSample("admission_queued", controller.queued)
+        yield MetricSample("admission_queued_customers", len(controller._queued))
+        yield MetricSample(
+            "admission_queue_delay_seconds",
+            controller.queue_delay(),
+            help="minimum queueing delay over the last interval",
+        )
+        yield MetricSample(
+            "admission_admitted_total", controller.admitted, kind="counter"
+        )
+        yield MetricSample(
+            "admission_wait_seconds_sum", controller.wait_seconds_sum, kind="counter"
+        )
+        for reason in _STATUS:
+            yield MetricSample(
+                "admission_rejected_total",
+                controller.rejected.get(reason, 0),
+                (("reason", reason),),
+                kind="counter",
+            )
+
+    return collect
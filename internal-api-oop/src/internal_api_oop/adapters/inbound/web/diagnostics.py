@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import functools
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Iterable, Literal, Sequence
+
+from internal_api_oop.adapters.memory import FootprintSource, StoreFootprint
+from internal_api_oop.adapters.metrics import MetricSample
+
+# メモリの増え方を調べるための診断（X-Diagnostics-Token が一致したときだけ応答する）。
+#
+# - tracemalloc は既定では止めておき、start で有効にする（有効な間は確保のたびにコストがかかる）。
+#   start した時点（または baseline を取り直した時点）のスナップショットとの差分を、
+#   モジュール別・adapter 別・行別に返す
+#     adapter 別: 確保したスタックのうち一番内側の internal_api_oop のフレームで振り分ける
+#     （adapters/ 配下ならそのモジュール、core/ 配下なら core、パッケージ外だけなら lib:<パッケージ>）
+# - 各インメモリストアの件数と推定バイト数（FootprintSource）を返す。
+#   数千件で 100ms 近くかかるので、/metrics には footprint_max_age 秒までは前回の値を出す
+# - tracemalloc が有効な間、sample_rate の割合のリクエストについて前後の確保量の差を記録する。
+#   値はプロセス全体の差分なので、同時に走っている他のリクエストの分も混ざる（in_flight を添える）。
+#   /debug/memory/* 自身は記録しない
+
+GroupBy = Literal["module", "adapter", "line"]
+_KEY_TYPE: dict[str, str] = {"module": "filename", "adapter": "traceback", "line": "lineno"}
+
+_PACKAGE = "internal_api_oop"
+_DEBUG_PREFIX = "/debug/memory/"
+_EXCLUDE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(frozen=True)
+class DiagnosticsPolicy:
+    token: str  # X-Diagnostics-Token と照合する共有鍵
+    nframes: int = 25  # tracemalloc が残すスタックの深さ（adapter 別の振り分けに使う）
+    sample_rate: float = 0.0  # tracemalloc が有効な間、確保量を記録するリクエストの割合
+    recent: int = 200  # 直近のリクエスト単位の記録を残す件数
+    trace_on_start: bool = False  # 起動時から tracemalloc を有効にする
+    footprint_max_age: float = 15.0  # /metrics に出すストアの見積もりを取り直す間隔（秒）
+
+
+@dataclass(frozen=True)
+class RequestAllocation:
+    method: str
+    route: str
+    status: int
+    net_bytes: int  # 前後の traced memory の差（プロセス全体）
+    in_flight: int  # 計測開始時に同時に処理中だったリクエスト数（1 なら混ざっていない）
+    at: float
+
+
+@dataclass
+class _RouteStats:
+    samples: int = 0
+    net_bytes_sum: int = 0
+    net_bytes_max: int = 0
+
+
+class MemoryDiagnostics:
+    def __init__(
+        self,
+        policy: DiagnosticsPolicy,
+        stores: Sequence[FootprintSource] = (),
+        rng: random.Random | None = None,
+    ) -> None:
+        self.policy = policy
+        self.stores = tuple(stores)
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._baseline_at = 0.0
+        self._recent: deque[RequestAllocation] = deque(maxlen=policy.recent)
+        self._routes: dict[tuple[str, str], _RouteStats] = {}
+        self._footprints: list[StoreFootprint] = []
+        self._footprints_at = float("-inf")
+        self.in_flight = 0
+        if policy.trace_on_start:
+            self.start()
+
+    def authorized(self, token: str | None) -> bool:
+        return token is not None and hmac.compare_digest(
+            token.encode(), self.policy.token.encode()
+        )
+
+    # ---- tracemalloc ----------------------------------------------------------
+
+    def start(self, nframes: int | None = None) -> dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes or self.policy.nframes)
+        return self.reset_baseline()
+
+    def stop(self) -> dict[str, Any]:
+        with self._lock:
+            self._baseline = None
+        tracemalloc.stop()
+        return self.status()
+
+    def reset_baseline(self) -> dict[str, Any]:
+        snapshot = _take_snapshot()
+        with self._lock:
+            self._baseline, self._baseline_at = snapshot, time.time()
+        return self.status()
+
+    def status(self) -> dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "nframes": tracemalloc.get_traceback_limit() if tracing else 0,
+            "baseline_at": self._baseline_at if self._baseline is not None else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": (
+                tracemalloc.get_tracemalloc_memory() if tracing else 0
+            ),
+        }
+
+    def diff(self, group: GroupBy = "module", limit: int = 20) -> dict[str, Any]:
+        """baseline からの増減を group ごとに集計し、増えた順に limit 件返す。"""
+        with self._lock:
+            baseline = self._baseline
+        if baseline is None:
+            return {**self.status(), "group": group, "total_size_diff": 0, "top": []}
+        snapshot = _take_snapshot()
+        sizes: dict[str, list[int]] = {}  # key -> [size_diff, size, count_diff, count]
+        for stat in snapshot.compare_to(baseline, _KEY_TYPE[group]):
+            if group == "adapter":
+                key = _adapter_of(stat.traceback)
+            elif group == "line":
+                frame = stat.traceback[0]
+                key = f"{_module_of(frame.filename)}:{frame.lineno}"
+            else:
+                key = _module_of(stat.traceback[0].filename)
+            acc = sizes.setdefault(key, [0, 0, 0, 0])
+            acc[0] += stat.size_diff
+            acc[1] += stat.size
+            acc[2] += stat.count_diff
+            acc[3] += stat.count
+        ranked = sorted(sizes.items(), key=lambda kv: -kv[1][0])[:limit]
+        return {
+            **self.status(),
+            "group": group,
+            "total_size_diff": sum(v[0] for v in sizes.values()),
+            "top": [
+                {
+                    "key": key,
+                    "size_diff": v[0],
+                    "size": v[1],
+                    "count_diff": v[2],
+                    "count": v[3],
+                }
+                for key, v in ranked
+            ],
+        }
+
+    # ---- stores ---------------------------------------------------------------
+
+    def footprints(self) -> list[dict[str, Any]]:
+        return [asdict(fp) for fp in self._measure()]
+
+    def cached_footprints(self) -> list[StoreFootprint]:
+        with self._lock:
+            fresh = time.monotonic() - self._footprints_at < self.policy.footprint_max_age
+            if fresh:
+                return self._footprints
+        return self._measure()
+
+    def _measure(self) -> list[StoreFootprint]:
+        footprints = [source() for source in self.stores]
+        with self._lock:
+            self._footprints, self._footprints_at = footprints, time.monotonic()
+        return footprints
+
+    # ---- リクエスト単位 -------------------------------------------------------
+
+    def select(self, path: str) -> bool:
+        return (
+            self.policy.sample_rate > 0
+            and not path.startswith(_DEBUG_PREFIX)
+            and tracemalloc.is_tracing()
+            and self._rng.random() < self.policy.sample_rate
+        )
+
+    def record(self, allocation: RequestAllocation) -> None:
+        with self._lock:
+            self._recent.append(allocation)
+            stats = self._routes.setdefault(
+                (allocation.method, allocation.route), _RouteStats()
+            )
+            stats.samples += 1
+            stats.net_bytes_sum += allocation.net_bytes
+            stats.net_bytes_max = max(stats.net_bytes_max, allocation.net_bytes)
+
+    def requests(self) -> dict[str, Any]:
+        with self._lock:
+            routes = [
+                {
+                    "method": method,
+                    "route": route,
+                    "samples": s.samples,
+                    "net_bytes_mean": s.net_bytes_sum // s.samples,
+                    "net_bytes_max": s.net_bytes_max,
+                }
+                for (method, route), s in sorted(self._routes.items())
+            ]
+            recent = [asdict(a) for a in self._recent]
+        return {"sample_rate": self.policy.sample_rate, "routes": routes, "recent": recent}
+
+    def route_stats(self) -> list[tuple[str, str, int, int]]:
+        with self._lock:
+            return [
+                (method, route, s.samples, s.net_bytes_sum)
+                for (method, route), s in sorted(self._routes.items())
+            ]
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_EXCLUDE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _module_of(filename: str) -> str:
+    """ファイル名 → ドット区切りのモジュール名（sys.path のどれにも入っていなければファイル名）。"""
+    path = os.path.abspath(filename)
+    best = ""
+    for entry in sys.path:
+        root = os.path.abspath(entry or ".")
+        if path.startswith(root + os.sep) and len(root) > len(best):
+            best = root
+    if not best:
+        return filename
+    rel = os.path.relpath(path, best).removesuffix(".py").removesuffix("/__init__")
+    rel = rel.replace(os.sep, ".")
+    for marker in ("site-packages.", "dist-packages."):
+        rel = rel.split(marker, 1)[-1]
+    return rel
+
+
+def _adapter_of(traceback: tracemalloc.Traceback) -> str:
+    # フレームは古い順に並んでいるので、内側（新しい方）から探す
+    for frame in reversed(traceback):
+        module = _module_of(frame.filename)
+        if not module.startswith(_PACKAGE + "."):
+            continue
+        rest = module.removeprefix(_PACKAGE + ".")
+        if rest.startswith("adapters."):
+            return rest.removeprefix("adapters.")
+        return rest.split(".", 1)[0]  # core / bootstrap など
+    innermost = _module_of(traceback[0].filename) if len(traceback) else "?"
+    return f"lib:{innermost.split('.', 1)[0]}"
+
+
+# ---- ASGI middleware -------------------------------------------------------------
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class MemoryDiagnosticsMiddleware:
+    def __init__(self, app: ASGIApp, diagnostics: MemoryDiagnostics) -> None:
+        self.app = app
+        self.diagnostics = diagnostics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        diagnostics = self.diagnostics
+        diagnostics.in_flight += 1  # イベントループ上でだけ増減する
+        try:
+            if not diagnostics.select(scope["path"]):
+                await self.app(scope, receive, send)
+                return
+            in_flight = diagnostics.in_flight
+            status = 500
+
+            async def send_with_status(message: dict[str, Any]) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                await send(message)
+
+            before = tracemalloc.get_traced_memory()[0]
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                if tracemalloc.is_tracing():
+                    route = scope.get("route")
+                    diagnostics.record(
+                        RequestAllocation(
+                            scope["method"],
+                            getattr(route, "path", scope["path"]),
+                            status,
+                            tracemalloc.get_traced_memory()[0] - before,
+                            in_flight,
+                            time.time(),
+                        )
+                    )
+        finally:
+            diagnostics.in_flight -= 1
+
+
+def diagnostics_metrics(
+    diagnostics: MemoryDiagnostics,
+) -> Callable[[], Iterable[MetricSample]]:
+    """traced memory・ストアの件数・リクエスト単位の確保量を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        status = diagnostics.status()
+        yield MetricSample("memory_tracing", int(status["tracing"]))
+        yield MetricSample("memory_traced_bytes", status["traced_bytes"])
+        yield MetricSample("memory_traced_peak_bytes", status["traced_peak_bytes"])
+        for fp in diagnostics.cached_footprints():
+            for kind, n in fp.objects.items():
+                yield MetricSample(
+                    "store_objects", n, (("store", fp.store), ("kind", kind))
+                )
+            yield MetricSample(
+                "store_bytes_estimate", fp.bytes_estimate, (("store", fp.store),)
+            )
+        for method, route, samples, net_bytes in diagnostics.route_stats():
+            labels = (("method", method), ("route", route))
+            yield MetricSample(
+                "request_alloc_samples_total", samples, labels, kind="counter"
+            )
+            yield MetricSample(
+                "request_alloc_net_bytes_sum", net_bytes, labels, kind="counter"
+            )
+
+    return collect
@@ -1,26 +1,71 @@
 from __future__ import annotations
 
+import email.message
+import json
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from typing import Annotated, Any, AsyncIterator, Callable, Sequence
 
-from fastapi import FastAPI, Header, Query, Request, Response
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
 from returns.result import Success
+from starlette.concurrency import run_in_threadpool
 
+from internal_api_oop.adapters.inbound.web.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    admission_metrics,
+)
+from internal_api_oop.adapters.inbound.web.diagnostics import (
+    GroupBy,
+    MemoryDiagnostics,
+    MemoryDiagnosticsMiddleware,
+    diagnostics_metrics,
+)
+from internal_api_oop.adapters.inbound.web.order_stream import (
+    IncrementalOrderParser,
+    StreamDecodeError,
+)
+from internal_api_oop.adapters.inbound.web.profiling import (
+    ProfilingMiddleware,
+    RequestProfiler,
+    profiling_metrics,
+)
+from internal_api_oop.adapters.inbound.web.runtime import (
+    RuntimeMiddleware,
+    RuntimeMonitor,
+    runtime_metrics,
+)
+from internal_api_oop.adapters.inbound.web.tracing import TracingMiddleware
+from internal_api_oop.adapters.metrics import MetricsSource, render_prometheus
+from internal_api_oop.adapters.tracing import Tracer
+from internal_api_oop.core.domain.model.cart import CartBuilder
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import (
+    BackendUnavailable,
+    CustomerNotFound,
+    DeadlineExceeded,
+    HoldExpired,
     IdempotencyFailed,
     IdempotencyInProgress,
     IdempotencyKeyConflict,
     OrderNotFound,
     OutOfStock,
     PaymentDeclined,
-    PersistenceError,
     PlaceOrderError,
     PublishError,
     ValidationError,
 )
+from internal_api_oop.core.ports.inbound.get_customer_summary import (
+    GetCustomerSummaryQuery,
+    GetCustomerSummaryUseCase,
+)
 from internal_api_oop.core.ports.inbound.get_order import (
     GetOrderQuery,
     GetOrderUseCase,
@@ -30,6 +75,7 @@ from internal_api_oop.core.ports.inbound.list_orders import (
     ListOrdersUseCase,
 )
 from internal_api_oop.core.ports.inbound.place_order import (
+    OrderReceipt,
     PlaceOrderCommand,
     PlaceOrderLine,
     PlaceOrderUseCase,
@@ -85,47 +131,401 @@ class OrderListResponse(BaseModel):
     items: list[OrderSummaryOut]
 
 
+class CustomerSummaryResponse(BaseModel):
+    customer_id: str
+    order_count: int
+    lifetime_total: str
+    currency: str
+    first_order_at: datetime
+    last_order_at: datetime
+
+
 class ErrorResponse(BaseModel):
     type: str
     message: str
     details: list[dict[str, Any]] | None = None
 
 
-def _map_error_to_http(err: PlaceOrderError) -> tuple[int, ErrorResponse]:
-    if isinstance(err, ValidationError):
-        return 400, ErrorResponse(type=type(err).__name__, message=str(err))
-
-    if isinstance(err, OrderNotFound):
-        return 404, ErrorResponse(type=type(err).__name__, message=str(err))
-
-    if isinstance(err, OutOfStock):
-        return 409, ErrorResponse(type=type(err).__name__, message=str(err))
-
-    if isinstance(err, PaymentDeclined):
-        return 402, ErrorResponse(type=type(err).__name__, message=str(err))
-
-    if isinstance(err, PublishError):
-        return 503, ErrorResponse(type=type(err).__name__, message=str(err))
+# ---- large order ingest ------------------------------------------------------
+#
+# POST /orders/large はボディを逐次パースし、明細を 1 行ずつ CartBuilder に流す。
+# 典型的な行（sku: 非空文字列 / unit_price: 正の数か数字だけの文字列 / quantity: 正の int）は
+# pydantic を通さずに受け付け、それ以外だけ PlaceOrderLineIn で検証する。
+# エラーの type / loc / msg は /orders と同じになる（FastAPI と同じく from_attributes で検証する）。
+
+_PLAIN_DECIMAL = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+_PLACEHOLDER_LINE = {"sku": "-", "unit_price": "1", "quantity": 1}
+
+
+class _LargeOrderIngest:
+    def __init__(self) -> None:
+        self.cart = CartBuilder()
+        self.errors: list[dict[str, Any]] = []
+        self.parser = IncrementalOrderParser(self._on_line, self._on_restart)
+
+    def feed(self, chunk: bytes) -> None:
+        try:
+            self.parser.feed(chunk)
+        except StreamDecodeError as e:
+            raise _json_invalid(e) from e
+
+    def finish(self) -> PlaceOrderRequest:
+        try:
+            self.parser.close()
+        except StreamDecodeError as e:
+            raise _json_invalid(e) from e
+        if self.parser.document is not None:
+            header: Any = self.parser.document
+        else:
+            header = dict(self.parser.header)
+        if type(header) is dict and self.parser.streamed_lines:
+            # 明細は読み捨て済み。件数だけ合わせて見出しを検証する
+            header["lines"] = [_PLACEHOLDER_LINE] if self.parser.line_count else []
+        try:
+            req = PlaceOrderRequest.model_validate(header, from_attributes=True)
+        except PydanticValidationError as e:
+            errors = _prefixed(e, ("body",)) + self.errors
+            raise RequestValidationError(errors) from None
+        if self.errors:
+            raise RequestValidationError(self.errors)
+        return req
+
+    def _on_restart(self) -> None:
+        # "lines" が重複した：前の配列の明細とエラーは捨てる（/orders と同じく後勝ち）
+        self.cart = CartBuilder()
+        self.errors = []
+
+    def _on_line(self, i: int, obj: Any) -> None:
+        if type(obj) is dict and len(obj) == 3:
+            sku, price, qty = obj.get("sku"), obj.get("unit_price"), obj.get("quantity")
+            if type(price) is str and _PLAIN_DECIMAL.fullmatch(price):
+                price = Decimal(price)
+            elif type(price) is int:
+                price = Decimal(price)
+            if (
+                type(sku) is str
+                and sku
+                and type(price) is Decimal
+                and price > 0
+                and type(qty) is int
+                and qty > 0
+            ):
+                if not self.errors:
+                    self.cart.add(sku, price, qty)
+                return
+        try:
+            line = PlaceOrderLineIn.model_validate(obj, from_attributes=True)
+        except PydanticValidationError as e:
+            self.errors.extend(_prefixed(e, ("body", "lines", i)))
+            return
+        if not self.errors:
+            self.cart.add(line.sku, line.unit_price, line.quantity)
+
+
+def _prefixed(
+    e: PydanticValidationError, prefix: tuple[str | int, ...]
+) -> list[dict[str, Any]]:
+    return [
+        {**err, "loc": (*prefix, *err["loc"])}
+        for err in e.errors(include_url=False)
+    ]
+
+
+def _json_invalid(e: StreamDecodeError) -> RequestValidationError:
+    return RequestValidationError(
+        [
+            {
+                "type": "json_invalid",
+                "loc": ("body", e.position),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": str(e)},
+            }
+        ]
+    )
 
-    if isinstance(err, PersistenceError):
-        return 500, ErrorResponse(type=type(err).__name__, message=str(err))
 
-    return 500, ErrorResponse(type=type(err).__name__, message=str(err))
+# ---- raw JSON ingest ---------------------------------------------------------
+#
+# create_app(raw_json_ingest=True) の POST /orders は、ボディのバイト列を TypeAdapter.validate_json で
+# 1 度に検証し、そのまま PlaceOrderLine（のサブクラス）を作る。dict / PlaceOrderRequest /
+# PlaceOrderLineIn を経由しない。
+# 検証に落ちたときだけ FastAPI と同じ手順（Content-Type の判定 → json.loads → PlaceOrderRequest）で
+# やり直すので、400 のエラー（type / loc / msg / input / 並び）は従来の /orders と変わらない。
+
+
+def _decimal_from_float(value: Any) -> Any:
+    # 従来の経路では json.loads の float を pydantic が str 経由で Decimal にする（1E+3 → 1000.0）。
+    # validate_json は数値の綴りから作るので、float は同じ手順に揃える（冪等ハッシュが変わらないように）
+    return Decimal(str(value)) if type(value) is float else value
+
+
+@dataclass(frozen=True)
+class _PlaceOrderLineJson(PlaceOrderLine):
+    sku: Annotated[str, Field(min_length=1)]
+    unit_price: Annotated[Decimal, BeforeValidator(_decimal_from_float), Field(gt=0)]
+    quantity: Annotated[int, Field(gt=0)]
+
+
+@dataclass(frozen=True)
+class _PlaceOrderJson:
+    customer_id: Annotated[str, Field(min_length=1)]
+    payment_token: Annotated[str, Field(min_length=1)]
+    lines: Annotated[list[_PlaceOrderLineJson], Field(min_length=1)]
+
+
+# スキーマの組み立ては重いので、モジュールの読み込み時に 1 度だけ
+_PLACE_ORDER_JSON = TypeAdapter(_PlaceOrderJson)
+_TIMEOUT_MS = TypeAdapter(Annotated[int, Field(gt=0)])
+_TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+
+
+def _is_json(content_type: str | None) -> bool:
+    # FastAPI と同じ判定（application/json か application/*+json。Content-Type が無ければ JSON として扱わない）
+    if not content_type:
+        return False
+    if content_type == "application/json":
+        return True
+    message = email.message.Message()
+    message["content-type"] = content_type
+    if message.get_content_maintype() != "application":
+        return False
+    subtype = message.get_content_subtype()
+    return subtype == "json" or subtype.endswith("+json")
+
+
+def _timeout_ms(raw: str | None) -> tuple[int | None, list[dict[str, Any]]]:
+    if raw is None:
+        return None, []
+    try:
+        return _TIMEOUT_MS.validate_python(raw), []
+    except PydanticValidationError as e:
+        return None, _prefixed(e, ("header", _TIMEOUT_HEADER))
+
+
+def parse_place_order(
+    body: bytes,
+    content_type: str | None,
+    header_errors: Sequence[dict[str, Any]] = (),
+) -> tuple[str, str, tuple[PlaceOrderLine, ...]]:
+    """(customer_id, payment_token, lines) を返す。不正なら従来の /orders と同じ例外を投げる。
+
+    header_errors はヘッダの検証エラー。FastAPI と同じくボディのエラーの前に並べる
+    （JSON として読めないときはヘッダを見る前に落ちるので含めない）。
+    """
+    json_body = _is_json(content_type)
+    if body and json_body:
+        try:
+            req = _PLACE_ORDER_JSON.validate_json(body)
+        except PydanticValidationError:
+            pass
+        else:
+            if header_errors:
+                raise RequestValidationError(list(header_errors))
+            return req.customer_id, req.payment_token, tuple(req.lines)
+
+    # ここから先は FastAPI の手順をなぞる
+    obj: Any = body or None
+    if obj is not None and json_body:
+        try:
+            obj = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": ("body", e.pos),
+                        "msg": "JSON decode error",
+                        "input": {},
+                        "ctx": {"error": e.msg},
+                    }
+                ]
+            ) from None
+        except Exception:
+            raise HTTPException(
+                status_code=400, detail="There was an error parsing the body"
+            ) from None
+    if obj is None:
+        # 空のボディと JSON の null はどちらもボディが無い扱い
+        missing = {
+            "type": "missing",
+            "loc": ("body",),
+            "msg": "Field required",
+            "input": None,
+        }
+        raise RequestValidationError([*header_errors, missing])
+    try:
+        model = PlaceOrderRequest.model_validate(obj, from_attributes=True)
+    except PydanticValidationError as e:
+        errors = [*header_errors, *_prefixed(e, ("body",))]
+        raise RequestValidationError(errors) from None
+    if header_errors:
+        raise RequestValidationError(list(header_errors))
+    # validate_json が受け付けず json.loads が受け付ける入力（UTF-16 のボディなど）
+    lines = tuple(
+        PlaceOrderLine(sku=ln.sku, unit_price=ln.unit_price, quantity=ln.quantity)
+        for ln in model.lines
+    )
+    return model.customer_id, model.payment_token, lines
+
+
+def _place_order_openapi() -> dict[str, Any]:
+    # ボディもヘッダも自前で読むので、ドキュメントには従来の /orders と同じものを書き足す
+    schema = PlaceOrderRequest.model_json_schema()
+    defs = schema.pop("$defs")
+    schema["properties"]["lines"]["items"] = defs[PlaceOrderLineIn.__name__]
+    return {
+        "parameters": [
+            {
+                "name": "Idempotency-Key",
+                "in": "header",
+                "required": False,
+                "schema": {"type": "string"},
+            },
+            {
+                "name": _TIMEOUT_HEADER,
+                "in": "header",
+                "required": False,
+                "schema": {"type": "integer", "exclusiveMinimum": 0},
+            },
+        ],
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        },
+    }
+
+
+# ---- error responses ----------------------------------------------------------
+#
+# 在庫切れ・与信拒否などのドメインの失敗は、例外にせずルートから応答をそのまま返す
+# （raise → 例外ハンドラ → ErrorResponse → JSONResponse を通らない）。
+# ステータスとボディの先頭（"type" まで）は型ごとに 1 度だけ組み立てて持っておき、
+# リクエストごとにはメッセージを JSON の文字列にして繋ぐだけにする。
+# バイト列は ErrorResponse(...).model_dump() を JSONResponse で返した場合と同じになる。
+
+
+def _error_status(cls: type[PlaceOrderError]) -> int:
+    if issubclass(cls, ValidationError):
+        return 400
+    if issubclass(cls, (OrderNotFound, CustomerNotFound)):
+        return 404
+    if issubclass(
+        cls,
+        (
+            OutOfStock,
+            HoldExpired,
+            # 冪等キーの処理中 / 失敗済み / 別リクエストでの再利用はクライアント側で解決する競合
+            IdempotencyInProgress,
+            IdempotencyFailed,
+            IdempotencyKeyConflict,
+        ),
+    ):
+        return 409
+    if issubclass(cls, PaymentDeclined):
+        return 402
+    if issubclass(cls, (PublishError, BackendUnavailable)):
+        return 503
+    if issubclass(cls, DeadlineExceeded):
+        return 504
+    return 500
+
+
+def _json_bytes(value: Any) -> bytes:
+    # JSONResponse.render と同じ設定
+    return json.dumps(
+        value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+# 型 → (ステータス, ボディの先頭)。CircuitOpen のようなサブクラスも初回に引いて足す
+_ERROR_HEADS: dict[type[PlaceOrderError], tuple[int, bytes]] = {}
+_ERROR_TAIL = b',"details":null}'
+
+
+def error_response(err: PlaceOrderError) -> Response:
+    cls = type(err)
+    head = _ERROR_HEADS.get(cls)
+    if head is None:
+        # 競合しても同じ値を入れるだけなのでロックは要らない
+        head = _ERROR_HEADS[cls] = (
+            _error_status(cls),
+            b'{"type":' + _json_bytes(cls.__name__) + b',"message":',
+        )
+    status, prefix = head
+    return Response(
+        prefix + _json_bytes(str(err)) + _ERROR_TAIL,
+        status_code=status,
+        media_type="application/json",
+    )
 
 
 def create_app(
     place_order_uc: PlaceOrderUseCase,
     get_order_uc: GetOrderUseCase,
     list_orders_uc: ListOrdersUseCase,
+    customer_summary_uc: GetCustomerSummaryUseCase,
+    default_timeout_seconds: float | None = None,
+    metrics_sources: Sequence[MetricsSource] = (),
+    admission: AdmissionController | None = None,
+    profiler: RequestProfiler | None = None,
+    tracer: Tracer | None = None,
+    diagnostics: MemoryDiagnostics | None = None,
+    runtime: RuntimeMonitor | None = None,
+    raw_json_ingest: bool = False,
+    on_shutdown: Sequence[Callable[[], None]] = (),
 ) -> FastAPI:
-    app = FastAPI(title="internal_api")
+    """on_shutdown: アプリの終了時（lifespan の shutdown）に呼ぶ後始末（UseCases.close など）。"""
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        for close in on_shutdown:
+            close()
+
+    app = FastAPI(title="internal_api", lifespan=lifespan)
+    if profiler is not None:
+        # 対象のリクエストだけ use case の呼び出しをプロファイラの下で走らせる
+        place_order_uc = profiler.wrap(place_order_uc)
+        get_order_uc = profiler.wrap(get_order_uc)
+        list_orders_uc = profiler.wrap(list_orders_uc)
+        customer_summary_uc = profiler.wrap(customer_summary_uc)
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+        metrics_sources = (*metrics_sources, profiling_metrics(profiler))
+    if diagnostics is not None:
+        # アドミッションより内側：計測するのは実際に処理したリクエストだけ
+        app.add_middleware(MemoryDiagnosticsMiddleware, diagnostics=diagnostics)
+        metrics_sources = (*metrics_sources, diagnostics_metrics(diagnostics))
+    if admission is not None:
+        # スレッドプールに入る前に顧客ごとの流量と全体の同時実行数を絞る
+        app.add_middleware(AdmissionMiddleware, controller=admission)
+        metrics_sources = (*metrics_sources, admission_metrics(admission))
+    if tracer is not None:
+        # 一番外側に置き、アドミッションでの待ち・拒否も root span に含める
+        # （ポート呼び出しの span は build_usecases(tracing=...) で包んだ adapter が切る）
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+    if runtime is not None:
+        # 最初のリクエストでループの probe を起動するだけなので、どこに置いても変わらない
+        app.add_middleware(RuntimeMiddleware, monitor=runtime)
+        metrics_sources = (*metrics_sources, runtime_metrics(runtime))
+
+    # async 依存はイベントループ上で（スレッドプールに入る前に）評価されるので、
+    # スレッドプールでの待ち時間も締め切りに含まれる
+    async def request_deadline(
+        timeout_ms: int | None = Header(None, alias="X-Request-Timeout-Ms", gt=0),
+    ) -> Deadline | None:
+        if timeout_ms is not None:
+            return Deadline.after(timeout_ms / 1000)
+        if default_timeout_seconds is not None:
+            return Deadline.after(default_timeout_seconds)
+        return None
 
     # --- exception handlers (統一エラー応答) ---------------------------------
 
+    # ルートは失敗を error_response で返す。ここに来るのはそれ以外の場所で投げられたものだけ
     @app.exception_handler(PlaceOrderError)
-    async def handle_domain_error(_: Request, exc: PlaceOrderError) -> JSONResponse:
-        status, body = _map_error_to_http(exc)
-        return JSONResponse(status_code=status, content=body.model_dump())
+    async def handle_domain_error(_: Request, exc: PlaceOrderError) -> Response:
+        return error_response(exc)
 
     @app.exception_handler(RequestValidationError)
     async def handle_request_validation(
@@ -150,56 +550,148 @@ def create_app(
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics() -> str:
+        return render_prometheus(metrics_sources)
+
+    if diagnostics is not None:
+        _add_diagnostics_routes(app, diagnostics)
+
+    place_order_responses: dict[int | str, dict[str, Any]] = {
+        400: {"model": ErrorResponse},
+        402: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    }
+
+    def receipt_response(
+        receipt: OrderReceipt, response: Response
+    ) -> OrderReceiptResponse:
+        order_id = str(receipt.order_id.value)
+        response.headers["Location"] = f"/orders/{order_id}"
+        return OrderReceiptResponse(
+            order_id=order_id,
+            customer_id=receipt.customer_id.value,
+            total=str(receipt.total.amount),
+            currency=receipt.total.currency,
+        )
+
+    def submit_order(cmd: PlaceOrderCommand, response: Response) -> Any:
+        result = place_order_uc.place_order(cmd)
+
+        if isinstance(result, Success):
+            return receipt_response(result.unwrap(), response)
+        return error_response(result.failure())
+
+    if raw_json_ingest:
+        # ボディを PlaceOrderRequest にせず、バイト列から直接コマンドを作る。
+        # ヘッダの検証もここで行い、エラーの並びを FastAPI に任せた場合と揃える
+        async def place_order_command(request: Request) -> PlaceOrderCommand:
+            timeout_ms, header_errors = _timeout_ms(
+                request.headers.get(_TIMEOUT_HEADER)
+            )
+            customer_id, payment_token, lines = parse_place_order(
+                await request.body(),
+                request.headers.get("content-type"),
+                header_errors,
+            )
+            if timeout_ms is not None:
+                deadline = Deadline.after(timeout_ms / 1000)
+            elif default_timeout_seconds is not None:
+                deadline = Deadline.after(default_timeout_seconds)
+            else:
+                deadline = None
+            return PlaceOrderCommand(
+                customer_id=customer_id,
+                payment_token=payment_token,
+                idempotency_key=request.headers.get("Idempotency-Key"),
+                deadline=deadline,
+                lines=lines,
+            )
+
+        @app.post(
+            "/orders",
+            response_model=OrderReceiptResponse,
+            status_code=201,
+            responses=place_order_responses,
+            openapi_extra=_place_order_openapi(),
+        )
+        def place_order_raw(
+            response: Response,
+            cmd: PlaceOrderCommand = Depends(place_order_command),
+        ) -> Any:
+            return submit_order(cmd, response)
+
+    else:
+
+        @app.post(
+            "/orders",
+            response_model=OrderReceiptResponse,
+            status_code=201,
+            responses=place_order_responses,
+        )
+        def place_order(
+            req: PlaceOrderRequest,
+            response: Response,
+            idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+            deadline: Deadline | None = Depends(request_deadline),
+        ) -> Any:
+            cmd = PlaceOrderCommand(
+                customer_id=req.customer_id,
+                payment_token=req.payment_token,
+                idempotency_key=idempotency_key,
+                deadline=deadline,
+                lines=tuple(
+                    PlaceOrderLine(
+                        sku=ln.sku,
+                        unit_price=ln.unit_price,
+                        quantity=ln.quantity,
+                    )
+                    for ln in req.lines
+                ),
+            )
+            return submit_order(cmd, response)
+
+    # 明細が数万〜数十万行の注文向け。ボディを溜めずにチャンクごとにパース・検証し、
+    # 明細のリスト（dict / pydantic モデル）を作らずに PreparedCart まで組み立てる。
+    # パースは CPU を使うのでチャンク単位でスレッドプールに逃がす。
     @app.post(
-        "/orders",
+        "/orders/large",
         response_model=OrderReceiptResponse,
         status_code=201,
-        responses={
-            400: {"model": ErrorResponse},
-            402: {"model": ErrorResponse},
-            409: {"model": ErrorResponse},
-            500: {"model": ErrorResponse},
-            503: {"model": ErrorResponse},
-        },
+        responses=place_order_responses,
     )
-    def place_order(
-        req: PlaceOrderRequest,
+    async def place_large_order(
+        request: Request,
         response: Response,
         idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+        deadline: Deadline | None = Depends(request_deadline),
     ) -> Any:
+        ingest = _LargeOrderIngest()
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(ingest.feed, chunk)
+        req = ingest.finish()
+
+        cart = ingest.cart.build()
+        if not isinstance(cart, Success):
+            return error_response(cart.failure())
         cmd = PlaceOrderCommand(
             customer_id=req.customer_id,
             payment_token=req.payment_token,
             idempotency_key=idempotency_key,
-            lines=tuple(
-                PlaceOrderLine(
-                    sku=ln.sku,
-                    unit_price=ln.unit_price,
-                    quantity=ln.quantity,
-                )
-                for ln in req.lines
-            ),
+            deadline=deadline,
+            lines=(),
+            cart=cart.unwrap(),
         )
 
-        result = place_order_uc.place_order(cmd)
+        result = await run_in_threadpool(place_order_uc.place_order, cmd)
 
         if isinstance(result, Success):
-            receipt = result.unwrap()
-            order_id = str(receipt.order_id.value)
-            response.headers["Location"] = f"/orders/{order_id}"
-            return OrderReceiptResponse(
-                order_id=order_id,
-                customer_id=receipt.customer_id.value,
-                total=str(receipt.total.amount),
-                currency=receipt.total.currency,
-            )
-
-        if isinstance(
-            result, (IdempotencyInProgress, IdempotencyFailed, IdempotencyKeyConflict)
-        ):
-            return 409, ErrorResponse(type=type(result).__name__, message=str(err))
-
-        raise result.failure()
+            return receipt_response(result.unwrap(), response)
+        return error_response(result.failure())
 
     @app.get(
         "/orders",
@@ -242,7 +734,7 @@ def create_app(
                 ],
             )
 
-        raise result.failure()
+        return error_response(result.failure())
 
     @app.get(
         "/orders/{order_id}",
@@ -274,6 +766,83 @@ def create_app(
                 ],
             )
 
-        raise result.failure()
+        return error_response(result.failure())
+
+    @app.get(
+        "/customers/{customer_id}/summary",
+        response_model=CustomerSummaryResponse,
+        responses={
+            400: {"model": ErrorResponse},
+            404: {"model": ErrorResponse},
+            500: {"model": ErrorResponse},
+        },
+    )
+    def get_customer_summary(customer_id: str) -> Any:
+        result = customer_summary_uc.get_customer_summary(
+            GetCustomerSummaryQuery(customer_id=customer_id)
+        )
+
+        if isinstance(result, Success):
+            view = result.unwrap()
+            return CustomerSummaryResponse(
+                customer_id=view.customer_id.value,
+                order_count=view.order_count,
+                lifetime_total=str(view.lifetime_total.amount),
+                currency=view.lifetime_total.currency,
+                first_order_at=view.first_order_at,
+                last_order_at=view.last_order_at,
+            )
+
+        return error_response(result.failure())
 
+    if runtime is not None and runtime.policy.freeze_heap:
+        # ストア・adapter・ルートまで組み上がった時点のヒープを GC の走査対象から外す
+        runtime.freeze_heap()
     return app
+
+
+# ---- diagnostics -----------------------------------------------------------------
+#
+# /debug/memory/* は X-Diagnostics-Token が一致したときだけ応答する（それ以外は 403）。
+# スナップショットの比較は重いので、どれも def（スレッドプール）で動かしてイベントループを塞がない。
+
+
+def _add_diagnostics_routes(app: FastAPI, diagnostics: MemoryDiagnostics) -> None:
+    def guarded(token: str | None) -> JSONResponse | None:
+        if diagnostics.authorized(token):
+            return None
+        body = ErrorResponse(type="Forbidden", message="diagnostics token required")
+        return JSONResponse(status_code=403, content=body.model_dump())
+
+    token_header = Header(None, alias="X-Diagnostics-Token")
+
+    @app.post("/debug/memory/start")
+    def memory_start(
+        nframes: int | None = Query(None, ge=1, le=100),
+        token: str | None = token_header,
+    ) -> Any:
+        return guarded(token) or diagnostics.start(nframes)
+
+    @app.post("/debug/memory/stop")
+    def memory_stop(token: str | None = token_header) -> Any:
+        return guarded(token) or diagnostics.stop()
+
+    @app.post("/debug/memory/baseline")
+    def memory_baseline(token: str | None = token_header) -> Any:
+        return guarded(token) or diagnostics.reset_baseline()
+
+    @app.get("/debug/memory/diff")
+    def memory_diff(
+        group: GroupBy = "module",
+        limit: int = Query(20, ge=1, le=500),
+        token: str | None = token_header,
+    ) -> Any:
+        return guarded(token) or diagnostics.diff(group, limit)
+
+    @app.get("/debug/memory/stores")
+    def memory_stores(token: str | None = token_header) -> Any:
+        return guarded(token) or diagnostics.footprints()
+
+    @app.get("/debug/memory/requests")
+    def memory_requests(token: str | None = token_header) -> Any:
+        return guarded(token) or diagnostics.requests()
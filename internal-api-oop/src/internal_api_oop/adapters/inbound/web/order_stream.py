@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from decimal import Decimal
+from typing import Any, Callable
+
+# POST /orders/large 用の逐次 JSON パーサ。
+# ボディはチャンクごとに feed し、"lines" 配列の要素は 1 件デコードするたびに
+# on_line(index, value) へ渡して捨てる（明細のリストをメモリに作らない）。
+# それ以外のトップレベルの値は header に残す。
+# "lines" が重複したら json.loads と同じく後勝ちにする（on_restart で読んだ明細を捨てさせる）。
+# エラーメッセージと位置は json.loads に合わせる（FastAPI の json_invalid と同じ形にするため）。
+
+_WS = re.compile(r"[ \t\n\r]*")
+_COMPACT_AT = 1 << 16  # 消費済みの先頭をこれ以上溜めない
+_MAX_PENDING = 1 << 20  # これより長い値が閉じないなら途中切れではなく構文エラー
+_DELIMS = frozenset(",:]}")
+
+_EXPECTING = {
+    "start": "Expecting value",
+    "key_or_end": "Expecting property name enclosed in double quotes",
+    "key": "Expecting property name enclosed in double quotes",
+    "colon": "Expecting ':' delimiter",
+    "value": "Expecting value",
+    "lines_open": "Expecting value",
+    "line_or_end": "Expecting value",
+    "line": "Expecting value",
+    "line_sep": "Expecting ',' delimiter",
+    "comma_or_end": "Expecting ',' delimiter",
+}
+
+
+class StreamDecodeError(ValueError):
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(message)
+        self.position = position
+
+
+class IncrementalOrderParser:
+    def __init__(
+        self,
+        on_line: Callable[[int, Any], None],
+        on_restart: Callable[[], None] = lambda: None,
+    ) -> None:
+        self._on_line = on_line
+        self._on_restart = on_restart
+        self._decoder = json.JSONDecoder(parse_float=Decimal)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._consumed = 0  # 捨てた先頭の文字数（エラー位置の報告用）
+        self._state = "start"
+        self._key = ""
+        self.header: dict[str, Any] = {}
+        self.document: Any = None  # トップレベルがオブジェクトでなかったときの値
+        self.line_count = 0
+        self.streamed_lines = False  # 最後の "lines" が配列で、on_line に流したか
+
+    def feed(self, data: bytes) -> None:
+        try:
+            text = self._text.decode(data)
+        except UnicodeDecodeError as e:
+            raise StreamDecodeError(f"invalid utf-8: {e.reason}", self._offset()) from e
+        self._append(text)
+        self._run(final=False)
+
+    def close(self) -> None:
+        try:
+            text = self._text.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise StreamDecodeError(f"invalid utf-8: {e.reason}", self._offset()) from e
+        self._append(text)
+        self._run(final=True)
+        if self._state != "done":
+            raise StreamDecodeError(_EXPECTING[self._state], self._offset())
+
+    # ---- state machine -----------------------------------------------------
+
+    def _run(self, final: bool) -> None:
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+            if self._pos >= len(self._buf):
+                return
+            ch = self._buf[self._pos]
+            state = self._state
+
+            if state == "start":
+                if ch == "{":
+                    self._pos += 1
+                    self._state = "key_or_end"
+                    continue
+                # オブジェクト以外はそのまま読んで、型の検証エラーにする
+                value = self._value(final)
+                if value is _MORE:
+                    return
+                self.document = value
+                self._state = "done"
+            elif state in ("key_or_end", "key"):
+                if ch == "}" and state == "key_or_end":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                if ch != '"':
+                    raise StreamDecodeError(_EXPECTING[state], self._offset())
+                key = self._value(final)
+                if key is _MORE:
+                    return
+                self._key = key
+                self._state = "colon"
+            elif state == "colon":
+                self._expect(ch, ":")
+                if self._key == "lines" and "lines" in self.header:
+                    self.line_count = 0
+                    self.streamed_lines = False
+                    self._on_restart()
+                self._state = "lines_open" if self._key == "lines" else "value"
+            elif state == "value":
+                value = self._value(final)
+                if value is _MORE:
+                    return
+                self.header[self._key] = value
+                self._state = "comma_or_end"
+            elif state == "lines_open":
+                if ch != "[":
+                    # 配列でなければ通常の値として残す（検証側で弾く）
+                    self._state = "value"
+                    continue
+                self._pos += 1
+                self.header["lines"] = None  # 存在だけ記録する
+                self.streamed_lines = True
+                self._state = "line_or_end"
+            elif state in ("line_or_end", "line"):
+                if ch == "]" and state == "line_or_end":
+                    self._pos += 1
+                    self._state = "comma_or_end"
+                    continue
+                if not self._lines(final):
+                    return
+            elif state == "line_sep":
+                if ch == ",":
+                    self._pos += 1
+                    self._state = "line"
+                else:
+                    self._expect(ch, "]")
+                    self._state = "comma_or_end"
+            elif state == "comma_or_end":
+                if ch == ",":
+                    self._pos += 1
+                    self._state = "key"
+                else:
+                    self._expect(ch, "}")
+                    self._state = "done"
+            else:  # done
+                raise StreamDecodeError("Extra data", self._offset())
+
+    def _lines(self, final: bool) -> bool:
+        # 明細の配列はボディの大半なので、状態遷移を介さずにまとめて読む
+        buf, pos, end = self._buf, self._pos, len(self._buf)
+        decode, ws, on_line = self._decoder.raw_decode, _WS.match, self._on_line
+        n = self.line_count
+        try:
+            while True:
+                try:
+                    value, stop = decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if final or end - pos > _MAX_PENDING:
+                        raise StreamDecodeError(e.msg, self._consumed + e.pos) from e
+                    return False
+                nxt = ws(buf, stop).end()  # type: ignore[union-attr]
+                if not final and (nxt >= end or buf[nxt] not in _DELIMS):
+                    # 区切りを見てから確定する（"12" + "34" や "5." + "5" の途中切れ対策）
+                    if end - pos <= _MAX_PENDING:
+                        return False
+                on_line(n, value)
+                n += 1
+                pos = nxt
+                if pos < end and buf[pos] == ",":
+                    pos = ws(buf, pos + 1).end()  # type: ignore[union-attr]
+                    self._state = "line"  # 以降の "]" は末尾カンマ
+                    if pos >= end:
+                        return False
+                    continue
+                self._state = "line_sep"
+                return True
+        finally:
+            self._pos = pos
+            self.line_count = n
+
+    def _value(self, final: bool) -> Any:
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if final or len(self._buf) - self._pos > _MAX_PENDING:
+                raise StreamDecodeError(e.msg, self._consumed + e.pos) from e
+            return _MORE  # 値がチャンクの境目で切れている
+        if not final:
+            nxt = _WS.match(self._buf, end).end()  # type: ignore[union-attr]
+            if (nxt >= len(self._buf) or self._buf[nxt] not in _DELIMS) and (
+                len(self._buf) - self._pos <= _MAX_PENDING
+            ):
+                return _MORE  # 数値は区切りが来るまで続きがあるかもしれない
+        self._pos = end
+        return value
+
+    def _expect(self, ch: str, want: str) -> None:
+        if ch != want:
+            raise StreamDecodeError(_EXPECTING[self._state], self._offset())
+        self._pos += 1
+
+    def _append(self, text: str) -> None:
+        if self._pos >= _COMPACT_AT:
+            self._consumed += self._pos
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        self._buf += text
+
+    def _offset(self) -> int:
+        return self._consumed + self._pos
+
+
+class _More:
+    pass
+
+
+_MORE: Any = _More()
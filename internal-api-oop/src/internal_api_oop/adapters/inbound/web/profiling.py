@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import cProfile
+import hmac
+import itertools
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Literal, TypeVar, cast
+
+from internal_api_oop.adapters.metrics import MetricSample
+
+# リクエスト単位のオンデマンド CPU プロファイル。
+#
+# - 特権ヘッダ（X-Profile: <token>）が一致したリクエストか、sample_rate の割合で選んだリクエストだけ、
+#   use case の呼び出しをプロファイラの下で走らせ、directory に成果物を書く
+#   deterministic: cProfile → <id>.pstats / sampling: スタックのサンプリング → <id>.collapsed
+#   どちらも <id>.json に PlaceOrderService のステージ別・adapter 呼び出し別の内訳（包含時間）を添える
+# - 応答には X-Profile-Id を付ける（成果物のファイル名の接頭辞）
+# - create_app に profiler を渡さなければ middleware も use case の包みも入らない（無効時のコストは 0）
+#
+# use case は（同期ルートなら）スレッドプールで動くので、対象かどうかは contextvar で渡す。
+# executor に投げた処理（与信の並行実行など）は別スレッドなので、呼び出し側の待ち時間として現れる。
+
+T = TypeVar("T")
+ProfileMode = Literal["deterministic", "sampling"]
+
+_STAGE_FILES = ("place_order_service.py", "batching_place_order_service.py")
+_STAGES = frozenset(
+    {
+        "_validate",
+        "_validate_command",
+        "_build_context",
+        "_resume",
+        "_hold_and_authorize",
+        "_hold_and_authorize_batch",
+        "_hold_inventory",
+        "_authorize_payment",
+        "_confirm_hold",
+        "_capture_payment",
+        "_persist",
+        "_publish",
+        "_compensate",
+    }
+)
+_ADAPTERS_DIR = "/adapters/outbound/"
+
+
+@dataclass(frozen=True)
+class ProfilingPolicy:
+    directory: str
+    token: str | None = None  # X-Profile ヘッダで強制的に取るための共有鍵
+    sample_rate: float = 0.0  # ヘッダ無しのリクエストを取る割合
+    mode: ProfileMode = "deterministic"
+    sample_interval_seconds: float = 0.001  # sampling モードの間隔
+
+
+@dataclass(frozen=True)
+class _Target:
+    profile_id: str
+    reason: Literal["header", "sampled"]
+    method: str
+    path: str
+
+
+_TARGET: ContextVar[_Target | None] = ContextVar("profile_target", default=None)
+# cProfile はプロセスで同時に 1 つしか有効にできない（3.12 以降は sys.monitoring の枠を取り合い、
+# 2 つ目の enable が ValueError になる）。取れなかったリクエストはサンプリングで取る
+_CPROFILE = threading.Lock()
+
+
+def classify(filename: str, function: str) -> tuple[str, str] | None:
+    """プロファイル中の関数を ("stage" | "adapter", ラベル) に分類する。対象外は None。"""
+    path = filename.replace(os.sep, "/")
+    if path.endswith(_STAGE_FILES) and function in _STAGES:
+        return "stage", function.lstrip("_")
+    if _ADAPTERS_DIR in path and not function.startswith(("_", "<")):
+        module = path.rsplit("/", 1)[-1].removesuffix(".py")
+        return "adapter", f"{module}.{function}"
+    return None
+
+
+class RequestProfiler:
+    def __init__(
+        self, policy: ProfilingPolicy, rng: random.Random | None = None
+    ) -> None:
+        self.policy = policy
+        self._rng = rng or random.Random()
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self.written: Counter[str] = Counter()  # reason ごとの成果物数
+        os.makedirs(policy.directory, exist_ok=True)
+
+    # ---- 対象の選択（イベントループ上） ----------------------------------------
+
+    def select(self, method: str, path: str, header: bytes | None) -> _Target | None:
+        reason: Literal["header", "sampled"] | None = None
+        token = self.policy.token
+        if header is not None and token is not None:
+            if hmac.compare_digest(header, token.encode()):
+                reason = "header"
+        if reason is None and self.policy.sample_rate > 0:
+            if self._rng.random() < self.policy.sample_rate:
+                reason = "sampled"
+        if reason is None:
+            return None
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        profile_id = f"{stamp}-{os.getpid()}-{next(self._seq)}"
+        return _Target(profile_id, reason, method, path)
+
+    # ---- use case の包み ------------------------------------------------------
+
+    def wrap(self, port: T) -> T:
+        """port（use case）の公開メソッドを、対象リクエストのときだけプロファイルする。"""
+        return cast(T, _ProfiledPort(port, self))
+
+    def call(self, name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        target = _TARGET.get()
+        if target is None:
+            return fn(*args, **kwargs)
+        reset = _TARGET.set(None)  # 内側の use case 呼び出しで二重に取らない
+        try:
+            if self.policy.mode == "deterministic" and _CPROFILE.acquire(
+                blocking=False
+            ):
+                try:
+                    return self._deterministic(target, name, fn, args, kwargs)
+                finally:
+                    _CPROFILE.release()
+            return self._sampled(target, name, fn, args, kwargs)
+        finally:
+            _TARGET.reset(reset)
+
+    def _deterministic(
+        self,
+        target: _Target,
+        name: str,
+        fn: Callable[..., T],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> T:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # ほかのツール（デバッガ・カバレッジ）が使っている
+            return self._sampled(target, name, fn, args, kwargs)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            wall = time.perf_counter() - started
+            base = os.path.join(self.policy.directory, target.profile_id)
+            try:
+                profile.dump_stats(base + ".pstats")
+                breakdown = _breakdown_from_pstats(pstats.Stats(profile).stats)
+                self._write_report(base, target, name, "deterministic", wall, breakdown)
+            except OSError:
+                pass  # 成果物が書けなくてもリクエストは失敗させない
+
+    def _sampled(
+        self,
+        target: _Target,
+        name: str,
+        fn: Callable[..., T],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> T:
+        interval = self.policy.sample_interval_seconds
+        sampler = _StackSampler(threading.get_ident(), interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sampler.stop()
+            wall = time.perf_counter() - started
+            base = os.path.join(self.policy.directory, target.profile_id)
+            try:
+                with open(base + ".collapsed", "w") as f:
+                    for stack, n in sampler.samples.items():
+                        folded = ";".join(f"{_basename(p)}:{func}" for p, func in stack)
+                        f.write(f"{folded} {n}\n")
+                breakdown = _breakdown_from_samples(sampler.samples, interval)
+                self._write_report(base, target, name, "sampling", wall, breakdown)
+            except OSError:
+                pass  # 成果物が書けなくてもリクエストは失敗させない
+
+    def _write_report(
+        self,
+        base: str,
+        target: _Target,
+        name: str,
+        mode: ProfileMode,
+        wall: float,
+        breakdown: dict[str, dict[str, dict[str, float]]],
+    ) -> None:
+        report = {
+            "profile_id": target.profile_id,
+            "reason": target.reason,
+            "method": target.method,
+            "path": target.path,
+            "use_case": name,
+            "mode": mode,  # 指定が deterministic でも、使用中ならサンプリングで取る
+            "wall_ms": round(wall * 1000, 3),
+            **breakdown,
+        }
+        with open(base + ".json", "w") as f:
+            json.dump(report, f, indent=2)
+        with self._lock:
+            self.written[target.reason] += 1
+
+
+class _ProfiledPort:
+    def __init__(self, inner: Any, profiler: RequestProfiler) -> None:
+        self._inner = inner
+        self._profiler = profiler
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        profiler = self._profiler
+
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            return profiler.call(name, attr, *args, **kwargs)
+
+        return profiled
+
+
+# ---- 内訳 ------------------------------------------------------------------------
+
+
+def _breakdown_from_pstats(
+    raw: dict[tuple[str, int, str], tuple[int, int, float, float, Any]],
+) -> dict[str, dict[str, dict[str, float]]]:
+    out: dict[str, dict[str, dict[str, float]]] = {"stages": {}, "adapters": {}}
+    for (filename, _, function), (_, calls, _, cumulative, _) in raw.items():
+        kind = classify(filename, function)
+        if kind is None:
+            continue
+        entry = out[kind[0] + "s"].setdefault(kind[1], {"calls": 0, "ms": 0.0})
+        entry["calls"] += calls
+        entry["ms"] = round(entry["ms"] + cumulative * 1000, 3)
+    return _sorted(out)
+
+
+def _breakdown_from_samples(
+    samples: Counter[tuple[tuple[str, str], ...]], interval: float
+) -> dict[str, dict[str, dict[str, float]]]:
+    out: dict[str, dict[str, dict[str, float]]] = {"stages": {}, "adapters": {}}
+    for stack, n in samples.items():
+        # 同じラベルがスタックに何段あっても 1 サンプルは 1 回だけ数える（包含時間）
+        labels = {k for k in (classify(file, func) for file, func in stack) if k}
+        for kind, label in labels:
+            entry = out[kind + "s"].setdefault(label, {"samples": 0, "ms": 0.0})
+            entry["samples"] += n
+            entry["ms"] = round(entry["samples"] * interval * 1000, 3)
+    return _sorted(out)
+
+
+def _sorted(
+    out: dict[str, dict[str, dict[str, float]]],
+) -> dict[str, dict[str, dict[str, float]]]:
+    return {
+        kind: dict(sorted(entries.items(), key=lambda kv: -kv[1]["ms"]))
+        for kind, entries in out.items()
+    }
+
+
+def _basename(filename: str) -> str:
+    return filename.replace(os.sep, "/").rsplit("/", 1)[-1]
+
+
+class _StackSampler:
+    """指定スレッドのスタックを一定間隔で取る（collapsed stack 用）。"""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self.samples: Counter[tuple[tuple[str, str], ...]] = Counter()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack: list[tuple[str, str]] = []
+            while frame is not None:
+                stack.append((frame.f_code.co_filename, frame.f_code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+
+# ---- ASGI middleware -------------------------------------------------------------
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                header = value
+                break
+        target = self.profiler.select(scope["method"], scope["path"], header)
+        if target is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_id(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", target.profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        reset = _TARGET.set(target)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _TARGET.reset(reset)
+
+
+def profiling_metrics(
+    profiler: RequestProfiler,
+) -> Callable[[], Iterable[MetricSample]]:
+    """書き出したプロファイルの数を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        for reason in ("header", "sampled"):
+            yield MetricSample(
+                "request_profiles_written_total",
+                profiler.written[reason],
+                (("reason", reason),),
+                kind="counter",
+            )
+
+    return collect
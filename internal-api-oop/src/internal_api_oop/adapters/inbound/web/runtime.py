@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+import anyio.to_thread
+
+from internal_api_oop.adapters.metrics import MetricSample
+
+# レイテンシの裾がバックエンドにも流量にも対応しないときの切り分け用に、ランタイム側の待ちを数える。
+#
+# - GC の停止時間：gc.callbacks の start / stop の間を世代別に集計する（直近の停止は時刻付きで残す）
+# - イベントループの遅れ：lag_interval ごとに sleep し、予定より遅れて起きた分を遅れとみなす
+# - スレッドプール：def のルートは anyio の既定の CapacityLimiter（既定 40 枠）を取って走る。
+#   同じ tick で使用中の枠と枠待ちのタスク数を読み、使用中の枠 × 経過時間を積算する
+#   （limiter はイベントループごとの値なので、ループ上の probe からしか読めない）
+#
+# probe はイベントループが動き出してから最初のリクエストで起動する（lifespan を使わない起動でも動くように）。
+# freeze_heap を指定すると、組み立てが終わった時点で生きているオブジェクト（ストア・adapter・
+# モジュール）を gc.freeze で永続世代に移し、以降の世代別 GC の走査対象から外す。
+
+_GENERATIONS = (0, 1, 2)
+
+
+@dataclass(frozen=True)
+class RuntimePolicy:
+    lag_interval_seconds: float = 0.1
+    freeze_heap: bool = False  # 組み立て後のヒープを gc.freeze する
+    recent: int = 256  # 時刻付きで残す直近の GC 停止の件数
+
+
+@dataclass(frozen=True)
+class GcPause:
+    generation: int
+    seconds: float
+    collected: int
+    at: float  # 停止が終わった時刻（time.time）
+
+
+@dataclass
+class _GenerationStats:
+    pauses: int = 0
+    seconds_sum: float = 0.0
+    seconds_max: float = 0.0
+    collected: int = 0
+    uncollectable: int = 0
+
+
+class RuntimeMonitor:
+    def __init__(self, policy: RuntimePolicy = RuntimePolicy()) -> None:
+        self.policy = policy
+        self.gc = {g: _GenerationStats() for g in _GENERATIONS}
+        self.recent_pauses: deque[GcPause] = deque(maxlen=policy.recent)
+        self._gc_started = 0.0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.lag_sum = 0.0
+        self.lag_samples = 0
+        self.threadpool_tokens = 0
+        self.threadpool_busy = 0
+        self.threadpool_waiting = 0
+        self.threadpool_waiting_max = 0
+        self.threadpool_busy_seconds = 0.0  # 使用中の枠 × 秒
+        self.threadpool_waiting_seconds = 0.0  # 枠待ちのタスク数 × 秒
+        self.frozen = 0
+        self._task: asyncio.Task[None] | None = None
+        gc.callbacks.append(self._on_gc)
+
+    def close(self) -> None:
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._task is not None:
+            self._task.cancel()
+
+    # ---- GC ---------------------------------------------------------------------
+
+    def _on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        # 収集中に呼ばれるので、確保を増やさない範囲で最小限だけ記録する
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+        seconds = time.perf_counter() - self._gc_started
+        stats = self.gc[info["generation"]]
+        stats.pauses += 1
+        stats.seconds_sum += seconds
+        if seconds > stats.seconds_max:
+            stats.seconds_max = seconds
+        stats.collected += info["collected"]
+        stats.uncollectable += info["uncollectable"]
+        self.recent_pauses.append(
+            GcPause(info["generation"], seconds, info["collected"], time.time())
+        )
+
+    def freeze_heap(self) -> int:
+        """ここまでに作られたオブジェクトを永続世代に移し、その件数を返す。"""
+        # 起動時に 1 回だけ行う全体収集なので、リクエストを止めた停止としては数えない
+        registered = self._on_gc in gc.callbacks
+        if registered:
+            gc.callbacks.remove(self._on_gc)
+        try:
+            gc.collect()
+        finally:
+            if registered:
+                gc.callbacks.append(self._on_gc)
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+        return self.frozen
+
+    # ---- イベントループ / スレッドプール ----------------------------------------
+
+    def ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.get_loop() is not loop or self._task.done():
+            self._task = loop.create_task(self._probe())
+
+    async def _probe(self) -> None:
+        interval = self.policy.lag_interval_seconds
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(interval)
+            now = loop.time()
+            elapsed = now - last
+            last = now
+            lag = max(0.0, elapsed - interval)
+            self.lag_last = lag
+            self.lag_sum += lag
+            self.lag_samples += 1
+            if lag > self.lag_max:
+                self.lag_max = lag
+            stats = limiter.statistics()
+            self.threadpool_tokens = int(stats.total_tokens)
+            self.threadpool_busy = stats.borrowed_tokens
+            self.threadpool_waiting = stats.tasks_waiting
+            self.threadpool_waiting_max = max(
+                self.threadpool_waiting_max, stats.tasks_waiting
+            )
+            self.threadpool_busy_seconds += stats.borrowed_tokens * elapsed
+            self.threadpool_waiting_seconds += stats.tasks_waiting * elapsed
+
+
+# ---- ASGI middleware -------------------------------------------------------------
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class RuntimeMiddleware:
+    """最初のリクエストでイベントループ上の probe を起動するだけで、リクエストには触れない。"""
+
+    def __init__(self, app: ASGIApp, monitor: RuntimeMonitor) -> None:
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            self.monitor.ensure_started()
+        await self.app(scope, receive, send)
+
+
+def runtime_metrics(monitor: RuntimeMonitor) -> Callable[[], Iterable[MetricSample]]:
+    """GC の停止時間・イベントループの遅れ・スレッドプールの埋まり具合を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        for g, stats in monitor.gc.items():
+            labels = (("generation", str(g)),)
+            yield MetricSample("gc_pauses_total", stats.pauses, labels, kind="counter")
+            yield MetricSample(
+                "gc_pause_seconds_sum", stats.seconds_sum, labels, kind="counter"
+            )
+            yield MetricSample("gc_pause_seconds_max", stats.seconds_max, labels)
+            yield MetricSample(
+                "gc_collected_objects_total", stats.collected, labels, kind="counter"
+            )
+            yield MetricSample(
+                "gc_uncollectable_objects_total",
+                stats.uncollectable,
+                labels,
+                kind="counter",
+            )
+        for g, n in zip(_GENERATIONS, gc.get_count()):
+            yield MetricSample(
+                "gc_pending_allocations",
+                n,
+                (("generation", str(g)),),
+                help="allocations (gen 0) or younger collections since the last one",
+            )
+        yield MetricSample("gc_frozen_objects", gc.get_freeze_count())
+        yield MetricSample(
+            "event_loop_lag_seconds_last",
+            monitor.lag_last,
+            help="how late the probe woke up on its last tick",
+        )
+        yield MetricSample("event_loop_lag_seconds_max", monitor.lag_max)
+        yield MetricSample(
+            "event_loop_lag_seconds_sum", monitor.lag_sum, kind="counter"
+        )
+        yield MetricSample(
+            "event_loop_lag_samples_total", monitor.lag_samples, kind="counter"
+        )
+        yield MetricSample(
+            "threadpool_tokens",
+            monitor.threadpool_tokens,
+            help="threadpool size for def routes",
+        )
+        yield MetricSample("threadpool_busy", monitor.threadpool_busy)
+        yield MetricSample(
+            "threadpool_utilization",
+            monitor.threadpool_busy / monitor.threadpool_tokens
+            if monitor.threadpool_tokens
+            else 0.0,
+        )
+        yield MetricSample("threadpool_waiting", monitor.threadpool_waiting)
+        yield MetricSample("threadpool_waiting_max", monitor.threadpool_waiting_max)
+        yield MetricSample(
+            "threadpool_busy_seconds_total",
+            monitor.threadpool_busy_seconds,
+            kind="counter",
+            help="sum over ticks of busy tokens times tick length",
+        )
+        yield MetricSample(
+            "threadpool_waiting_seconds_total",
+            monitor.threadpool_waiting_seconds,
+            kind="counter",
+        )
+
+    return collect
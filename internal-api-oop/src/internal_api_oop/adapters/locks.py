@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Hashable, Iterable, Iterator
+
+# インメモリのストアで共有する、キーごとのロック。
+#
+# 1 本のロックで全体を守ると、GIL の無い（free-threaded）インタプリタでは別のキーを触る
+# スレッドどうしまでそこで並ぶ。キーのハッシュで固定本数のロックに振り分けて、
+# 同じキー（と、たまたま同じ枠に落ちたキー）だけを直列にする。
+# キーの数だけロックを作らないので、キーが増えてもメモリは増えない。
+
+
+class StripedLock:
+    def __init__(self, stripes: int = 64) -> None:
+        self._locks = tuple(threading.Lock() for _ in range(stripes))
+
+    def of(self, key: Hashable) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    @contextmanager
+    def holding(self, keys: Iterable[Hashable]) -> Iterator[None]:
+        """複数のキーの枠をまとめて取る。枠の番号順に取るので、取り合っても詰まらない。"""
+        n = len(self._locks)
+        locks = [self._locks[i] for i in sorted({hash(k) % n for k in keys})]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
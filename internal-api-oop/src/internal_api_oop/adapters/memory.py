@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import dataclasses
+import sys
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Collection
+
+# adapter 間で共有する、インメモリのストアが抱えている量の見積もり。
+# 各ストアは FootprintSource（呼ばれた時点の件数と推定バイト数を返す関数）を公開し、
+# 診断用の web adapter がまとめて返す。
+#
+# バイト数は「要素を最大 sample 件だけ辿って測った平均 × 件数 + 入れ物自体の大きさ」で見積もる。
+# 要素間で共有しているオブジェクト（SKU の文字列、小さい int など）は最初に見た 1 回だけ数えて
+# 件数倍するので、あくまで桁と増え方を見るための目安。
+
+
+@dataclass(frozen=True)
+class StoreFootprint:
+    store: str
+    objects: dict[str, int]  # 種類 → 件数
+    bytes_estimate: int
+    sampled: int  # 見積もりのために辿った要素数
+
+
+FootprintSource = Callable[[], StoreFootprint]
+
+
+@dataclass(frozen=True)
+class ContainerSample:
+    shell_bytes: int  # 入れ物自体（dict のハッシュ表、list のポインタ配列）
+    length: int
+    items: list[Any]
+
+
+def take_sample(container: Collection[Any], sample: int = 1000) -> ContainerSample:
+    """
+    先頭から最大 sample 件を取り出す。ストアのロックの中で呼び、辿るのはロックの外でやる。
+    ロックの無いストアでは並行に書き換わって RuntimeError になり得るので数回やり直す。
+    """
+    for _ in range(3):
+        try:
+            items = (
+                list(islice(container.items(), sample))
+                if isinstance(container, dict)
+                else list(islice(container, sample))
+            )
+        except RuntimeError:  # dictionary changed size during iteration
+            continue
+        return ContainerSample(sys.getsizeof(container), len(container), items)
+    return ContainerSample(sys.getsizeof(container), len(container), [])
+
+
+def estimate_bytes(s: ContainerSample, seen: set[int]) -> int:
+    """sample の平均から container 全体のバイト数を見積もる（seen は同じストア内で共有する）。"""
+    if not s.items:
+        return s.shell_bytes
+    measured = sum(deep_sizeof(x, seen) for x in s.items)
+    return s.shell_bytes + measured * s.length // len(s.items)
+
+
+def deep_sizeof(obj: Any, seen: set[int] | None = None) -> int:
+    """obj から辿れるオブジェクトの sys.getsizeof の合計（同じオブジェクトは 1 回だけ）。"""
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if o is None or isinstance(o, (str, bytes, bytearray, int, float)):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif dataclasses.is_dataclass(o):
+            stack.extend(getattr(o, f.name) for f in dataclasses.fields(o))
+        elif hasattr(o, "__dict__"):
+            stack.extend(vars(o).values())
+    return total
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, Literal
+
+# adapter 間で共有する最小限のメトリクス表現。
+# 各 adapter は MetricsSource（呼ばれた時点の値を返す関数）を公開し、
+# web adapter が GET /metrics で Prometheus テキスト形式にまとめて出す。
+
+
+@dataclass(frozen=True)
+class MetricSample:
+    name: str
+    value: float
+    labels: tuple[tuple[str, str], ...] = ()
+    kind: Literal["counter", "gauge"] = "gauge"
+    help: str = ""
+
+
+MetricsSource = Callable[[], Iterable[MetricSample]]
+
+
+def render_prometheus(sources: Iterable[MetricsSource]) -> str:
+    lines: list[str] = []
+    declared: set[str] = set()
+    for source in sources:
+        for s in source():
+            if s.name not in declared:
+                declared.add(s.name)
+                if s.help:
+                    lines.append(f"# HELP {s.name} {s.help}")
+                lines.append(f"# TYPE {s.name} {s.kind}")
+            lines.append(f"{s.name}{_labels(s.labels)} {_value(s.value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _value(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
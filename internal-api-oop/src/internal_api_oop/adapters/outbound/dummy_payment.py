@@ -1,20 +1,36 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Literal
+from uuid import uuid4
 
 from returns.result import Failure, Result, Success
 
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PaymentDeclined, PlaceOrderError
-from internal_api_oop.core.ports.outbound.payment import ChargeRequest, PaymentGateway
+from internal_api_oop.core.ports.outbound.payment import (
+    Authorization,
+    ChargeRequest,
+    PaymentGateway,
+)
+
+HoldStatus = Literal["authorized", "captured", "voided"]
+_VERB: dict[HoldStatus, str] = {"captured": "capture", "voided": "void"}
 
 
 @dataclass
 class DummyPaymentGateway(PaymentGateway):
     decline_tokens: set[str] | None = None
     max_amount: Decimal = Decimal("1000000.00")
+    holds: dict[str, HoldStatus] = field(init=False, default_factory=dict)
+    _by_key: dict[str, Authorization] = field(init=False, default_factory=dict)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
 
-    def charge(self, request: ChargeRequest) -> Result[None, PlaceOrderError]:
+    def authorize(
+        self, request: ChargeRequest, *, deadline: Deadline | None = None
+    ) -> Result[Authorization, PlaceOrderError]:
         decline = self.decline_tokens or set()
         if request.token in decline:
             return Failure(
@@ -24,4 +40,41 @@ class DummyPaymentGateway(PaymentGateway):
             return Failure(
                 PaymentDeclined(message="amount too large", reason="limit_exceeded")
             )
+
+        auth = Authorization(f"auth_{uuid4().hex}", request.amount)  # 乱数はロックの外で
+        with self._lock:
+            if request.idempotency_key is not None:
+                existing = self._by_key.get(request.idempotency_key)
+                if existing is not None:
+                    return Success(existing)
+            self.holds[auth.authorization_id] = "authorized"
+            if request.idempotency_key is not None:
+                self._by_key[request.idempotency_key] = auth
+        return Success(auth)
+
+    def capture(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self._settle(authorization, "captured")
+
+    def void(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self._settle(authorization, "voided")
+
+    def _settle(
+        self, authorization: Authorization, to: HoldStatus
+    ) -> Result[None, PlaceOrderError]:
+        with self._lock:
+            status = self.holds.get(authorization.authorization_id)
+            if status == to:
+                return Success(None)  # 同じ操作の再送は成功扱い
+            if status != "authorized":
+                return Failure(
+                    PaymentDeclined(
+                        message=f"cannot {_VERB[to]} authorization",
+                        reason=f"authorization_{status or 'not_found'}",
+                    )
+                )
+            self.holds[authorization.authorization_id] = to
         return Success(None)
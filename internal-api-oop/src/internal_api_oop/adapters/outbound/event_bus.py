@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import queue
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Iterable, Literal, Sequence
+
+from returns.result import Result, Success
+
+from internal_api_oop.adapters.metrics import MetricSample
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import PlaceOrderError
+from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
+
+# プロセス内のイベントバス。publish はキューに積むだけで、購読側の処理はリクエスト経路の外で走る。
+#
+# - 購読者ごとに workers 本のワーカーを持ち、order_id のハッシュで担当を決める
+#   （同じ注文のイベントは常に同じワーカーが順番に処理する）
+# - キューは購読者ごとに queue_size 件まで。溢れた分はチェックアウトを失敗させずに dead letter に回す
+# - 失敗（Failure / 例外）は指数バックオフ + jitter で max_attempts 回まで再試行し、
+#   それでも駄目なら dead letter に回す。再試行中は同じワーカーの後続を待たせる（順序を守るため）
+
+EventHandler = Callable[[OrderPlaced], Result[None, PlaceOrderError]]
+DeadLetterReason = Literal["retries_exhausted", "queue_full", "closed"]
+
+
+@dataclass(frozen=True)
+class SubscriberPolicy:
+    workers: int = 1
+    queue_size: int = 1024  # 購読者全体（ワーカーに等分する）
+    max_attempts: int = 5
+    backoff_base_seconds: float = 0.05
+    backoff_max_seconds: float = 2.0
+
+
+@dataclass(frozen=True)
+class DeadLetter:
+    subscriber: str
+    event: OrderPlaced
+    reason: DeadLetterReason
+    error: str
+    attempts: int
+    at: float
+
+
+class InMemoryDeadLetterStore:
+    """配送できなかったイベントの置き場。redrive で取り出して再投入できる。"""
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._entries: list[DeadLetter] = []
+        self.dropped = 0  # capacity を超えて捨てた件数
+
+    def add(self, letter: DeadLetter) -> None:
+        with self._lock:
+            if len(self._entries) >= self._capacity:
+                self.dropped += 1
+                return
+            self._entries.append(letter)
+
+    def entries(self, subscriber: str | None = None) -> list[DeadLetter]:
+        with self._lock:
+            return [
+                e for e in self._entries if subscriber is None or e.subscriber == subscriber
+            ]
+
+    def take(self, subscriber: str) -> list[DeadLetter]:
+        with self._lock:
+            taken = [e for e in self._entries if e.subscriber == subscriber]
+            self._entries = [e for e in self._entries if e.subscriber != subscriber]
+            return taken
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class Subscription:
+    def __init__(
+        self,
+        name: str,
+        handler: EventHandler,
+        policy: SubscriberPolicy,
+        dead_letters: InMemoryDeadLetterStore,
+        sleep: Callable[[float], None],
+    ) -> None:
+        self.name = name
+        self._handler = handler
+        self._policy = policy
+        self._dead_letters = dead_letters
+        self._sleep = sleep
+        self._closed = threading.Event()
+        workers = max(1, policy.workers)
+        per_worker = max(1, -(-policy.queue_size // workers))
+        self._queues: list[queue.Queue[OrderPlaced | None]] = [
+            queue.Queue(per_worker) for _ in range(workers)
+        ]
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.retries = 0
+        self.dead_lettered: dict[DeadLetterReason, int] = {}
+        self._threads = [
+            threading.Thread(
+                target=self._run, args=(q,), name=f"bus-{name}-{i}", daemon=True
+            )
+            for i, q in enumerate(self._queues)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def offer(self, event: OrderPlaced) -> None:
+        if self._closed.is_set():
+            self._dead_letter(event, "closed", "bus is closed", 0)
+            return
+        q = self._queues[_shard(event, len(self._queues))]
+        try:
+            q.put_nowait(event)
+        except queue.Full:
+            self._dead_letter(event, "queue_full", "subscriber queue is full", 0)
+
+    def depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def join(self) -> None:
+        for q in self._queues:
+            q.join()
+
+    def close(self) -> None:
+        self._closed.set()
+        for q in self._queues:
+            q.put(None)  # 積まれている分を処理し終えてから止まる
+        for t in self._threads:
+            t.join()
+
+    def _run(self, q: queue.Queue[OrderPlaced | None]) -> None:
+        while True:
+            event = q.get()
+            try:
+                if event is None:
+                    return
+                self._deliver(event)
+            finally:
+                q.task_done()
+
+    def _deliver(self, event: OrderPlaced) -> None:
+        p = self._policy
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                result = self._handler(event)
+            except Exception as e:  # noqa: BLE001  購読者のバグでワーカーを止めない
+                error = f"{type(e).__name__}: {e}"
+            else:
+                if isinstance(result, Success):
+                    with self._lock:
+                        self.delivered += 1
+                    return
+                error = str(result.failure())
+            reason: DeadLetterReason | None = None
+            if attempts >= p.max_attempts:
+                reason = "retries_exhausted"
+            elif self._closed.is_set():
+                reason = "closed"  # 停止中は待たずに dead letter へ（redrive で戻せる）
+            if reason is not None:
+                self._dead_letter(event, reason, error, attempts)
+                return
+            with self._lock:
+                self.retries += 1
+            self._sleep(self._backoff(attempts))
+
+    def _backoff(self, attempt: int) -> float:
+        p = self._policy
+        cap = min(p.backoff_max_seconds, p.backoff_base_seconds * (2 ** (attempt - 1)))
+        return self._rng.uniform(cap / 2, cap)  # equal jitter
+
+    def _dead_letter(
+        self, event: OrderPlaced, reason: DeadLetterReason, error: str, attempts: int
+    ) -> None:
+        with self._lock:
+            self.dead_lettered[reason] = self.dead_lettered.get(reason, 0) + 1
+        self._dead_letters.add(
+            DeadLetter(self.name, event, reason, error, attempts, time.time())
+        )
+
+
+class InProcessEventBus(EventPublisher):
+    def __init__(
+        self,
+        dead_letters: InMemoryDeadLetterStore | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.dead_letters = (
+            dead_letters if dead_letters is not None else InMemoryDeadLetterStore()
+        )
+        self._sleep = sleep
+        self._subscriptions: dict[str, Subscription] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(
+        self,
+        name: str,
+        handler: EventHandler,
+        policy: SubscriberPolicy = SubscriberPolicy(),
+    ) -> None:
+        with self._lock:
+            if name in self._subscriptions:
+                raise ValueError(f"subscriber already registered: {name}")
+            self._subscriptions[name] = Subscription(
+                name, handler, policy, self.dead_letters, self._sleep
+            )
+
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        # 積むだけなので締め切りは見ない（購読側の処理はリクエストの締め切りと無関係）
+        for sub in tuple(self._subscriptions.values()):
+            sub.offer(event)
+        return Success(None)
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        for event in events:
+            self.publish(event)
+        return [Success(None)] * len(events)
+
+    def redrive(self, subscriber: str) -> int:
+        """dead letter に回ったその購読者宛てのイベントを積み直す。"""
+        sub = self._subscriptions.get(subscriber)
+        if sub is None:
+            return 0
+        letters = self.dead_letters.take(subscriber)
+        for letter in letters:
+            sub.offer(letter.event)
+        return len(letters)
+
+    def join(self) -> None:
+        """今積まれている分が処理（または dead letter 行き）し終わるまで待つ。"""
+        for sub in tuple(self._subscriptions.values()):
+            sub.join()
+
+    def close(self) -> None:
+        for sub in tuple(self._subscriptions.values()):
+            sub.close()
+
+    def subscriptions(self) -> Sequence[Subscription]:
+        return tuple(self._subscriptions.values())
+
+
+def _shard(event: OrderPlaced, n: int) -> int:
+    if n == 1:
+        return 0
+    # hash() はプロセスごとに変わるので、安定したハッシュで振り分ける
+    return zlib.crc32(event.order_id.value.bytes) % n
+
+
+def event_bus_metrics(bus: InProcessEventBus) -> Callable[[], Iterable[MetricSample]]:
+    """購読者ごとのキュー長・配送数・再試行数・dead letter 数を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        for sub in bus.subscriptions():
+            labels = (("subscriber", sub.name),)
+            yield MetricSample("event_bus_queue_depth", sub.depth(), labels)
+            yield MetricSample(
+                "event_bus_delivered_total", sub.delivered, labels, kind="counter"
+            )
+            yield MetricSample(
+                "event_bus_retries_total", sub.retries, labels, kind="counter"
+            )
+            for reason, n in sorted(sub.dead_lettered.items()):
+                yield MetricSample(
+                    "event_bus_dead_letters_total",
+                    n,
+                    labels + (("reason", reason),),
+                    kind="counter",
+                )
+        yield MetricSample("event_bus_dead_letters_stored", len(bus.dead_letters))
+
+    return collect
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Hashable
+
+# 期限付きエントリ用のスケジューラ。
+# 最小ヒープ + タイマースレッド 1 本で、次の期限まで眠るだけ（定期的な全件走査はしない）。
+# 取り消しは遅延削除：期限到来時のコールバックで持ち主が「まだ有効か」を判定する。
+
+
+class ExpiryScheduler:
+    def __init__(
+        self,
+        on_expire: Callable[[Hashable, float], None],
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "expiry",
+    ) -> None:
+        self._on_expire = on_expire
+        self._clock = clock
+        self._name = name
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()  # 同時刻の比較で key 同士を比べないため
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def schedule(self, key: Hashable, at: float) -> None:
+        """at（clock 基準）に on_expire(key, at) を呼ぶ。"""
+        with self._cond:
+            if self._closed:
+                return
+            seq = next(self._seq)
+            heapq.heappush(self._heap, (at, seq, key))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=self._name, daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0][1] == seq:
+                self._cond.notify()  # 先頭が早まったときだけ起こす
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def run_due(self) -> int:
+        """期限を過ぎたものをこのスレッドで処理する（テスト・手動駆動用）。"""
+        due: list[tuple[float, Hashable]] = []
+        with self._cond:
+            now = self._clock()
+            while self._heap and self._heap[0][0] <= now:
+                at, _, key = heapq.heappop(self._heap)
+                due.append((at, key))
+        for at, key in due:
+            self._on_expire(key, at)
+        return len(due)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._heap.clear()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                wait = self._heap[0][0] - self._clock()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            self.run_due()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from returns.result import Failure, Result, Success
+
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import PlaceOrderError
+from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
+
+
+@dataclass
+class FanOutEventPublisher(EventPublisher):
+    """同じイベントを複数の購読先に配る。1 つが失敗しても残りには配り、最初の失敗を返す。"""
+
+    publishers: Sequence[EventPublisher]
+
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        result: Result[None, PlaceOrderError] = Success(None)
+        for p in self.publishers:
+            r = p.publish(event, deadline=deadline)
+            if isinstance(r, Failure) and isinstance(result, Success):
+                result = r
+        return result
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        merged: list[Result[None, PlaceOrderError]] = [Success(None)] * len(events)
+        for p in self.publishers:
+            for i, r in enumerate(p.publish_many(events, deadline=deadline)):
+                if isinstance(r, Failure) and isinstance(merged[i], Success):
+                    merged[i] = r
+        return merged
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import select
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+from urllib.parse import urlsplit
+
+from returns.result import Failure, Result, Success
+
+from internal_api_oop.adapters.metrics import MetricSample
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import (
+    BackendUnavailable,
+    DeadlineExceeded,
+    PaymentDeclined,
+    PlaceOrderError,
+)
+from internal_api_oop.core.domain.model.order import Money
+from internal_api_oop.core.ports.outbound.payment import (
+    Authorization,
+    ChargeRequest,
+    PaymentGateway,
+)
+
+# 外部決済 API（HTTP/JSON）向け adapter。
+#   POST {base_url}/v1/authorizations         (Idempotency-Key 任意)
+#     {"customer_id", "amount", "currency", "token"}
+#     200 {"id", "status": "authorized"} / 402 {"status": "declined", "reason"}
+#   POST {base_url}/v1/authorizations/{id}/capture
+#   POST {base_url}/v1/authorizations/{id}/void
+#     200 {"status": "captured" | "voided"} / 409 {"status", "reason"}
+# capture / void は与信 ID に対して冪等なので常に再送してよい。
+# 接続はホスト単位の keep-alive プールで使い回す（毎回のハンドシェイクを避ける）。
+
+
+@dataclass(frozen=True)
+class HttpPaymentConfig:
+    base_url: str = "http://127.0.0.1:9000"
+    max_connections_per_host: int = 16
+    pool_wait_seconds: float = 0.1  # プールの空き待ち上限
+    connect_timeout_seconds: float = 0.5
+    read_timeout_seconds: float = 2.0
+    idle_timeout_seconds: float = 4.0  # サーバ側 keep-alive より短くしておく
+    max_retries: int = 2
+    backoff_seconds: float = 0.02
+    keep_alive: bool = True  # False なら毎回接続し直す（比較用）
+
+
+# ---- connection pool ---------------------------------------------------------------
+
+
+@dataclass
+class _Idle:
+    conn: http.client.HTTPConnection
+    since: float
+
+
+class _HostPool:
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: int | None,
+        limit: int,
+        connect_timeout: float,
+        idle_timeout: float,
+    ) -> None:
+        self._factory: Callable[[], http.client.HTTPConnection]
+        if scheme == "https":
+            self._factory = lambda: http.client.HTTPSConnection(
+                host, port, timeout=connect_timeout
+            )
+        else:
+            self._factory = lambda: http.client.HTTPConnection(
+                host, port, timeout=connect_timeout
+            )
+        self._idle_timeout = idle_timeout
+        self._sem = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._idle: list[_Idle] = []
+        self.limit = limit
+        self.leased = 0
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.exhausted = 0
+
+    def acquire(self, wait: float) -> tuple[http.client.HTTPConnection, bool] | None:
+        """(接続, 再利用か) を返す。上限に達して wait 内に空かなければ None。"""
+        ok = self._sem.acquire(timeout=wait) if wait > 0 else self._sem.acquire(False)
+        if not ok:
+            with self._lock:
+                self.exhausted += 1
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            self.leased += 1
+            while self._idle:
+                idle = self._idle.pop()  # LIFO：温まっている接続から使う
+                if now - idle.since < self._idle_timeout and not _is_dropped(idle.conn):
+                    self.reused += 1
+                    return idle.conn, True
+                idle.conn.close()
+                self.discarded += 1
+            self.created += 1
+        return self._factory(), False
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        with self._lock:
+            self.leased -= 1
+            if reusable:
+                self._idle.append(_Idle(conn, time.monotonic()))
+            else:
+                conn.close()
+        self._sem.release()
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle:
+                idle.conn.close()
+            self._idle.clear()
+
+
+def _is_dropped(conn: http.client.HTTPConnection) -> bool:
+    # アイドル中の接続が読める = サーバが閉じた（EOF）。送る前に捨てる
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class HttpConnectionPool:
+    """(scheme, host, port) ごとに上限付きの keep-alive プールを持つ。"""
+
+    def __init__(self, config: HttpPaymentConfig) -> None:
+        self._config = config
+        self._hosts: dict[tuple[str, str, int | None], _HostPool] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> _HostPool:
+        u = urlsplit(url)
+        key = (u.scheme or "http", u.hostname or "127.0.0.1", u.port)
+        with self._lock:
+            pool = self._hosts.get(key)
+            if pool is None:
+                pool = _HostPool(
+                    *key,
+                    limit=self._config.max_connections_per_host,
+                    connect_timeout=self._config.connect_timeout_seconds,
+                    idle_timeout=self._config.idle_timeout_seconds,
+                )
+                self._hosts[key] = pool
+            return pool
+
+    def hosts(self) -> list[tuple[str, _HostPool]]:
+        with self._lock:
+            return [
+                (f"{s}://{h}" + (f":{p}" if p else ""), pool)
+                for (s, h, p), pool in self._hosts.items()
+            ]
+
+    def close(self) -> None:
+        with self._lock:
+            for pool in self._hosts.values():
+                pool.close()
+
+
+# ---- gateway -------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _Response:
+    status: int
+    body: bytes
+
+
+@dataclass(frozen=True)
+class _TransportFailure:
+    error: PlaceOrderError
+    sent: bool  # サーバに届いた可能性があるか
+    retryable: bool
+
+
+@dataclass
+class HttpPaymentGateway(PaymentGateway):
+    config: HttpPaymentConfig = field(default_factory=HttpPaymentConfig)
+    sleep: Callable[[float], None] = time.sleep
+    pool: HttpConnectionPool = field(init=False)
+    retries: int = field(init=False, default=0)
+    _rng: random.Random = field(init=False, repr=False, default_factory=random.Random)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self.pool = HttpConnectionPool(self.config)
+        self._base_path = urlsplit(self.config.base_url).path.rstrip("/")
+
+    def authorize(
+        self, request: ChargeRequest, *, deadline: Deadline | None = None
+    ) -> Result[Authorization, PlaceOrderError]:
+        body = json.dumps(
+            {
+                "customer_id": request.customer_id.value,
+                "amount": str(request.amount.amount),
+                "currency": request.amount.currency,
+                "token": request.token,
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        headers = {"content-type": "application/json"}
+        if request.idempotency_key is not None:
+            headers["idempotency-key"] = request.idempotency_key
+
+        # 冪等キーが無い与信は、サーバに届いていないと確実なときだけ再送する
+        sent = self._post(
+            "/v1/authorizations",
+            body,
+            headers,
+            deadline,
+            idempotent=request.idempotency_key is not None,
+        )
+        return sent.bind(
+            lambda resp: (
+                _to_authorization(resp, request.amount)
+                if resp.status == 200
+                else Failure(_to_error(resp))
+            )
+        )
+
+    def capture(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self._settle(authorization, "capture", deadline)
+
+    def void(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self._settle(authorization, "void", deadline)
+
+    def _settle(
+        self, authorization: Authorization, action: str, deadline: Deadline | None
+    ) -> Result[None, PlaceOrderError]:
+        path = f"/v1/authorizations/{authorization.authorization_id}/{action}"
+        sent = self._post(
+            path, b"{}", {"content-type": "application/json"}, deadline, idempotent=True
+        )
+        return sent.bind(
+            lambda resp: Success(None) if resp.status == 200 else Failure(_to_error(resp))
+        )
+
+    def _post(
+        self,
+        path: str,
+        body: bytes,
+        headers: dict[str, str],
+        deadline: Deadline | None,
+        idempotent: bool,
+    ) -> Result[_Response, PlaceOrderError]:
+        attempt = 0
+        while True:
+            outcome = self._attempt(self._base_path + path, body, headers, deadline)
+            if isinstance(outcome, _Response):
+                return Success(outcome)
+
+            safe = not outcome.sent or idempotent
+            if not (outcome.retryable and safe) or attempt >= self.config.max_retries:
+                return Failure(outcome.error)
+
+            backoff = self.config.backoff_seconds * (2**attempt) * (0.5 + self._rng.random())
+            if deadline is not None and deadline.remaining() <= backoff:
+                return Failure(outcome.error)
+            self.sleep(backoff)
+            attempt += 1
+            with self._lock:  # 複数のリクエストスレッドから数える
+                self.retries += 1
+
+    def _attempt(
+        self, path: str, body: bytes, headers: dict[str, str], deadline: Deadline | None
+    ) -> _Response | _TransportFailure:
+        timeout = self.config.read_timeout_seconds
+        wait = self.config.pool_wait_seconds
+        connect_timeout = self.config.connect_timeout_seconds
+        if deadline is not None:
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                return _TransportFailure(
+                    DeadlineExceeded(message="payment call timed out", stage="payment"),
+                    sent=False,
+                    retryable=False,
+                )
+            timeout, wait = min(timeout, remaining), min(wait, remaining)
+
+        host = self.pool.for_url(self.config.base_url)
+        lease = host.acquire(wait)
+        if lease is None:
+            return _TransportFailure(
+                BackendUnavailable(message="connection pool exhausted", port="payment"),
+                sent=False,
+                retryable=False,
+            )
+        conn, _ = lease
+
+        sent = False
+        try:
+            if conn.sock is None:
+                # 接続も締め切りの内側で（プールの空き待ちの分も引く。connect は conn.timeout を使う）
+                if deadline is not None:
+                    connect_timeout = min(connect_timeout, deadline.remaining())
+                    if connect_timeout <= 0:
+                        raise TimeoutError
+                conn.timeout = connect_timeout
+                conn.connect()
+            conn.sock.settimeout(timeout)
+            conn.request("POST", path, body=body, headers=headers)
+            sent = True
+            resp = conn.getresponse()
+            data = resp.read()
+        except TimeoutError:
+            host.release(conn, reusable=False)
+            limited = deadline is not None and deadline.remaining() <= 0
+            err: PlaceOrderError = (
+                DeadlineExceeded(message="payment call timed out", stage="payment")
+                if limited
+                else BackendUnavailable(message="payment call timed out", port="payment")
+            )
+            return _TransportFailure(err, sent=sent, retryable=not limited)
+        except (OSError, http.client.HTTPException) as e:
+            host.release(conn, reusable=False)
+            return _TransportFailure(
+                BackendUnavailable(message=f"payment transport error: {e!r}", port="payment"),
+                sent=sent,
+                retryable=True,
+            )
+
+        host.release(conn, reusable=self.config.keep_alive and not resp.will_close)
+        if resp.status >= 500:
+            return _TransportFailure(
+                BackendUnavailable(message=f"payment backend {resp.status}", port="payment"),
+                sent=True,
+                retryable=True,
+            )
+        return _Response(resp.status, data)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def _payload(resp: _Response) -> dict[str, object]:
+    try:
+        payload = json.loads(resp.body or b"{}")
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _to_authorization(
+    resp: _Response, amount: Money
+) -> Result[Authorization, PlaceOrderError]:
+    # 200 でも id の無い本文はプロトコル違反として扱う（与信が取れたかは分からない）
+    auth_id = _payload(resp).get("id")
+    if not isinstance(auth_id, str) or not auth_id:
+        return Failure(
+            BackendUnavailable(
+                message="malformed payment authorization response", port="payment"
+            )
+        )
+    return Success(Authorization(str(auth_id), amount))
+
+
+def _to_error(resp: _Response) -> PlaceOrderError:
+    payload = _payload(resp)
+    if resp.status in (402, 409):
+        return PaymentDeclined(
+            message=str(payload.get("message", "payment declined")),
+            reason=str(payload.get("reason", "declined")),
+        )
+    return BackendUnavailable(
+        message=f"unexpected payment status {resp.status}", port="payment"
+    )
+
+
+def pool_metrics(gateway: HttpPaymentGateway) -> Callable[[], Iterable[MetricSample]]:
+    """接続プールの状態を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        hosts = gateway.pool.hosts()
+        for name, attr in (
+            ("payment_pool_leased", "leased"),
+            ("payment_pool_limit", "limit"),
+        ):
+            for host, pool in hosts:
+                yield MetricSample(name, getattr(pool, attr), (("host", host),))
+        for name, attr in (
+            ("payment_pool_connections_created_total", "created"),
+            ("payment_pool_connections_reused_total", "reused"),
+            ("payment_pool_connections_discarded_total", "discarded"),
+            ("payment_pool_exhausted_total", "exhausted"),
+        ):
+            for host, pool in hosts:
+                yield MetricSample(
+                    name, getattr(pool, attr), (("host", host),), kind="counter"
+                )
+        yield MetricSample("payment_retries_total", gateway.retries, kind="counter")
+
+    return collect
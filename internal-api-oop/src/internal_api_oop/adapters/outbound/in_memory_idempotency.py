@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field
 
 from returns.result import Failure, Result, Success
 
+from internal_api_oop.adapters.locks import StripedLock
+from internal_api_oop.adapters.memory import (
+    StoreFootprint,
+    estimate_bytes,
+    take_sample,
+)
 from internal_api_oop.core.domain.model.errors import PersistenceError, PlaceOrderError
 from internal_api_oop.core.domain.model.idempotency import IdempotencyRecord
 from internal_api_oop.core.domain.model.order import CustomerId, OrderId, now_utc
@@ -12,7 +19,13 @@ from internal_api_oop.core.ports.outbound.idempotency import IdempotencyReposito
 
 @dataclass
 class InMemoryIdempotencyRepository(IdempotencyRepository):
+    """
+    start / complete / fail は「今の記録を見てから書く」ので、キーごとの枠ロックで直列にする。
+    同じキーへの start が並んでも通るのは 1 本だけで、他は既存扱いで失敗する。
+    """
+
     _store: dict[tuple[str, str], IdempotencyRecord] = field(default_factory=dict)
+    _locks: StripedLock = field(default_factory=StripedLock, repr=False)
 
     def get(
         self, customer_id: CustomerId, key: str
@@ -23,11 +36,8 @@ class InMemoryIdempotencyRepository(IdempotencyRepository):
         self, customer_id: CustomerId, key: str, order_id: OrderId, request_hash: str
     ) -> Result[None, PlaceOrderError]:
         k = (customer_id.value, key)
-        if k in self._store:
-            return Failure(PersistenceError(message="idempotency key already exists"))
-
         now = now_utc()
-        self._store[k] = IdempotencyRecord(
+        rec = IdempotencyRecord(
             status="IN_PROGRESS",
             order_id=order_id,
             request_hash=request_hash,
@@ -36,44 +46,63 @@ class InMemoryIdempotencyRepository(IdempotencyRepository):
             previous_error=None,
             response_snapshot_json=None,
         )
+        with self._locks.of(k):
+            if k in self._store:
+                return Failure(
+                    PersistenceError(message="idempotency key already exists")
+                )
+            self._store[k] = rec
         return Success(None)
 
     def complete(
         self, customer_id: CustomerId, key: str, response_snapshot_json: str
     ) -> Result[None, PlaceOrderError]:
         k = (customer_id.value, key)
-        rec = self._store.get(k)
-        if rec is None:
-            return Failure(PersistenceError(message="idempotency key missing"))
-
         now = now_utc()
-        self._store[k] = IdempotencyRecord(
-            status="COMPLETED",
-            order_id=rec.order_id,
-            request_hash=rec.request_hash,
-            started_at=rec.started_at,
-            updated_at=now,
-            previous_error=rec.previous_error,
-            response_snapshot_json=response_snapshot_json,
-        )
+        with self._locks.of(k):
+            rec = self._store.get(k)
+            if rec is None:
+                return Failure(PersistenceError(message="idempotency key missing"))
+            self._store[k] = IdempotencyRecord(
+                status="COMPLETED",
+                order_id=rec.order_id,
+                request_hash=rec.request_hash,
+                started_at=rec.started_at,
+                updated_at=now,
+                previous_error=rec.previous_error,
+                response_snapshot_json=response_snapshot_json,
+            )
         return Success(None)
 
     def fail(
         self, customer_id: CustomerId, key: str, previous_error: str
     ) -> Result[None, PlaceOrderError]:
         k = (customer_id.value, key)
-        rec = self._store.get(k)
-        if rec is None:
-            return Failure(PersistenceError(message="idempotency key missing"))
-
         now = now_utc()
-        self._store[k] = IdempotencyRecord(
-            status="FAILED",
-            order_id=rec.order_id,
-            request_hash=rec.request_hash,
-            started_at=rec.started_at,
-            updated_at=now,
-            previous_error=previous_error,
-            response_snapshot_json=rec.response_snapshot_json,
-        )
+        with self._locks.of(k):
+            rec = self._store.get(k)
+            if rec is None:
+                return Failure(PersistenceError(message="idempotency key missing"))
+            self._store[k] = IdempotencyRecord(
+                status="FAILED",
+                order_id=rec.order_id,
+                request_hash=rec.request_hash,
+                started_at=rec.started_at,
+                updated_at=now,
+                previous_error=previous_error,
+                response_snapshot_json=rec.response_snapshot_json,
+            )
         return Success(None)
+
+    def footprint(self, sample: int = 1000) -> StoreFootprint:
+        """状態ごとの件数と推定バイト数（診断用）。期限切れの記録も消さずに残っている。"""
+        records = list(self._store.values())  # 並行な書き込みと競合しないよう一括で写す
+        statuses = Counter(rec.status for rec in records)
+        s = take_sample(self._store, sample)
+        return StoreFootprint(
+            "idempotency",
+            {"records": len(records)}
+            | {f"records_{k.lower()}": n for k, n in sorted(statuses.items())},
+            estimate_bytes(s, set()),
+            len(s.items),
+        )
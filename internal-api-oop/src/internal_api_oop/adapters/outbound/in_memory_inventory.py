@@ -1,33 +1,221 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Sequence
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, Sequence
+from uuid import uuid4
 
 from returns.result import Failure, Result, Success
 
-from internal_api_oop.core.domain.model.errors import OutOfStock, PlaceOrderError
-from internal_api_oop.core.ports.outbound.inventory import InventoryGateway, Reservation
+from internal_api_oop.adapters.locks import StripedLock
+from internal_api_oop.adapters.memory import (
+    StoreFootprint,
+    estimate_bytes,
+    take_sample,
+)
+from internal_api_oop.adapters.metrics import MetricSample
+from internal_api_oop.adapters.outbound.expiry import ExpiryScheduler
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import (
+    HoldExpired,
+    OutOfStock,
+    PlaceOrderError,
+)
+from internal_api_oop.core.ports.outbound.inventory import (
+    Hold,
+    InventoryGateway,
+    Reservation,
+)
+
+
+@dataclass
+class _HoldEntry:
+    hold: Hold
+    expires_at: float
+    confirmed: bool = False
 
 
 @dataclass
 class InMemoryInventory(InventoryGateway):
+    """
+    在庫数は SKU ごとの枠ロック（_stock_locks）、仮押さえの記録と件数は _lock で守る。
+    別の SKU を引き当てる注文どうしは並ばない。どちらかを持ったまま他方を取ることはしない。
+    """
+
     stock_by_sku: Dict[str, int]
+    hold_ttl_seconds: float = 30.0
+    # confirm 後もこの間は release（後続ステージ失敗時の補償）を受け付け、過ぎたら記録を捨てる
+    confirmed_retention_seconds: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+
+    active: int = field(init=False, default=0)  # 未 confirm の仮押さえ数
+    expired: int = field(init=False, default=0)
+    released: int = field(init=False, default=0)
+    confirmed: int = field(init=False, default=0)
+    _holds: dict[str, _HoldEntry] = field(init=False, default_factory=dict)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+    _stock_locks: StripedLock = field(init=False, repr=False, default_factory=StripedLock)
+    _expiry: ExpiryScheduler = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._expiry = ExpiryScheduler(
+            self._on_expire, clock=self.clock, name="inventory-holds"
+        )
 
-    def reserve(
-        self, reservations: Sequence[Reservation]
+    def hold(
+        self, reservations: Sequence[Reservation], *, deadline: Deadline | None = None
+    ) -> Result[Hold, PlaceOrderError]:
+        return self.hold_many((reservations,), deadline=deadline)[0]
+
+    def hold_many(
+        self,
+        batch: Sequence[Sequence[Reservation]],
+        *,
+        deadline: Deadline | None = None,
+    ) -> Sequence[Result[Hold, PlaceOrderError]]:
+        # 在庫は注文ごとにその SKU の枠だけ取って成否を決め、記録はまとめて 1 回で入れる
+        results: list[Result[Hold, PlaceOrderError]] = []
+        scheduled: list[_HoldEntry] = []
+        expires_at = self.clock() + self.hold_ttl_seconds
+        for reservations in batch:
+            with self._stock_locks.holding(r.sku.value for r in reservations):
+                err = self._take(reservations)
+            if err is not None:
+                results.append(Failure(err))
+                continue
+            hold = Hold(f"hold_{uuid4().hex}", tuple(reservations))
+            scheduled.append(_HoldEntry(hold, expires_at))
+            results.append(Success(hold))
+        if scheduled:
+            with self._lock:
+                for entry in scheduled:
+                    self._holds[entry.hold.hold_id] = entry
+                self.active += len(scheduled)
+        for entry in scheduled:
+            self._expiry.schedule(entry.hold.hold_id, entry.expires_at)
+        return results
+
+    def confirm(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self.confirm_many((hold,), deadline=deadline)[0]
+
+    def confirm_many(
+        self, holds: Sequence[Hold], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        results: list[Result[None, PlaceOrderError]] = []
+        scheduled: list[_HoldEntry] = []
+        with self._lock:
+            retain_until = self.clock() + self.confirmed_retention_seconds
+            for hold in holds:
+                entry = self._holds.get(hold.hold_id)
+                if entry is None:
+                    results.append(
+                        Failure(
+                            HoldExpired(
+                                message="hold expired or released", hold_id=hold.hold_id
+                            )
+                        )
+                    )
+                    continue
+                if not entry.confirmed:
+                    entry.confirmed = True
+                    entry.expires_at = retain_until
+                    self.active -= 1
+                    self.confirmed += 1
+                    scheduled.append(entry)
+                results.append(Success(None))
+        for entry in scheduled:
+            self._expiry.schedule(entry.hold.hold_id, entry.expires_at)
+        return results
+
+    def release(
+        self, hold: Hold, *, deadline: Deadline | None = None
     ) -> Result[None, PlaceOrderError]:
+        with self._lock:
+            entry = self._holds.pop(hold.hold_id, None)
+            if entry is None:
+                return Success(None)  # 期限切れ・解放済みなら何もしない
+            if not entry.confirmed:
+                self.active -= 1
+            self.released += 1
+        # 記録はもう外したので、在庫は _lock の外で戻してよい（二重には戻らない）
+        self._restock(entry.hold.reservations)
+        return Success(None)
+
+    def close(self) -> None:
+        self._expiry.close()
+
+    def footprint(self, sample: int = 1000) -> StoreFootprint:
+        """SKU・仮押さえの件数と推定バイト数（診断用）。"""
+        skus = take_sample(self.stock_by_sku, sample)
+        with self._lock:
+            holds = take_sample(self._holds, sample)
+            active = self.active
+        seen: set[int] = set()
+        return StoreFootprint(
+            "inventory",
+            {
+                "skus": skus.length,
+                "holds": holds.length,
+                "holds_active": active,
+                "expiry_pending": self._expiry.pending(),
+            },
+            estimate_bytes(skus, seen) + estimate_bytes(holds, seen),
+            len(skus.items) + len(holds.items),
+        )
+
+    def _on_expire(self, hold_id: Hashable, at: float) -> None:
+        with self._lock:
+            entry = self._holds.get(str(hold_id))
+            if entry is None or entry.expires_at != at:
+                return  # 解放済み、または confirm で期限が延びた古い予定
+            del self._holds[entry.hold.hold_id]
+            if entry.confirmed:
+                return
+            self.active -= 1
+            self.expired += 1
+        self._restock(entry.hold.reservations)
+
+    def _take(self, reservations: Sequence[Reservation]) -> PlaceOrderError | None:
+        # 呼び出し側が reservations の SKU の枠を取っている
         # validate first (no partial reservation)
         for r in reservations:
             available = self.stock_by_sku.get(r.sku.value, 0)
             if available < r.quantity:
-                return Failure(
-                    OutOfStock(message="insufficient stock", sku=r.sku.value)
-                )
+                return OutOfStock(message="insufficient stock", sku=r.sku.value)
 
-        # commit reservation
+        # take stock now; it comes back on release or expiry
         for r in reservations:
             self.stock_by_sku[r.sku.value] = (
                 self.stock_by_sku.get(r.sku.value, 0) - r.quantity
             )
+        return None
 
-        return Success(None)
+    def _restock(self, reservations: Sequence[Reservation]) -> None:
+        with self._stock_locks.holding(r.sku.value for r in reservations):
+            for r in reservations:
+                self.stock_by_sku[r.sku.value] = (
+                    self.stock_by_sku.get(r.sku.value, 0) + r.quantity
+                )
+
+
+def inventory_metrics(
+    inventory: InMemoryInventory,
+) -> Callable[[], Iterable[MetricSample]]:
+    """仮押さえの状態を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        yield MetricSample("inventory_holds_active", inventory.active)
+        yield MetricSample(
+            "inventory_holds_confirmed_total", inventory.confirmed, kind="counter"
+        )
+        yield MetricSample(
+            "inventory_holds_released_total", inventory.released, kind="counter"
+        )
+        yield MetricSample(
+            "inventory_holds_expired_total", inventory.expired, kind="counter"
+        )
+
+    return collect
@@ -1,35 +1,79 @@
 from __future__ import annotations
 
+import bisect
+import threading
 from dataclasses import dataclass, field
-from typing import Dict, Sequence
+from itertools import islice
+from typing import Dict, Iterator, List, Sequence, Tuple
 
 from returns.result import Failure, Result, Success
 
+from internal_api_oop.adapters.memory import (
+    StoreFootprint,
+    estimate_bytes,
+    take_sample,
+)
+from internal_api_oop.core.domain.model.customer import CustomerSummary
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import (
+    CustomerNotFound,
     OrderNotFound,
     PersistenceError,
     PlaceOrderError,
 )
 from internal_api_oop.core.domain.model.order import CustomerId, Order, OrderId
+from internal_api_oop.core.domain.model.uuid7 import ordering_key
 from internal_api_oop.core.ports.outbound.orders import OrderRepository
 
 
 @dataclass
 class InMemoryOrderRepository(OrderRepository):
+    """
+    注文を id 順の索引つきで持つ。UUIDv7 の id は作成順に並ぶので、
+    新しい注文はほぼ常に末尾への追加になり、created_at 順の一覧は索引の範囲を読むだけで済む。
+    顧客ごとの集計（件数・累計額・最初 / 最後の注文時刻）も保存時に差分で更新する。
+    """
+
     _store: Dict[str, Order] = field(default_factory=dict)
+    _index: List[Tuple[int, str]] = field(default_factory=list)  # (作成順キー, id)
+    _customers: Dict[str, CustomerSummary] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
-    def save(self, order: Order) -> Result[OrderId, PlaceOrderError]:
+    def save(
+        self, order: Order, *, deadline: Deadline | None = None
+    ) -> Result[OrderId, PlaceOrderError]:
         key = str(order.order_id.value)
-        if key in self._store:
-            return Failure(PersistenceError(message="order_id already exists"))
-        self._store[key] = order
+        entry = (_creation_key(order), key)
+        total = order.total()
+        with self._lock:
+            if key in self._store:
+                return Failure(PersistenceError(message="order_id already exists"))
+            self._store[key] = order
+            cid = order.customer_id.value
+            prev = self._customers.get(cid)
+            self._customers[cid] = (
+                CustomerSummary.first(order, total)
+                if prev is None
+                else prev.add(order, total)
+            )
+            if not self._index or entry > self._index[-1]:
+                self._index.append(entry)
+            else:
+                bisect.insort(self._index, entry)  # 並行に保存された少し古い id
         return Success(order.order_id)
 
+    def save_many(
+        self, orders: Sequence[Order], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[OrderId, PlaceOrderError]]:
+        return [self.save(o, deadline=deadline) for o in orders]
+
     def get(self, order_id: OrderId) -> Result[Order, PlaceOrderError]:
         key = str(order_id.value)
-        if key not in self._store:
+        # 確かめてから引き直すと、その間の書き換えを見落とす。1 回の get で済ませる
+        order = self._store.get(key)
+        if order is None:
             return Failure(OrderNotFound(message="order not found", order_id=key))
-        return Success(self._store[key])
+        return Success(order)
 
     def list(
         self,
@@ -39,17 +83,59 @@ class InMemoryOrderRepository(OrderRepository):
         sort_by: str = "created_at",
         sort_dir: str = "desc",
     ) -> Result[Sequence[Order], PlaceOrderError]:
-        orders = list(self._store.values())  # insertion order
+        reverse = sort_dir == "desc"
+
+        with self._lock:
+            if sort_by == "created_at":
+                # 索引を端から読み、offset + limit 件で打ち切る（全件ソートしない）
+                entries = reversed(self._index) if reverse else iter(self._index)
+                ordered: Iterator[Order] = (self._store[k] for _, k in entries)
+                if customer_id is not None:
+                    ordered = (
+                        o for o in ordered if o.customer_id.value == customer_id.value
+                    )
+                return Success(tuple(islice(ordered, offset, offset + limit)))
+
+            orders = list(self._store.values())  # insertion order
 
         if customer_id is not None:
             orders = [o for o in orders if o.customer_id.value == customer_id.value]
 
-        reverse = sort_dir == "desc"
-
-        if sort_by == "created_at":
-            orders = sorted(orders, key=lambda o: o.created_at, reverse=reverse)
-        elif sort_by == "total":
+        if sort_by == "total":
             orders = sorted(orders, key=lambda o: o.total().amount, reverse=reverse)
 
         sliced = orders[offset : offset + limit]
         return Success(tuple(sliced))
+
+    def customer_summary(
+        self, customer_id: CustomerId
+    ) -> Result[CustomerSummary, PlaceOrderError]:
+        # 集計は不変オブジェクトを丸ごと差し替えるので、読むだけならロックは要らない
+        summary = self._customers.get(customer_id.value)
+        if summary is None:
+            return Failure(
+                CustomerNotFound(
+                    message="customer has no orders", customer_id=customer_id.value
+                )
+            )
+        return Success(summary)
+
+    def footprint(self, sample: int = 1000) -> StoreFootprint:
+        """件数と推定バイト数（診断用）。ロック中は先頭 sample 件を取り出すだけ。"""
+        with self._lock:
+            parts = {
+                "orders": take_sample(self._store, sample),
+                "index_entries": take_sample(self._index, sample),
+                "customers": take_sample(self._customers, sample),
+            }
+        seen: set[int] = set()  # 索引と本体で共有している id 文字列を二重に数えない
+        return StoreFootprint(
+            "orders",
+            {kind: s.length for kind, s in parts.items()},
+            sum(estimate_bytes(s, seen) for s in parts.values()),
+            sum(len(s.items) for s in parts.values()),
+        )
+
+
+def _creation_key(order: Order) -> int:
+    return ordering_key(order.order_id.value, int(order.created_at.timestamp() * 1000))
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from returns.result import Failure, Result, Success
+
+from internal_api_oop.adapters.metrics import MetricSample
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import OrderNotFound, PlaceOrderError
+from internal_api_oop.core.domain.model.order import CustomerId, OrderId
+from internal_api_oop.core.domain.model.uuid7 import ordering_key
+from internal_api_oop.core.domain.service.order_views import (
+    render_order_view,
+    render_summary,
+)
+from internal_api_oop.core.ports.inbound.get_order import OrderView
+from internal_api_oop.core.ports.inbound.list_orders import OrderSummaryView
+from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
+from internal_api_oop.core.ports.outbound.order_views import OrderViewRepository
+
+# CQRS の read side。OrderPlaced を購読して、参照用のビューを投影時に 1 回だけ作る。
+# 一覧の並び（作成順・合計額順・顧客別）は索引として保存時に維持するので、
+# 読み取りは範囲を読むだけで済み、書き込み側のストアとは競合しない。
+
+
+@dataclass
+class InMemoryOrderReadModel(EventPublisher, OrderViewRepository):
+    clock: Callable[[], float] = time.time
+    _details: Dict[str, OrderView] = field(default_factory=dict)
+    _summaries: Dict[str, OrderSummaryView] = field(default_factory=dict)
+    _by_created: List[Tuple[int, str]] = field(default_factory=list)
+    _by_total: List[Tuple[Decimal, int, str]] = field(default_factory=list)
+    _by_customer: Dict[str, List[Tuple[int, str]]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # 投影の遅れ（発行から反映まで）の統計
+    applied: int = 0
+    duplicates: int = 0
+    lag_last: float = 0.0
+    lag_max: float = 0.0
+    lag_sum: float = 0.0
+
+    # ---- write side（購読） --------------------------------------------------
+
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        self._apply(event)
+        return Success(None)
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        for e in events:
+            self._apply(e)
+        return [Success(None)] * len(events)
+
+    def _apply(self, event: OrderPlaced) -> None:
+        order = event.order
+        key = str(order.order_id.value)
+        # ビューの組み立て（合計・小計の計算）はロックの外で済ませる
+        detail = render_order_view(order)
+        summary = render_summary(order)
+        created = ordering_key(
+            order.order_id.value, int(order.created_at.timestamp() * 1000)
+        )
+        with self._lock:
+            if key in self._details:
+                self.duplicates += 1  # 再配送（at-least-once）は無視する
+                return
+            self._details[key] = detail
+            self._summaries[key] = summary
+            _append_sorted(self._by_created, (created, key))
+            bisect.insort(self._by_total, (summary.total.amount, created, key))
+            _append_sorted(
+                self._by_customer.setdefault(order.customer_id.value, []), (created, key)
+            )
+            lag = max(0.0, self.clock() - event.occurred_at)
+            self.applied += 1
+            self.lag_last = lag
+            self.lag_max = max(self.lag_max, lag)
+            self.lag_sum += lag
+
+    # ---- read side -----------------------------------------------------------
+
+    def get_view(self, order_id: OrderId) -> Result[OrderView, PlaceOrderError]:
+        key = str(order_id.value)
+        view = self._details.get(key)
+        if view is None:
+            return Failure(OrderNotFound(message="order not found", order_id=key))
+        return Success(view)
+
+    def list_views(
+        self,
+        offset: int,
+        limit: int,
+        customer_id: CustomerId | None = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+    ) -> Result[Sequence[OrderSummaryView], PlaceOrderError]:
+        reverse = sort_dir == "desc"
+        with self._lock:
+            if customer_id is None:
+                index: Sequence[Tuple] = (
+                    self._by_total if sort_by == "total" else self._by_created
+                )
+            else:
+                index = self._by_customer.get(customer_id.value, [])
+                if sort_by == "total":
+                    # 顧客 1 人分は小さいのでその場で並べる
+                    index = sorted(
+                        (self._summaries[k].total.amount, c, k) for c, k in index
+                    )
+            entries: Iterator[Tuple]
+            if not reverse:
+                entries = iter(index)
+            elif sort_by == "total":
+                entries = _total_desc(index)
+            else:
+                entries = reversed(index)
+            return Success(
+                tuple(
+                    self._summaries[e[-1]]
+                    for e in islice(entries, offset, offset + limit)
+                )
+            )
+
+
+def _append_sorted(index: List[Tuple[int, str]], entry: Tuple[int, str]) -> None:
+    # 作成順の id はほぼ単調に届くので末尾追加が基本
+    if not index or entry > index[-1]:
+        index.append(entry)
+    else:
+        bisect.insort(index, entry)
+
+
+def _total_desc(index: Sequence[Tuple]) -> Iterator[Tuple]:
+    # 合計の降順。同額は作成の古い順に出す（書き込み側の sorted(..., reverse=True) は
+    # 安定ソートなので同額の順を崩さない）。末尾から同額の塊の先頭を二分探索で見つけ、
+    # 塊の中は前から読む。islice が打ち切れば残りの塊には触れない
+    hi = len(index)
+    while hi:
+        lo = bisect.bisect_left(index, (index[hi - 1][0],), 0, hi)
+        for i in range(lo, hi):
+            yield index[i]
+        hi = lo
+
+
+def read_model_metrics(
+    model: InMemoryOrderReadModel,
+) -> Callable[[], Iterable[MetricSample]]:
+    """読み取りモデルの件数と結果整合の遅れを MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        yield MetricSample("read_model_orders", len(model._details))
+        yield MetricSample("read_model_events_applied_total", model.applied, kind="counter")
+        yield MetricSample(
+            "read_model_events_duplicate_total", model.duplicates, kind="counter"
+        )
+        yield MetricSample(
+            "read_model_lag_seconds_last",
+            model.lag_last,
+            help="seconds from publish to projection (latest event)",
+        )
+        yield MetricSample("read_model_lag_seconds_max", model.lag_max)
+        yield MetricSample("read_model_lag_seconds_sum", model.lag_sum, kind="counter")
+
+    return collect
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Protocol, Sequence
+
+from returns.result import Failure, Result
+
+from internal_api_oop.core.domain.model.customer import CustomerSummary
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import (
+    BackendUnavailable,
+    DeadlineExceeded,
+    PersistenceError,
+    PlaceOrderError,
+    PublishError,
+)
+from internal_api_oop.core.domain.model.idempotency import IdempotencyRecord
+from internal_api_oop.core.domain.model.order import CustomerId, Order, OrderId
+from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
+from internal_api_oop.core.ports.outbound.idempotency import IdempotencyRepository
+from internal_api_oop.core.ports.outbound.inventory import (
+    Hold,
+    InventoryGateway,
+    Reservation,
+)
+from internal_api_oop.core.ports.outbound.orders import OrderRepository
+from internal_api_oop.core.ports.outbound.payment import (
+    Authorization,
+    ChargeRequest,
+    PaymentGateway,
+)
+
+# 負荷試験用：任意の outbound adapter を包み、遅延・エラー・ストールを注入する。
+# RNG は (seed, port 名) で決まるので、同じ設定なら同じ遅延列が再現できる。
+
+# ---- latency distributions ---------------------------------------------------
+
+
+class LatencyDistribution(Protocol):
+    def sample_ms(self, rng: random.Random) -> float: ...
+
+
+@dataclass(frozen=True)
+class Fixed:
+    delay_ms: float
+
+    def sample_ms(self, rng: random.Random) -> float:
+        return self.delay_ms
+
+
+@dataclass(frozen=True)
+class LogNormal:
+    median_ms: float
+    sigma: float = 0.5
+
+    def sample_ms(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma)
+
+
+@dataclass(frozen=True)
+class Bimodal:
+    fast: LatencyDistribution
+    slow: LatencyDistribution
+    slow_ratio: float = 0.05
+
+    def sample_ms(self, rng: random.Random) -> float:
+        mode = self.slow if rng.random() < self.slow_ratio else self.fast
+        return mode.sample_ms(rng)
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    latency: LatencyDistribution = Fixed(0.0)
+    error_rate: float = 0.0
+    stall_rate: float = 0.0  # 稀に backend が固まるケース
+    stall_ms: float = 0.0
+    capacity: int = 0  # backend が同時に捌ける呼び出し数（0 は無制限）。超えた分は待たされる
+
+
+def parse_profile(spec: str) -> FaultProfile:
+    """
+    "lognormal:20:0.5/error=0.01/stall=0.001@2000/capacity=4" 形式（時間は ms）。
+      fixed:<ms> | lognormal:<median_ms>:<sigma>
+      | bimodal:<fast_ms>:<slow_ms>:<slow_ratio>
+    """
+    dist, *opts = spec.split("/")
+    kind, *args = dist.split(":")
+    nums = [float(a) for a in args]
+
+    latency: LatencyDistribution
+    if kind == "fixed":
+        latency = Fixed(*nums)
+    elif kind == "lognormal":
+        latency = LogNormal(*nums)
+    elif kind == "bimodal":
+        fast_ms, slow_ms, *ratio = nums
+        latency = Bimodal(Fixed(fast_ms), Fixed(slow_ms), *ratio)
+    else:
+        raise ValueError(f"unknown latency distribution: {kind}")
+
+    error_rate, stall_rate, stall_ms, capacity = 0.0, 0.0, 0.0, 0
+    for opt in opts:
+        name, _, value = opt.partition("=")
+        if name == "error":
+            error_rate = float(value)
+        elif name == "stall":
+            rate, _, ms = value.partition("@")
+            stall_rate, stall_ms = float(rate), float(ms)
+        elif name == "capacity":
+            capacity = int(value)
+        else:
+            raise ValueError(f"unknown fault option: {name}")
+
+    return FaultProfile(latency, error_rate, stall_rate, stall_ms, capacity)
+
+
+# ---- injector --------------------------------------------------------------------
+
+
+@dataclass
+class FaultInjector:
+    port: str
+    profile: FaultProfile
+    seed: int = 0
+    sleep: Callable[[float], None] = time.sleep
+    _rng: random.Random = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+    _capacity: threading.Semaphore | None = field(init=False, repr=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(f"{self.seed}:{self.port}")
+        if self.profile.capacity > 0:
+            self._capacity = threading.Semaphore(self.profile.capacity)
+
+    def inject(self, deadline: Deadline | None = None) -> PlaceOrderError | None:
+        """遅延を入れ、呼び出しを失敗させるべきならそのエラーを返す。"""
+        # 乱数は毎回同じ個数だけ引く（失敗率を変えても遅延列がずれないように）
+        with self._lock:
+            delay_ms = self.profile.latency.sample_ms(self._rng)
+            if self._rng.random() < self.profile.stall_rate:
+                delay_ms += self.profile.stall_ms
+            fail = self._rng.random() < self.profile.error_rate
+
+        delay = delay_ms / 1000
+        if self._capacity is None:
+            return self._wait(delay, fail, deadline)
+        # 処理枠が空くまで待つ（在庫のクリティカルセクションや DB 接続数の上限に相当）
+        timeout = None if deadline is None else deadline.remaining()
+        if not self._capacity.acquire(timeout=timeout):
+            return DeadlineExceeded(message="backend call timed out", stage=self.port)
+        try:
+            return self._wait(delay, fail, deadline)
+        finally:
+            self._capacity.release()
+
+    def _wait(
+        self, delay: float, fail: bool, deadline: Deadline | None
+    ) -> PlaceOrderError | None:
+        if deadline is not None and delay > deadline.remaining():
+            # 実 backend のクライアントタイムアウト相当：締め切りで諦める
+            self.sleep(deadline.remaining())
+            return DeadlineExceeded(message="backend call timed out", stage=self.port)
+        if delay > 0:
+            self.sleep(delay)
+        return _fault_error(self.port) if fail else None
+
+
+def _fault_error(port: str) -> PlaceOrderError:
+    if port in ("orders", "idempotency"):
+        return PersistenceError(message="injected fault")
+    if port == "events":
+        return PublishError(message="injected fault")
+    return BackendUnavailable(message="injected fault", port=port)
+
+
+# ---- port wrappers -------------------------------------------------------------
+
+
+@dataclass
+class LatencyInjectingInventory(InventoryGateway):
+    inner: InventoryGateway
+    faults: FaultInjector
+
+    def hold(
+        self, reservations: Sequence[Reservation], *, deadline: Deadline | None = None
+    ) -> Result[Hold, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.hold(reservations, deadline=deadline)
+
+    def confirm(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.confirm(hold, deadline=deadline)
+
+    def release(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.release(hold, deadline=deadline)
+
+    def hold_many(
+        self,
+        batch: Sequence[Sequence[Reservation]],
+        *,
+        deadline: Deadline | None = None,
+    ) -> Sequence[Result[Hold, PlaceOrderError]]:
+        # まとめ処理は 1 往復ぶんの遅延・障害を全件で共有する
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return [Failure(err)] * len(batch)
+        return self.inner.hold_many(batch, deadline=deadline)
+
+    def confirm_many(
+        self, holds: Sequence[Hold], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return [Failure(err)] * len(holds)
+        return self.inner.confirm_many(holds, deadline=deadline)
+
+
+@dataclass
+class LatencyInjectingPaymentGateway(PaymentGateway):
+    inner: PaymentGateway
+    faults: FaultInjector
+
+    def authorize(
+        self, request: ChargeRequest, *, deadline: Deadline | None = None
+    ) -> Result[Authorization, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.authorize(request, deadline=deadline)
+
+    def capture(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.capture(authorization, deadline=deadline)
+
+    def void(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.void(authorization, deadline=deadline)
+
+
+@dataclass
+class LatencyInjectingOrderRepository(OrderRepository):
+    inner: OrderRepository
+    faults: FaultInjector
+
+    def save(
+        self, order: Order, *, deadline: Deadline | None = None
+    ) -> Result[OrderId, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.save(order, deadline=deadline)
+
+    def save_many(
+        self, orders: Sequence[Order], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[OrderId, PlaceOrderError]]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return [Failure(err)] * len(orders)
+        return self.inner.save_many(orders, deadline=deadline)
+
+    def get(self, order_id: OrderId) -> Result[Order, PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.get(order_id)
+
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        customer_id: CustomerId | None = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+    ) -> Result[Sequence[Order], PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.list(
+            offset, limit, customer_id=customer_id, sort_by=sort_by, sort_dir=sort_dir
+        )
+
+    def customer_summary(
+        self, customer_id: CustomerId
+    ) -> Result[CustomerSummary, PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.customer_summary(customer_id)
+
+
+@dataclass
+class LatencyInjectingEventPublisher(EventPublisher):
+    inner: EventPublisher
+    faults: FaultInjector
+
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return Failure(err)
+        return self.inner.publish(event, deadline=deadline)
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        err = self.faults.inject(deadline)
+        if err is not None:
+            return [Failure(err)] * len(events)
+        return self.inner.publish_many(events, deadline=deadline)
+
+
+@dataclass
+class LatencyInjectingIdempotencyRepository(IdempotencyRepository):
+    inner: IdempotencyRepository
+    faults: FaultInjector
+
+    def get(
+        self, customer_id: CustomerId, key: str
+    ) -> Result[IdempotencyRecord | None, PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.get(customer_id, key)
+
+    def start(
+        self, customer_id: CustomerId, key: str, order_id: OrderId, request_hash: str
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.start(customer_id, key, order_id, request_hash)
+
+    def complete(
+        self, customer_id: CustomerId, key: str, response_snapshot_json: str
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.complete(customer_id, key, response_snapshot_json)
+
+    def fail(
+        self, customer_id: CustomerId, key: str, previous_error: str
+    ) -> Result[None, PlaceOrderError]:
+        err = self.faults.inject()
+        if err is not None:
+            return Failure(err)
+        return self.inner.fail(customer_id, key, previous_error)
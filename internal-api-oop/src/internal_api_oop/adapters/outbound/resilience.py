@@ -0,0 +1,480 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterable, Literal, Sequence, TypeVar
+
+from returns.result import Failure, Result, Success
+
+from internal_api_oop.adapters.metrics import MetricSample
+from internal_api_oop.core.domain.model.customer import CustomerSummary
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import (
+    BackendUnavailable,
+    CircuitOpen,
+    CustomerNotFound,
+    DeadlineExceeded,
+    OrderNotFound,
+    PersistenceError,
+    PlaceOrderError,
+    PublishError,
+)
+from internal_api_oop.core.domain.model.order import CustomerId, Order, OrderId
+from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
+from internal_api_oop.core.ports.outbound.inventory import (
+    Hold,
+    InventoryGateway,
+    Reservation,
+)
+from internal_api_oop.core.ports.outbound.orders import OrderRepository
+from internal_api_oop.core.ports.outbound.payment import (
+    Authorization,
+    ChargeRequest,
+    PaymentGateway,
+)
+
+# outbound port ごとの bulkhead（同時実行上限）と circuit breaker。
+# backend が劣化しても、そのポートを待つスレッド数が上限で頭打ちになり、
+# breaker が開いている間は呼ばずに即失敗するので、他のルートが巻き込まれない。
+
+T = TypeVar("T")
+
+BreakerState = Literal["closed", "open", "half_open"]
+_STATE_VALUE: dict[BreakerState, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    max_concurrent: int = 16
+    max_wait_seconds: float = 0.05  # bulkhead の空き待ち上限
+    failure_threshold: int = 5  # 連続失敗でオープン
+    reset_timeout_seconds: float = 1.0  # オープン → half-open までの時間
+    half_open_max_calls: int = 1  # half-open 中に通す試行数
+    # port 自身の呼び出しの上限。これ以上の予算を持って呼んだのに締め切りで落ちたときだけ
+    # backend の不調に数える（短い X-Request-Timeout-Ms を送る呼び出し元で breaker が開かないように）
+    call_timeout_seconds: float = 0.5
+
+
+def parse_policy(spec: str) -> ResiliencePolicy:
+    """
+    "<max_concurrent>[:<failure_threshold>[:<reset_seconds>[:<call_timeout_seconds>]]]" 形式。
+    例: "16:5:1.0:0.5"
+    """
+    max_concurrent, *rest = spec.split(":")
+    policy = ResiliencePolicy(max_concurrent=int(max_concurrent))
+    if rest:
+        policy = replace(policy, failure_threshold=int(rest[0]))
+    if len(rest) > 1:
+        policy = replace(policy, reset_timeout_seconds=float(rest[1]))
+    if len(rest) > 2:
+        policy = replace(policy, call_timeout_seconds=float(rest[2]))
+    return policy
+
+
+def is_backend_failure(err: PlaceOrderError) -> bool:
+    """
+    業務上の失敗（在庫切れ・決済拒否・未存在）は backend の不調に数えない。
+    DeadlineExceeded はここでは数えず、PortGuard が呼び出し時の予算を見て決める。
+    """
+    if isinstance(err, CircuitOpen):
+        return False
+    if isinstance(err, (OrderNotFound, CustomerNotFound)):
+        return False
+    return isinstance(err, (BackendUnavailable, PersistenceError, PublishError))
+
+
+# ---- bulkhead ------------------------------------------------------------------
+
+
+@dataclass
+class Bulkhead:
+    max_concurrent: int
+    max_wait_seconds: float = 0.0
+    _sem: threading.BoundedSemaphore = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+    in_flight: int = field(init=False, default=0)
+    rejected: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self._sem = threading.BoundedSemaphore(self.max_concurrent)
+
+    def acquire(self, deadline: Deadline | None = None) -> bool:
+        wait = self.max_wait_seconds
+        if deadline is not None:
+            wait = min(wait, deadline.remaining())
+        ok = self._sem.acquire(timeout=wait) if wait > 0 else self._sem.acquire(False)
+        with self._lock:
+            if ok:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+        return ok
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._sem.release()
+
+
+# ---- circuit breaker -------------------------------------------------------------
+
+
+@dataclass
+class CircuitBreaker:
+    failure_threshold: int = 5
+    reset_timeout_seconds: float = 1.0
+    half_open_max_calls: int = 1
+    clock: Callable[[], float] = time.monotonic
+    on_transition: Callable[[BreakerState, BreakerState], None] | None = None
+
+    state: BreakerState = field(init=False, default="closed")
+    rejected: int = field(init=False, default=0)
+    transitions: dict[BreakerState, int] = field(
+        init=False, default_factory=lambda: {"closed": 0, "open": 0, "half_open": 0}
+    )
+    _failures: int = field(init=False, default=0)
+    _opened_at: float = field(init=False, default=0.0)
+    _probes: int = field(init=False, default=0)
+    _probe_successes: int = field(init=False, default=0)
+    _generation: int = field(init=False, default=0)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def allow(self) -> int | None:
+        """呼んでよければ世代番号を返す（結果報告に使う）。拒否なら None。"""
+        with self._lock:
+            if self.state == "open":
+                if self.clock() - self._opened_at < self.reset_timeout_seconds:
+                    self.rejected += 1
+                    return None
+                self._transition("half_open")
+
+            if self.state == "half_open":
+                if self._probes >= self.half_open_max_calls:
+                    self.rejected += 1
+                    return None
+                self._probes += 1
+
+            return self._generation
+
+    def record(self, generation: int, ok: bool) -> None:
+        with self._lock:
+            # 状態が変わる前に始まった呼び出しの結果は数えない
+            if generation != self._generation:
+                return
+
+            if self.state == "half_open":
+                if not ok:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition("closed")
+                return
+
+            if ok:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open()
+
+    def cancel(self, generation: int) -> None:
+        """allow() 後に呼ばなかった・結果を数えない場合に probe 枠を返す。"""
+        with self._lock:
+            if generation == self._generation and self.state == "half_open":
+                self._probes -= 1
+
+    def _open(self) -> None:
+        self._opened_at = self.clock()
+        self._transition("open")
+
+    def _transition(self, to: BreakerState) -> None:
+        frm = self.state
+        self.state = to
+        self.transitions[to] += 1
+        self._generation += 1
+        self._failures = 0
+        self._probes = 0
+        self._probe_successes = 0
+        if self.on_transition is not None:
+            self.on_transition(frm, to)
+
+
+# ---- guard -------------------------------------------------------------------------
+
+
+@dataclass
+class PortGuard:
+    port: str
+    bulkhead: Bulkhead
+    breaker: CircuitBreaker
+    is_failure: Callable[[PlaceOrderError], bool] = is_backend_failure
+    call_timeout_seconds: float = ResiliencePolicy.call_timeout_seconds
+
+    @staticmethod
+    def from_policy(
+        port: str,
+        policy: ResiliencePolicy,
+        on_transition: Callable[[str, BreakerState, BreakerState], None] | None = None,
+    ) -> "PortGuard":
+        hook = None
+        if on_transition is not None:
+            hook = lambda frm, to: on_transition(port, frm, to)  # noqa: E731
+        return PortGuard(
+            port=port,
+            bulkhead=Bulkhead(policy.max_concurrent, policy.max_wait_seconds),
+            breaker=CircuitBreaker(
+                failure_threshold=policy.failure_threshold,
+                reset_timeout_seconds=policy.reset_timeout_seconds,
+                half_open_max_calls=policy.half_open_max_calls,
+                on_transition=hook,
+            ),
+            call_timeout_seconds=policy.call_timeout_seconds,
+        )
+
+    def call(
+        self,
+        fn: Callable[[], Result[T, PlaceOrderError]],
+        deadline: Deadline | None = None,
+    ) -> Result[T, PlaceOrderError]:
+        budget = None
+        if deadline is not None:
+            budget = deadline.remaining()
+            if budget <= 0:
+                # 呼ぶ前から予算切れ：backend を見ていないので breaker には何も記録しない
+                return Failure(
+                    DeadlineExceeded(message="request deadline exceeded", stage=self.port)
+                )
+
+        generation = self.breaker.allow()
+        if generation is None:
+            return Failure(CircuitOpen(message="circuit breaker is open", port=self.port))
+
+        if not self.bulkhead.acquire(deadline):
+            self.breaker.cancel(generation)
+            return Failure(
+                BackendUnavailable(message="bulkhead limit reached", port=self.port)
+            )
+
+        try:
+            result = fn()
+        except Exception:
+            self.breaker.record(generation, ok=False)
+            raise
+        finally:
+            self.bulkhead.release()
+
+        if isinstance(result, Success):
+            ok = True
+        elif isinstance(result.failure(), DeadlineExceeded):
+            if budget is not None and budget < self.call_timeout_seconds:
+                # 呼び出し側の予算が port 自身の上限より短かった：backend の不調とは言えないので、
+                # 成功にも失敗にも数えない（連続失敗のカウントも half-open の判定も動かさない）
+                self.breaker.cancel(generation)
+                return result
+            ok = False
+        else:
+            ok = not self.is_failure(result.failure())
+        self.breaker.record(generation, ok=ok)
+        return result
+
+    def call_many(
+        self,
+        fn: Callable[[], Sequence[Result[T, PlaceOrderError]]],
+        size: int,
+        deadline: Deadline | None = None,
+    ) -> Sequence[Result[T, PlaceOrderError]]:
+        """まとめ処理を 1 回の呼び出しとして通す。全件が backend 障害なら失敗に数える。"""
+        results: list[Sequence[Result[T, PlaceOrderError]]] = []
+
+        def once() -> Result[None, PlaceOrderError]:
+            results.append(fn())
+            failures = [r.failure() for r in results[0] if isinstance(r, Failure)]
+            if results[0] and len(failures) == len(results[0]):
+                return Failure(failures[0])
+            return Success(None)
+
+        gate = self.call(once, deadline)
+        if results:
+            return results[0]
+        return [Failure(gate.failure())] * size
+
+
+def guard_metrics(guards: Sequence[PortGuard]) -> Callable[[], Iterable[MetricSample]]:
+    """PortGuard 群の状態を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        for g in guards:
+            yield MetricSample(
+                "breaker_state",
+                _STATE_VALUE[g.breaker.state],
+                (("port", g.port),),
+                help="0=closed 1=half_open 2=open",
+            )
+        for g in guards:
+            for to, n in g.breaker.transitions.items():
+                yield MetricSample(
+                    "breaker_transitions_total",
+                    n,
+                    (("port", g.port), ("to", to)),
+                    kind="counter",
+                )
+        for g in guards:
+            yield MetricSample(
+                "breaker_rejections_total",
+                g.breaker.rejected,
+                (("port", g.port),),
+                kind="counter",
+            )
+        for g in guards:
+            yield MetricSample("bulkhead_in_flight", g.bulkhead.in_flight, (("port", g.port),))
+        for g in guards:
+            yield MetricSample(
+                "bulkhead_limit", g.bulkhead.max_concurrent, (("port", g.port),)
+            )
+        for g in guards:
+            yield MetricSample(
+                "bulkhead_rejections_total",
+                g.bulkhead.rejected,
+                (("port", g.port),),
+                kind="counter",
+            )
+
+    return collect
+
+
+# ---- port wrappers -------------------------------------------------------------
+
+
+@dataclass
+class ResilientInventory(InventoryGateway):
+    inner: InventoryGateway
+    guard: PortGuard
+
+    def hold(
+        self, reservations: Sequence[Reservation], *, deadline: Deadline | None = None
+    ) -> Result[Hold, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.hold(reservations, deadline=deadline), deadline
+        )
+
+    def confirm(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.confirm(hold, deadline=deadline), deadline
+        )
+
+    def release(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.release(hold, deadline=deadline), deadline
+        )
+
+    def hold_many(
+        self,
+        batch: Sequence[Sequence[Reservation]],
+        *,
+        deadline: Deadline | None = None,
+    ) -> Sequence[Result[Hold, PlaceOrderError]]:
+        return self.guard.call_many(
+            lambda: self.inner.hold_many(batch, deadline=deadline), len(batch), deadline
+        )
+
+    def confirm_many(
+        self, holds: Sequence[Hold], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        return self.guard.call_many(
+            lambda: self.inner.confirm_many(holds, deadline=deadline), len(holds), deadline
+        )
+
+
+@dataclass
+class ResilientPaymentGateway(PaymentGateway):
+    inner: PaymentGateway
+    guard: PortGuard
+
+    def authorize(
+        self, request: ChargeRequest, *, deadline: Deadline | None = None
+    ) -> Result[Authorization, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.authorize(request, deadline=deadline), deadline
+        )
+
+    def capture(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.capture(authorization, deadline=deadline), deadline
+        )
+
+    def void(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.void(authorization, deadline=deadline), deadline
+        )
+
+
+@dataclass
+class ResilientOrderRepository(OrderRepository):
+    inner: OrderRepository
+    guard: PortGuard
+
+    def save(
+        self, order: Order, *, deadline: Deadline | None = None
+    ) -> Result[OrderId, PlaceOrderError]:
+        return self.guard.call(lambda: self.inner.save(order, deadline=deadline), deadline)
+
+    def save_many(
+        self, orders: Sequence[Order], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[OrderId, PlaceOrderError]]:
+        return self.guard.call_many(
+            lambda: self.inner.save_many(orders, deadline=deadline), len(orders), deadline
+        )
+
+    def get(self, order_id: OrderId) -> Result[Order, PlaceOrderError]:
+        return self.guard.call(lambda: self.inner.get(order_id))
+
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        customer_id: CustomerId | None = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+    ) -> Result[Sequence[Order], PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.list(
+                offset, limit, customer_id=customer_id, sort_by=sort_by, sort_dir=sort_dir
+            )
+        )
+
+    def customer_summary(
+        self, customer_id: CustomerId
+    ) -> Result[CustomerSummary, PlaceOrderError]:
+        return self.guard.call(lambda: self.inner.customer_summary(customer_id))
+
+
+@dataclass
+class ResilientEventPublisher(EventPublisher):
+    inner: EventPublisher
+    guard: PortGuard
+
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        return self.guard.call(
+            lambda: self.inner.publish(event, deadline=deadline), deadline
+        )
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        return self.guard.call_many(
+            lambda: self.inner.publish_many(events, deadline=deadline),
+            len(events),
+            deadline,
+        )
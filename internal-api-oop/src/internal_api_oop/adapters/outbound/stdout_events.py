@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Sequence
 
 from returns.result import Failure, Result, Success
 
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PlaceOrderError, PublishError
 from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
 
@@ -12,8 +14,21 @@ from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPla
 class StdoutEventPublisher(EventPublisher):
     fail: bool = False
 
-    def publish(self, event: OrderPlaced) -> Result[None, PlaceOrderError]:
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
         if self.fail:
             return Failure(PublishError(message="publisher is down"))
         print(f"[event] order_placed: {event.order_id.value}")
         return Success(None)
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        if self.fail:
+            return [Failure(PublishError(message="publisher is down"))] * len(events)
+        if not events:
+            return []
+        # 1 回の write にまとめる
+        print("\n".join(f"[event] order_placed: {e.order_id.value}" for e in events))
+        return [Success(None)] * len(events)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence, TypeVar
+
+from returns.result import Failure, Result
+
+from internal_api_oop.adapters.tracing import Tracer, current_span
+from internal_api_oop.core.domain.model.customer import CustomerSummary
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import PlaceOrderError
+from internal_api_oop.core.domain.model.idempotency import IdempotencyRecord
+from internal_api_oop.core.domain.model.order import CustomerId, Order, OrderId
+from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
+from internal_api_oop.core.ports.outbound.idempotency import IdempotencyRepository
+from internal_api_oop.core.ports.outbound.inventory import (
+    Hold,
+    InventoryGateway,
+    Reservation,
+)
+from internal_api_oop.core.ports.outbound.orders import OrderRepository
+from internal_api_oop.core.ports.outbound.payment import (
+    Authorization,
+    ChargeRequest,
+    PaymentGateway,
+)
+
+# outbound adapter を包み、呼び出しごとに子 span を切る（一番外側に置く）。
+# 採っていないリクエスト（current span が None）では inner をそのまま呼ぶだけ。
+# まとめ処理（*_many）は MicroBatcher のスレッドから呼ばれ、リクエストの文脈を持たないので span は出ない。
+
+T = TypeVar("T")
+
+
+def _traced(
+    tracer: Tracer,
+    name: str,
+    call: Callable[[], Result[T, PlaceOrderError]],
+    **attributes: Any,
+) -> Result[T, PlaceOrderError]:
+    with tracer.span(name, **attributes) as span:
+        result = call()
+        if span is not None and isinstance(result, Failure):
+            span.status = "error"
+            span.set("error", type(result.failure()).__name__)
+        return result
+
+
+@dataclass
+class TracedInventory(InventoryGateway):
+    inner: InventoryGateway
+    tracer: Tracer
+
+    def hold(
+        self, reservations: Sequence[Reservation], *, deadline: Deadline | None = None
+    ) -> Result[Hold, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.hold(reservations, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "reservation.hold",
+            lambda: self.inner.hold(reservations, deadline=deadline),
+            skus=",".join(r.sku.value for r in reservations),
+        )
+
+    def confirm(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.confirm(hold, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "reservation.confirm",
+            lambda: self.inner.confirm(hold, deadline=deadline),
+            hold_id=hold.hold_id,
+        )
+
+    def release(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.release(hold, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "reservation.release",
+            lambda: self.inner.release(hold, deadline=deadline),
+            hold_id=hold.hold_id,
+        )
+
+    def hold_many(
+        self,
+        batch: Sequence[Sequence[Reservation]],
+        *,
+        deadline: Deadline | None = None,
+    ) -> Sequence[Result[Hold, PlaceOrderError]]:
+        return self.inner.hold_many(batch, deadline=deadline)
+
+    def confirm_many(
+        self, holds: Sequence[Hold], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        return self.inner.confirm_many(holds, deadline=deadline)
+
+
+@dataclass
+class TracedPaymentGateway(PaymentGateway):
+    inner: PaymentGateway
+    tracer: Tracer
+
+    def authorize(
+        self, request: ChargeRequest, *, deadline: Deadline | None = None
+    ) -> Result[Authorization, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.authorize(request, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "charge.authorize",
+            lambda: self.inner.authorize(request, deadline=deadline),
+            amount=str(request.amount.amount),
+            currency=request.amount.currency,
+        )
+
+    def capture(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.capture(authorization, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "charge.capture",
+            lambda: self.inner.capture(authorization, deadline=deadline),
+            authorization_id=authorization.authorization_id,
+        )
+
+    def void(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.void(authorization, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "charge.void",
+            lambda: self.inner.void(authorization, deadline=deadline),
+            authorization_id=authorization.authorization_id,
+        )
+
+
+@dataclass
+class TracedOrderRepository(OrderRepository):
+    inner: OrderRepository
+    tracer: Tracer
+
+    def save(
+        self, order: Order, *, deadline: Deadline | None = None
+    ) -> Result[OrderId, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.save(order, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "persist",
+            lambda: self.inner.save(order, deadline=deadline),
+            order_id=str(order.order_id.value),
+        )
+
+    def save_many(
+        self, orders: Sequence[Order], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[OrderId, PlaceOrderError]]:
+        return self.inner.save_many(orders, deadline=deadline)
+
+    def get(self, order_id: OrderId) -> Result[Order, PlaceOrderError]:
+        return self.inner.get(order_id)
+
+    def list(
+        self,
+        offset: int,
+        limit: int,
+        customer_id: CustomerId | None = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+    ) -> Result[Sequence[Order], PlaceOrderError]:
+        return self.inner.list(
+            offset, limit, customer_id=customer_id, sort_by=sort_by, sort_dir=sort_dir
+        )
+
+    def customer_summary(
+        self, customer_id: CustomerId
+    ) -> Result[CustomerSummary, PlaceOrderError]:
+        return self.inner.customer_summary(customer_id)
+
+
+@dataclass
+class TracedEventPublisher(EventPublisher):
+    inner: EventPublisher
+    tracer: Tracer
+
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.publish(event, deadline=deadline)
+        return _traced(
+            self.tracer,
+            "publish",
+            lambda: self.inner.publish(event, deadline=deadline),
+            event="OrderPlaced",
+        )
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]:
+        return self.inner.publish_many(events, deadline=deadline)
+
+
+@dataclass
+class TracedIdempotencyRepository(IdempotencyRepository):
+    inner: IdempotencyRepository
+    tracer: Tracer
+
+    def get(
+        self, customer_id: CustomerId, key: str
+    ) -> Result[IdempotencyRecord | None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.get(customer_id, key)
+        return _traced(
+            self.tracer, "idempotency.get", lambda: self.inner.get(customer_id, key)
+        )
+
+    def start(
+        self, customer_id: CustomerId, key: str, order_id: OrderId, request_hash: str
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.start(customer_id, key, order_id, request_hash)
+        return _traced(
+            self.tracer,
+            "idempotency.start",
+            lambda: self.inner.start(customer_id, key, order_id, request_hash),
+        )
+
+    def complete(
+        self, customer_id: CustomerId, key: str, response_snapshot_json: str
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.complete(customer_id, key, response_snapshot_json)
+        return _traced(
+            self.tracer,
+            "idempotency.complete",
+            lambda: self.inner.complete(customer_id, key, response_snapshot_json),
+        )
+
+    def fail(
+        self, customer_id: CustomerId, key: str, previous_error: str
+    ) -> Result[None, PlaceOrderError]:
+        if current_span() is None:
+            return self.inner.fail(customer_id, key, previous_error)
+        return _traced(
+            self.tracer,
+            "idempotency.fail",
+            lambda: self.inner.fail(customer_id, key, previous_error),
+        )
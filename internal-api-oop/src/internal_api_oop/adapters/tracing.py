@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Literal, Protocol, Sequence
+
+from internal_api_oop.adapters.metrics import MetricSample
+
+# adapter 間で共有する最小限のトレーシング。
+# - HTTP リクエストごとに root span、ポート呼び出しごとに子 span を作る
+# - 入口で traceparent（W3C Trace Context）を受け取り、trace_id と親 span を引き継ぐ
+# - サンプリングは入口で 1 回だけ決める（head sampling）。採らないリクエストでは
+#   current span が None のままなので、各所は contextvar を 1 回読むだけで素通りする
+# - 終わった span はバッファに溜め、バックグラウンドでまとめて exporter に渡す
+#   （NDJSON ファイル or メモリ上のリングバッファ）
+
+SpanStatus = Literal["ok", "error"]
+
+
+@dataclass(frozen=True)
+class TracingPolicy:
+    sample_ratio: float = 1.0  # 親の指定が無いリクエストを採る割合
+    respect_parent: bool = True  # traceparent の sampled フラグに従う
+    exporter: Literal["ndjson", "ring"] = "ndjson"
+    path: str = "traces.ndjson"  # ndjson の出力先
+    ring_capacity: int = 10_000  # ring のときに残す span 数
+    max_queue: int = 8192  # export 待ちの上限（超えた分は捨てる）
+    max_batch: int = 512
+    flush_interval_seconds: float = 1.0
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str  # 32 hex
+    span_id: str  # 16 hex
+    sampled: bool = True
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: str) -> SpanContext | None:
+    """"00-<trace_id>-<parent_id>-<flags>"。形式が合わなければ None（新しい trace を始める）。"""
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    _, trace_id, span_id, flags = parts[:4]
+    if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        if int(trace_id, 16) == 0 or int(span_id, 16) == 0:
+            return None
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    return SpanContext(trace_id.lower(), span_id.lower(), sampled)
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: str | None
+    start_ns: int
+    end_ns: int = 0
+    status: SpanStatus = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_unix_nano": self.start_ns,
+            "end_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_CURRENT: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+# 採っていないリクエストの経路で毎回呼ばれるので、関数で包まずに contextvar の get をそのまま使う
+current_span = _CURRENT.get
+
+
+# ---- exporters -----------------------------------------------------------------
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NdjsonFileExporter(SpanExporter):
+    """1 span = 1 行の JSON で追記する。"""
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self._file.write(
+            "".join(
+                json.dumps(s.to_json(), separators=(",", ":"), default=str) + "\n"
+                for s in spans
+            )
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RingBufferExporter(SpanExporter):
+    """直近 capacity 件だけメモリに残す（テストやデバッグ用）。"""
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def spans(self, trace_id: str | None = None) -> list[Span]:
+        with self._lock:
+            return [
+                s for s in self._spans if trace_id is None or s.context.trace_id == trace_id
+            ]
+
+    def close(self) -> None:
+        return None
+
+
+class BatchSpanProcessor:
+    """終わった span を溜めて、max_batch 件か flush_interval ごとに exporter へ渡す。"""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue: int = 8192,
+        max_batch: int = 512,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        self.exporter = exporter
+        self._max_queue = max_queue
+        self._max_batch = max_batch
+        self._interval = flush_interval_seconds
+        self._lock = threading.Lock()
+        self._buffer: list[Span] = []
+        self._wake = threading.Event()
+        self._closed = False
+        self.exported = 0
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="span-export", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)  # 終了時に溜まっている分を書き出す
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            if len(self._buffer) >= self._max_queue:
+                self.dropped += 1
+                return
+            self._buffer.append(span)
+            full = len(self._buffer) >= self._max_batch
+        if full:
+            self._wake.set()
+
+    def flush(self) -> None:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        for i in range(0, len(batch), self._max_batch):
+            chunk = batch[i : i + self._max_batch]
+            try:
+                self.exporter.export(chunk)
+            except Exception:  # noqa: BLE001  export の失敗でリクエストを巻き込まない
+                with self._lock:
+                    self.dropped += len(chunk)
+                continue
+            with self._lock:
+                self.exported += len(chunk)
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        self.exporter.close()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            self.flush()
+
+
+# ---- tracer ----------------------------------------------------------------------
+
+
+class Tracer:
+    def __init__(
+        self,
+        processor: BatchSpanProcessor,
+        sample_ratio: float = 1.0,
+        respect_parent: bool = True,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.processor = processor
+        self.sample_ratio = sample_ratio
+        self.respect_parent = respect_parent
+        self._rng = rng or random.Random()
+        self.sampled = 0
+        self.unsampled = 0
+
+    @staticmethod
+    def from_policy(policy: TracingPolicy) -> Tracer:
+        exporter: SpanExporter = (
+            RingBufferExporter(policy.ring_capacity)
+            if policy.exporter == "ring"
+            else NdjsonFileExporter(policy.path)
+        )
+        processor = BatchSpanProcessor(
+            exporter,
+            max_queue=policy.max_queue,
+            max_batch=policy.max_batch,
+            flush_interval_seconds=policy.flush_interval_seconds,
+        )
+        return Tracer(processor, policy.sample_ratio, policy.respect_parent)
+
+    def start_request(self, name: str, traceparent: str | None) -> Span | None:
+        """入口での判定。採らないなら None（以降の span はすべて素通り）。"""
+        parent = parse_traceparent(traceparent) if traceparent else None
+        if parent is not None and self.respect_parent:
+            sampled = parent.sampled
+        else:
+            sampled = self._rng.random() < self.sample_ratio
+        if not sampled:
+            self.unsampled += 1
+            return None
+        self.sampled += 1
+        trace_id = parent.trace_id if parent is not None else _new_id(16)
+        return Span(
+            name,
+            SpanContext(trace_id, _new_id(8)),
+            parent.span_id if parent is not None else None,
+            time.time_ns(),
+        )
+
+    def activate(self, span: Span) -> contextvars.Token[Span | None]:
+        return _CURRENT.set(span)
+
+    def end_request(self, span: Span, token: contextvars.Token[Span | None]) -> None:
+        _CURRENT.reset(token)
+        self._finish(span)
+
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager[Span | None]:
+        """採っているリクエストの中なら子 span を作る。それ以外は共有の何もしない文脈を返す。"""
+        parent = _CURRENT.get()
+        if parent is None:
+            return _NO_SPAN
+        return _ChildSpan(self, name, parent, attributes)
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        self.processor.on_end(span)
+
+    def close(self) -> None:
+        self.processor.close()
+
+
+# id は衝突しなければよいので、span ごとに os.urandom（システムコール）は呼ばない
+_ID_RNG = random.Random(os.urandom(16))
+
+
+_NO_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+class _ChildSpan:
+    def __init__(
+        self, tracer: Tracer, name: str, parent: Span, attributes: dict[str, Any]
+    ) -> None:
+        self._tracer = tracer
+        self._span = Span(
+            name,
+            SpanContext(parent.context.trace_id, _new_id(8)),
+            parent.context.span_id,
+            time.time_ns(),
+            attributes=attributes,
+        )
+
+    def __enter__(self) -> Span:
+        self._token = _CURRENT.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        _CURRENT.reset(self._token)
+        if exc_type is not None:
+            self._span.status = "error"
+            self._span.set("exception", exc_type.__name__)
+        self._tracer._finish(self._span)
+
+
+def _new_id(nbytes: int) -> str:
+    return f"{_ID_RNG.getrandbits(nbytes * 8) or 1:0{nbytes * 2}x}"
+
+
+class ContextPropagatingExecutor(ThreadPoolExecutor):
+    """submit 元の contextvars（current span）を引き継いで実行する ThreadPoolExecutor。"""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        ctx = contextvars.copy_context()
+        return super().submit(ctx.run, fn, *args, **kwargs)
+
+
+def tracing_metrics(tracer: Tracer) -> Callable[[], Iterable[MetricSample]]:
+    """サンプリング判定と export の状況を MetricsSource として公開する。"""
+
+    def collect() -> Iterable[MetricSample]:
+        yield MetricSample(
+            "tracing_requests_total", tracer.sampled, (("sampled", "true"),), kind="counter"
+        )
+        yield MetricSample(
+            "tracing_requests_total",
+            tracer.unsampled,
+            (("sampled", "false"),),
+            kind="counter",
+        )
+        yield MetricSample(
+            "tracing_spans_exported_total", tracer.processor.exported, kind="counter"
+        )
+        yield MetricSample(
+            "tracing_spans_dropped_total", tracer.processor.dropped, kind="counter"
+        )
+
+    return collect
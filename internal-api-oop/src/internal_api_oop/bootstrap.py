@@ -1,15 +1,77 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Mapping
 
+from internal_api_oop.adapters.compute import CpuPoolMode, create_cpu_pool
+from internal_api_oop.adapters.memory import FootprintSource
+from internal_api_oop.adapters.metrics import MetricsSource
 from internal_api_oop.adapters.outbound.dummy_payment import DummyPaymentGateway
+from internal_api_oop.adapters.outbound.event_bus import (
+    InProcessEventBus,
+    SubscriberPolicy,
+    event_bus_metrics,
+)
+from internal_api_oop.adapters.outbound.fan_out_events import FanOutEventPublisher
+from internal_api_oop.adapters.outbound.http_payment import (
+    HttpPaymentConfig,
+    HttpPaymentGateway,
+    pool_metrics,
+)
 from internal_api_oop.adapters.outbound.in_memory_idempotency import (
     InMemoryIdempotencyRepository,
 )
-from internal_api_oop.adapters.outbound.in_memory_inventory import InMemoryInventory
+from internal_api_oop.adapters.outbound.in_memory_inventory import (
+    InMemoryInventory,
+    inventory_metrics,
+)
 from internal_api_oop.adapters.outbound.in_memory_orders import InMemoryOrderRepository
+from internal_api_oop.adapters.outbound.in_memory_read_model import (
+    InMemoryOrderReadModel,
+    read_model_metrics,
+)
+from internal_api_oop.adapters.outbound.latency_injection import (
+    FaultInjector,
+    FaultProfile,
+    LatencyInjectingEventPublisher,
+    LatencyInjectingIdempotencyRepository,
+    LatencyInjectingInventory,
+    LatencyInjectingOrderRepository,
+    LatencyInjectingPaymentGateway,
+)
+from internal_api_oop.adapters.outbound.resilience import (
+    PortGuard,
+    ResiliencePolicy,
+    ResilientEventPublisher,
+    ResilientInventory,
+    ResilientOrderRepository,
+    ResilientPaymentGateway,
+    guard_metrics,
+)
 from internal_api_oop.adapters.outbound.stdout_events import StdoutEventPublisher
+from internal_api_oop.adapters.outbound.tracing import (
+    TracedEventPublisher,
+    TracedIdempotencyRepository,
+    TracedInventory,
+    TracedOrderRepository,
+    TracedPaymentGateway,
+)
+from internal_api_oop.adapters.tracing import (
+    ContextPropagatingExecutor,
+    Tracer,
+    TracingPolicy,
+    tracing_metrics,
+)
+from internal_api_oop.core.domain.service.batching_place_order_service import (
+    BatchingPlaceOrderService,
+    BatchPolicy,
+)
+from internal_api_oop.core.domain.service.get_customer_summary_service import (
+    GetCustomerSummaryDeps,
+    GetCustomerSummaryService,
+)
 from internal_api_oop.core.domain.service.get_order_service import (
     GetOrderDeps,
     GetOrderService,
@@ -22,6 +84,11 @@ from internal_api_oop.core.domain.service.place_order_service import (
     PlaceOrderDeps,
     PlaceOrderService,
 )
+from internal_api_oop.core.ports.outbound.events import EventPublisher
+from internal_api_oop.core.ports.outbound.idempotency import IdempotencyRepository
+from internal_api_oop.core.ports.outbound.inventory import InventoryGateway
+from internal_api_oop.core.ports.outbound.orders import OrderRepository
+from internal_api_oop.core.ports.outbound.payment import PaymentGateway
 
 
 @dataclass(frozen=True)
@@ -29,32 +96,204 @@ class UseCases:
     place_order: PlaceOrderService
     get_order: GetOrderService
     list_orders: ListOrdersService
+    customer_summary: GetCustomerSummaryService
+    metrics: tuple[MetricsSource, ...] = ()
+    event_bus: InProcessEventBus | None = None  # 購読者の追加（subscribe）用
+    tracer: Tracer | None = None  # create_app(tracer=...) に渡す
+    footprints: tuple[FootprintSource, ...] = ()  # インメモリストアの件数・推定バイト数（診断用）
+    cpu_pool: Executor | None = None  # prepare_executor。close() で止める
+    # 以下は close() で止めるためだけに持つ
+    authorize_pool: Executor | None = None
+    inventory: InMemoryInventory | None = None  # 仮押さえの期限切れスレッド
+    http_payment: HttpPaymentGateway | None = None  # keep-alive の接続
 
+    def close(self) -> None:
+        """作ったスレッド・プール・接続をすべて止める（create_app(on_shutdown=...) に渡す）。"""
+        if isinstance(self.place_order, BatchingPlaceOrderService):
+            self.place_order.close()  # 溜まっているバッチを処理し終えてから
+        if self.authorize_pool is not None:
+            self.authorize_pool.shutdown()
+        if self.event_bus is not None:
+            self.event_bus.close()  # 積まれたイベントを配り終えて（or dead letter にして）から
+        if self.cpu_pool is not None:
+            self.cpu_pool.shutdown(cancel_futures=True)
+        if self.http_payment is not None:
+            self.http_payment.close()
+        if self.inventory is not None:
+            self.inventory.close()
+        if self.tracer is not None:
+            self.tracer.close()  # 最後に、残った span を書き出す
 
-def build_usecases() -> UseCases:
-    inventory = InMemoryInventory(stock_by_sku={"SKU-1": 10, "SKU-2": 5})
-    payment = DummyPaymentGateway(
-        decline_tokens={"tok_declined"}, max_amount=Decimal("1000000.00")
+
+def build_usecases(
+    stock_by_sku: dict[str, int] | None = None,
+    faults: Mapping[str, FaultProfile] | None = None,
+    fault_seed: int = 0,
+    resilience: Mapping[str, ResiliencePolicy] | None = None,
+    payment_url: str | None = None,
+    authorize_workers: int = 32,
+    hold_ttl_seconds: float = 30.0,
+    batch: BatchPolicy | None = None,
+    read_model: bool = False,
+    event_bus: SubscriberPolicy | None = None,
+    tracing: TracingPolicy | None = None,
+    cpu_pool: CpuPoolMode | None = None,
+    cpu_workers: int = 4,
+) -> UseCases:
+    """
+    faults: port 名（inventory/payment/orders/events/idempotency）→ FaultProfile。
+    指定したポートだけ遅延注入アダプタで包む（負荷試験用）。
+    resilience: port 名（inventory/payment/orders/events）→ ResiliencePolicy。
+    指定したポートを bulkhead + circuit breaker で包む（遅延注入より外側）。
+    payment_url: 指定すると DummyPaymentGateway の代わりに HTTP 決済 adapter を使う。
+    authorize_workers: 与信を在庫の仮押さえと並行に走らせるスレッド数（0 なら逐次）。
+    hold_ttl_seconds: confirm されなかった在庫の仮押さえが自動で戻るまでの時間。
+    batch: 指定すると同時に来た注文をまとめて処理する（BatchingPlaceOrderService）。
+    read_model: True なら OrderPlaced を購読する読み取りモデルを置き、get / list をそこから返す。
+    event_bus: 指定すると OrderPlaced をプロセス内のイベントバスに積むだけにし、
+    購読者（stdout・読み取りモデル・後から subscribe したもの）はリクエスト経路の外で処理する。
+    tracing: 指定すると各ポートを span を切る adapter で包む（一番外側）。
+    HTTP リクエストの root span は create_app(tracer=UseCases.tracer) の middleware が作る。
+    cpu_pool: 指定すると検証・明細の集計・冪等ハッシュを cpu_workers 本のプール
+    （thread / process / interpreter）で行う。副作用のあるポートは呼び出し元に残る。
+    """
+    if stock_by_sku is None:
+        stock_by_sku = {"SKU-1": 10, "SKU-2": 5}
+    in_memory_inventory = InMemoryInventory(
+        stock_by_sku=dict(stock_by_sku), hold_ttl_seconds=hold_ttl_seconds
     )
-    orders = InMemoryOrderRepository()
-    events = StdoutEventPublisher()
-    idempotency = InMemoryIdempotencyRepository()
-
-    place_order = PlaceOrderService(
-        PlaceOrderDeps(
-            inventory=inventory,
-            payment=payment,
-            orders=orders,
-            events=events,
-            idempotency=idempotency,
-            idempotency_ttl_seconds=120,
+    inventory: InventoryGateway = in_memory_inventory
+    metrics: list[MetricsSource] = [inventory_metrics(in_memory_inventory)]
+    payment: PaymentGateway
+    http_payment: HttpPaymentGateway | None = None
+    if payment_url is not None:
+        http_payment = HttpPaymentGateway(HttpPaymentConfig(base_url=payment_url))
+        metrics.append(pool_metrics(http_payment))
+        payment = http_payment
+    else:
+        payment = DummyPaymentGateway(
+            decline_tokens={"tok_declined"}, max_amount=Decimal("1000000.00")
+        )
+    in_memory_orders = InMemoryOrderRepository()
+    orders: OrderRepository = in_memory_orders
+    stdout_events: EventPublisher = StdoutEventPublisher()
+    in_memory_idempotency = InMemoryIdempotencyRepository()
+    idempotency: IdempotencyRepository = in_memory_idempotency
+
+    faults = faults or {}
+    if "inventory" in faults:
+        inventory = LatencyInjectingInventory(
+            inventory, FaultInjector("inventory", faults["inventory"], fault_seed)
         )
+    if "payment" in faults:
+        payment = LatencyInjectingPaymentGateway(
+            payment, FaultInjector("payment", faults["payment"], fault_seed)
+        )
+    if "orders" in faults:
+        orders = LatencyInjectingOrderRepository(
+            orders, FaultInjector("orders", faults["orders"], fault_seed)
+        )
+    if "events" in faults:
+        # イベントバス経由なら遅延は購読側にかかり、リクエスト経路には乗らない
+        stdout_events = LatencyInjectingEventPublisher(
+            stdout_events, FaultInjector("events", faults["events"], fault_seed)
+        )
+    if "idempotency" in faults:
+        idempotency = LatencyInjectingIdempotencyRepository(
+            idempotency, FaultInjector("idempotency", faults["idempotency"], fault_seed)
+        )
+
+    events: EventPublisher = stdout_events
+    views: InMemoryOrderReadModel | None = None
+    if read_model:
+        views = InMemoryOrderReadModel()
+        metrics.append(read_model_metrics(views))
+    bus: InProcessEventBus | None = None
+    if event_bus is not None:
+        bus = InProcessEventBus()
+        bus.subscribe("stdout", stdout_events.publish, event_bus)
+        if views is not None:
+            bus.subscribe("read_model", views.publish, event_bus)
+        events = bus
+        metrics.append(event_bus_metrics(bus))
+    elif views is not None:
+        events = FanOutEventPublisher([stdout_events, views])
+
+    resilience = resilience or {}
+    guards: list[PortGuard] = []
+    if "inventory" in resilience:
+        guards.append(PortGuard.from_policy("inventory", resilience["inventory"]))
+        inventory = ResilientInventory(inventory, guards[-1])
+    if "payment" in resilience:
+        guards.append(PortGuard.from_policy("payment", resilience["payment"]))
+        payment = ResilientPaymentGateway(payment, guards[-1])
+    if "orders" in resilience:
+        guards.append(PortGuard.from_policy("orders", resilience["orders"]))
+        orders = ResilientOrderRepository(orders, guards[-1])
+    if "events" in resilience:
+        guards.append(PortGuard.from_policy("events", resilience["events"]))
+        events = ResilientEventPublisher(events, guards[-1])
+    if guards:
+        metrics.append(guard_metrics(guards))
+
+    tracer: Tracer | None = None
+    if tracing is not None:
+        tracer = Tracer.from_policy(tracing)
+        inventory = TracedInventory(inventory, tracer)
+        payment = TracedPaymentGateway(payment, tracer)
+        orders = TracedOrderRepository(orders, tracer)
+        events = TracedEventPublisher(events, tracer)
+        idempotency = TracedIdempotencyRepository(idempotency, tracer)
+        metrics.append(tracing_metrics(tracer))
+
+    prepare_pool = (
+        create_cpu_pool(cpu_pool, cpu_workers) if cpu_pool is not None else None
+    )
+    authorize_pool = (
+        # 与信の span が呼び出し元のリクエストにぶら下がるよう、contextvars を引き継ぐ
+        (ThreadPoolExecutor if tracer is None else ContextPropagatingExecutor)(
+            authorize_workers, thread_name_prefix="authorize"
+        )
+        if authorize_workers > 0
+        else None
+    )
+    place_deps = PlaceOrderDeps(
+        inventory=inventory,
+        payment=payment,
+        orders=orders,
+        events=events,
+        idempotency=idempotency,
+        idempotency_ttl_seconds=120,
+        executor=authorize_pool,
+        tracer=tracer,
+        prepare_executor=prepare_pool,
+    )
+    place_order = (
+        PlaceOrderService(place_deps)
+        if batch is None
+        else BatchingPlaceOrderService(place_deps, policy=batch)
     )
-    get_order = GetOrderService(GetOrderDeps(orders=orders))
-    list_orders = ListOrdersService(ListOrdersDeps(orders=orders))
+    get_order = GetOrderService(GetOrderDeps(orders=orders, views=views))
+    list_orders = ListOrdersService(ListOrdersDeps(orders=orders, views=views))
+    customer_summary = GetCustomerSummaryService(GetCustomerSummaryDeps(orders=orders))
 
     return UseCases(
-        place_order=place_order, get_order=get_order, list_orders=list_orders
+        place_order=place_order,
+        get_order=get_order,
+        list_orders=list_orders,
+        customer_summary=customer_summary,
+        metrics=tuple(metrics),
+        event_bus=bus,
+        tracer=tracer,
+        footprints=(
+            in_memory_orders.footprint,
+            in_memory_idempotency.footprint,
+            in_memory_inventory.footprint,
+        ),
+        cpu_pool=prepare_pool,
+        authorize_pool=authorize_pool,
+        inventory=in_memory_inventory,
+        http_payment=http_payment,
     )
 
 
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+
+from returns.result import Failure, Result, Success
+
+from internal_api_oop.core.domain.model.errors import PlaceOrderError, ValidationError
+from internal_api_oop.core.domain.model.order import LineItem, Money, Sku
+
+_CENT = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class PreparedCart:
+    """検証・集計済みの明細。以降のステージは明細を歩き直さない。"""
+
+    items: tuple[LineItem, ...]  # 受け取った順（注文の記録としてはまとめない）
+    quantity_by_sku: tuple[tuple[str, int], ...]  # 重複 SKU をまとめた引当数
+    total: Money
+    lines_digest: str  # 冪等ハッシュ用（行の並びと内容で決まる）
+
+
+class CartBuilder:
+    """
+    明細を 1 行ずつ受け取り、検証・小計の積み上げ・SKU ごとの数量集約・
+    ハッシュ計算を 1 パスで行う。行のリストを先に作らなくてよいので、
+    逐次パースした明細をそのまま流し込める。
+    """
+
+    def __init__(self, currency: str = "JPY") -> None:
+        self._currency = currency
+        self._items: list[LineItem] = []
+        self._by_sku: dict[str, int] = {}
+        self._total = Decimal(0)
+        self._digest = hashlib.sha256()
+        self._error: ValidationError | None = None
+        self._prices: dict[Decimal, Money] = {}
+        # LineItem / Sku / Money は不変なので、同じ内容の行は同じオブジェクトを共有する
+        self._interned: dict[tuple[str, Decimal, int], LineItem] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, sku: str, unit_price: Decimal, quantity: int) -> ValidationError | None:
+        """行を追加する。不正な行なら ValidationError を返す（以降の add は無視される）。"""
+        if self._error is not None:
+            return self._error
+        i = len(self._items)
+        if not sku.strip():
+            self._error = ValidationError(f"lines[{i}].sku is required")
+        elif quantity <= 0:
+            self._error = ValidationError(f"lines[{i}].quantity must be > 0")
+        elif unit_price <= 0:
+            self._error = ValidationError(f"lines[{i}].unit_price must be > 0")
+        if self._error is not None:
+            return self._error
+
+        key = (sku, unit_price, quantity)
+        item = self._interned.get(key)
+        if item is None:
+            price = self._prices.get(unit_price)
+            if price is None:
+                price = Money.of(unit_price, currency=self._currency)
+                self._prices[unit_price] = price
+            item = LineItem(sku=Sku(sku), unit_price=price, quantity=quantity)
+            self._interned[key] = item
+        self._items.append(item)
+        self._by_sku[sku] = self._by_sku.get(sku, 0) + quantity
+        # 単価は 0.01 単位に丸め済みなので、整数倍の小計は丸め誤差なく積み上がる
+        self._total += item.unit_price.amount * quantity
+        self._digest.update(f"{sku}\x1f{unit_price}\x1f{quantity}\x1e".encode("utf-8"))
+        return None
+
+    def build(self) -> Result[PreparedCart, PlaceOrderError]:
+        if self._error is not None:
+            return Failure(self._error)
+        if not self._items:
+            return Failure(ValidationError("at least one line item is required"))
+        return Success(
+            PreparedCart(
+                items=tuple(self._items),
+                quantity_by_sku=tuple(self._by_sku.items()),
+                total=Money(self._total.quantize(_CENT), self._currency),
+                lines_digest=self._digest.hexdigest(),
+            )
+        )
+
+
+def prepare_cart(
+    lines: Iterable[tuple[str, Decimal, int]], currency: str = "JPY"
+) -> Result[PreparedCart, PlaceOrderError]:
+    builder = CartBuilder(currency)
+    for sku, unit_price, quantity in lines:
+        if builder.add(sku, unit_price, quantity) is not None:
+            break
+    return builder.build()
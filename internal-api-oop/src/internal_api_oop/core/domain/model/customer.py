@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from internal_api_oop.core.domain.model.order import CustomerId, Money, Order
+
+
+@dataclass(frozen=True)
+class CustomerSummary:
+    """顧客ごとの集計。注文の保存ごとに差分で更新する。"""
+
+    customer_id: CustomerId
+    order_count: int
+    lifetime_total: Money
+    first_order_at: datetime
+    last_order_at: datetime
+
+    @staticmethod
+    def first(order: Order, total: Money) -> "CustomerSummary":
+        return CustomerSummary(
+            customer_id=order.customer_id,
+            order_count=1,
+            lifetime_total=total,
+            first_order_at=order.created_at,
+            last_order_at=order.created_at,
+        )
+
+    def add(self, order: Order, total: Money) -> "CustomerSummary":
+        return CustomerSummary(
+            customer_id=self.customer_id,
+            order_count=self.order_count + 1,
+            lifetime_total=self.lifetime_total + total,
+            first_order_at=min(self.first_order_at, order.created_at),
+            last_order_at=max(self.last_order_at, order.created_at),
+        )
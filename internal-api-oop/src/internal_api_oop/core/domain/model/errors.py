@@ -24,6 +24,14 @@ class OutOfStock(PlaceOrderError):
         return f"out_of_stock: sku={self.sku} ({self.message})"
 
 
+@dataclass(frozen=True)
+class HoldExpired(PlaceOrderError):
+    hold_id: str
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"hold_expired: {self.hold_id} ({self.message})"
+
+
 @dataclass(frozen=True)
 class PaymentDeclined(PlaceOrderError):
     reason: str
@@ -45,11 +53,41 @@ class OrderNotFound(PersistenceError):
         return f"order_not_found: {self.order_id} ({self.message})"
 
 
+@dataclass(frozen=True)
+class CustomerNotFound(PersistenceError):
+    customer_id: str
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"customer_not_found: {self.customer_id} ({self.message})"
+
+
 @dataclass(frozen=True)
 class PublishError(PlaceOrderError):
     pass
 
 
+@dataclass(frozen=True)
+class BackendUnavailable(PlaceOrderError):
+    port: str
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"backend_unavailable: {self.port} ({self.message})"
+
+
+@dataclass(frozen=True)
+class CircuitOpen(BackendUnavailable):
+    def __str__(self) -> str:  # pragma: no cover
+        return f"circuit_open: {self.port} ({self.message})"
+
+
+@dataclass(frozen=True)
+class DeadlineExceeded(PlaceOrderError):
+    stage: str
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"deadline_exceeded: {self.stage} ({self.message})"
+
+
 @dataclass(frozen=True)
 class IdempotencyInProgress(PlaceOrderError):
     key: str
@@ -4,7 +4,9 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Iterable, Tuple
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from internal_api_oop.core.domain.model import uuid7
 
 
 @dataclass(frozen=True)
@@ -13,7 +15,12 @@ class OrderId:
 
     @staticmethod
     def new() -> "OrderId":
-        return OrderId(uuid4())
+        # 時刻順の UUIDv7。id の順序 = 作成順になる（既存の uuid4 もそのまま受け付ける）
+        return OrderId(uuid7.new_uuid7())
+
+    def created_at(self) -> datetime | None:
+        """v7 なら id に埋め込まれた作成時刻（ms 精度）、uuid4 なら None。"""
+        return uuid7.timestamp(self.value)
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import UUID
+
+# UUIDv7（RFC 9562）: 先頭 48bit が Unix ms、続いて version / 乱数 / variant。
+# 同じ ms 内の順序は rand_a + rand_b 上位 30bit の 42bit カウンタで保証する（Method 1）。
+# カウンタは ms が変わるたびに乱数で初期化し（最上位 bit は 0 にして繰り上がりの余地を残す）、
+# 溢れたら ms を 1 進める。時計が戻っても直前の ms を使い続けるので、
+# 同一プロセス内で発行した値は常に単調増加する。
+
+_COUNTER_BITS = 42
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+_TAIL_BITS = 32  # rand_b のうちカウンタに使わない下位 bit（毎回乱数）
+_LOW_80 = (1 << 80) - 1
+
+
+class Uuid7Generator:
+    def __init__(self, clock_ms: Callable[[], int] | None = None) -> None:
+        self._clock_ms = clock_ms or _now_ms
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+
+    def __call__(self) -> UUID:
+        tail = int.from_bytes(os.urandom(4), "big")
+        with self._lock:
+            ms = self._clock_ms()
+            if ms > self._last_ms:
+                self._last_ms = ms
+                self._counter = _seed()
+            else:
+                self._counter += 1
+                if self._counter > _COUNTER_MAX:
+                    self._last_ms += 1  # 1 ms に 2^41 件以上は未来の ms を借りる
+                    self._counter = _seed()
+            ms, counter = self._last_ms, self._counter
+        return _pack(ms, counter, tail)
+
+
+def timestamp_ms(value: UUID) -> int | None:
+    """v7 なら埋め込まれた Unix ms、それ以外（uuid4 など）は None。"""
+    if value.version != 7:
+        return None
+    return value.int >> 80
+
+
+def timestamp(value: UUID) -> datetime | None:
+    ms = timestamp_ms(value)
+    if ms is None:
+        return None
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def ordering_key(value: UUID, created_ms: int) -> int:
+    """
+    作成順に並べるための整数キー。v7 は id そのもの、時刻を持たない id（uuid4 など）は
+    created_ms を上位 48bit に置いて v7 と同じ軸に混ぜる。
+    """
+    if value.version == 7:
+        return value.int
+    return (created_ms << 80) | (value.int & _LOW_80)
+
+
+def _pack(ms: int, counter: int, tail: int) -> UUID:
+    rand_a = counter >> 30
+    rand_b = ((counter & ((1 << 30) - 1)) << _TAIL_BITS) | tail
+    value = (
+        ((ms & ((1 << 48) - 1)) << 80)
+        | (0x7 << 76)
+        | (rand_a << 64)
+        | (0b10 << 62)
+        | rand_b
+    )
+    return UUID(int=value)
+
+
+def _seed() -> int:
+    return int.from_bytes(os.urandom(6), "big") >> (48 - _COUNTER_BITS + 1)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+new_uuid7 = Uuid7Generator()
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Sequence, TypeVar
+
+from returns.result import Failure, Result, Success
+
+from internal_api_oop.core.domain.model.deadline import Deadline
+from internal_api_oop.core.domain.model.errors import PlaceOrderError
+from internal_api_oop.core.domain.model.order import OrderId
+from internal_api_oop.core.domain.service.place_order_service import (
+    Finalize,
+    PlaceOrderContext,
+    PlaceOrderService,
+    _build_context,
+    _finalize,
+    _reservations,
+    _to_receipt,
+)
+from internal_api_oop.core.ports.inbound.place_order import (
+    OrderReceipt,
+    PlaceOrderCommand,
+)
+from internal_api_oop.core.ports.outbound.events import OrderPlaced
+from internal_api_oop.core.ports.outbound.inventory import Hold
+
+# 同時に来た注文を数 ms 溜めて、在庫の仮押さえ・confirm・保存・発行を
+# まとめ処理（1 往復）で流す。与信・capture は注文ごと（executor があれば並行）。
+# 冪等性・検証は従来どおり呼び出し元スレッドで行い、結果も注文ごとに返す。
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BatchPolicy:
+    window_seconds: float = 0.002  # 最初の 1 件からこの時間だけ待つ
+    max_batch: int = 64  # これだけ溜まったら待たずに流す
+    workers: int = 2  # 同時に処理するバッチ数
+
+
+@dataclass
+class _Slot:
+    ctx: PlaceOrderContext
+    future: Future[Result[OrderReceipt, PlaceOrderError]]
+
+
+class MicroBatcher:
+    """submit された slot を window / max_batch で区切って run_batch に渡す。"""
+
+    def __init__(
+        self, run_batch: Callable[[Sequence[_Slot]], None], policy: BatchPolicy
+    ) -> None:
+        self._run_batch = run_batch
+        self._policy = policy
+        self._queue: queue.SimpleQueue[_Slot | None] = queue.SimpleQueue()
+        self._workers = ThreadPoolExecutor(
+            max(1, policy.workers), thread_name_prefix="batch"
+        )
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self._thread = threading.Thread(
+            target=self._collect, name="batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, ctx: PlaceOrderContext
+    ) -> Future[Result[OrderReceipt, PlaceOrderError]]:
+        slot = _Slot(ctx, Future())
+        self._queue.put(slot)
+        return slot.future
+
+    def mean_batch_size(self) -> float:
+        with self._lock:
+            return self.items / self.batches if self.batches else 0.0
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        self._workers.shutdown()
+
+    def _collect(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            until = time.monotonic() + self._policy.window_seconds
+            while len(batch) < self._policy.max_batch:
+                wait = until - time.monotonic()
+                try:
+                    nxt = (
+                        self._queue.get(timeout=wait)
+                        if wait > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._dispatch(batch)
+                    return
+                batch.append(nxt)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[_Slot]) -> None:
+        with self._lock:
+            self.batches += 1
+            self.items += len(batch)
+        self._workers.submit(self._guarded, batch)
+
+    def _guarded(self, batch: list[_Slot]) -> None:
+        try:
+            self._run_batch(batch)
+        except BaseException as e:  # 呼び出し元を待たせたままにしない
+            for slot in batch:
+                if not slot.future.done():
+                    slot.future.set_exception(e)
+
+
+@dataclass(frozen=True)
+class BatchingPlaceOrderService(PlaceOrderService):
+    policy: BatchPolicy = field(default_factory=BatchPolicy)
+    batcher: MicroBatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "batcher", MicroBatcher(self._run_batch, self.policy))
+
+    def close(self) -> None:
+        self.batcher.close()
+
+    def _run_once(
+        self, cmd: PlaceOrderCommand, order_id: OrderId, finalize: Finalize | None
+    ) -> Result[OrderReceipt, PlaceOrderError]:
+        result = _build_context(cmd, order_id).bind(
+            lambda ctx: self.batcher.submit(ctx).result()
+        )
+        _finalize(result, finalize)
+        return result
+
+    # ---- batch pipeline ----------------------------------------------------
+
+    def _run_batch(self, batch: Sequence[_Slot]) -> None:
+        live = self._within_budget(batch, "hold_inventory")
+        live = self._hold_and_authorize_batch(live)
+
+        live = self._within_budget(live, "confirm_hold")
+        if not live:
+            return
+        confirmed = self.deps.inventory.confirm_many(
+            [_hold_of(s) for s in live], deadline=_latest(live)
+        )
+        live = self._settle(live, confirmed, void=True)
+
+        live = self._within_budget(live, "capture_payment")
+        captured = self._each(live, self._capture)
+        live = self._settle(live, captured, void=True)
+
+        # capture 済みの注文は締め切りを見ずに保存・通知まで進める（単発経路と同じ）
+        if not live:
+            return
+        saved = self.deps.orders.save_many([s.ctx.order for s in live])
+        # capture 済みの決済は void できない（単発経路と同じく在庫だけ戻す）
+        live = self._settle(live, saved, void=False)
+
+        if not live:
+            return
+        published = self.deps.events.publish_many(
+            [OrderPlaced(s.ctx.order.order_id, s.ctx.order) for s in live]
+        )
+        live = self._settle(live, published, compensate=False)
+
+        for slot in live:
+            slot.future.set_result(Success(_to_receipt(slot.ctx)))
+
+    def _hold_and_authorize_batch(self, live: list[_Slot]) -> list[_Slot]:
+        if not live:
+            return live
+        executor = self.deps.executor
+        pending = (
+            [executor.submit(self._authorize_payment, s.ctx) for s in live]
+            if executor is not None
+            else None
+        )
+        held = self.deps.inventory.hold_many(
+            [_reservations(s.ctx) for s in live],
+            deadline=_latest(live),
+        )
+        if pending is None:
+            # 逐次モード：仮押さえできた注文だけ与信する
+            authorized = [
+                self._authorize_payment(s.ctx) if isinstance(h, Success) else h
+                for s, h in zip(live, held)
+            ]
+        else:
+            authorized = [f.result() for f in pending]
+
+        survivors: list[_Slot] = []
+        for slot, h, a in zip(live, held, authorized):
+            slot.ctx = replace(
+                slot.ctx, hold=h.value_or(None), authorization=a.value_or(None)
+            )
+            err = h.failure() if isinstance(h, Failure) else None
+            if err is None and isinstance(a, Failure):
+                err = a.failure()
+            if err is not None:
+                self._compensate(slot.ctx)
+                slot.future.set_result(Failure(err))
+            else:
+                survivors.append(slot)
+        return survivors
+
+    def _capture(self, slot: _Slot) -> Result[None, PlaceOrderError]:
+        assert slot.ctx.authorization is not None
+        return self.deps.payment.capture(
+            slot.ctx.authorization, deadline=slot.ctx.deadline
+        )
+
+    def _each(
+        self, live: list[_Slot], fn: Callable[[_Slot], Result[T, PlaceOrderError]]
+    ) -> list[Result[T, PlaceOrderError]]:
+        executor = self.deps.executor
+        if executor is None or len(live) <= 1:
+            return [fn(s) for s in live]
+        return [f.result() for f in [executor.submit(fn, s) for s in live]]
+
+    def _within_budget(self, slots: Sequence[_Slot], stage: str) -> list[_Slot]:
+        survivors: list[_Slot] = []
+        for slot in slots:
+            err = self._check_budget(slot.ctx, stage)
+            if err is None:
+                survivors.append(slot)
+                continue
+            self._compensate(slot.ctx)
+            slot.future.set_result(Failure(err))
+        return survivors
+
+    def _settle(
+        self,
+        live: list[_Slot],
+        results: Sequence[Result[object, PlaceOrderError]],
+        *,
+        void: bool = True,
+        compensate: bool = True,
+    ) -> list[_Slot]:
+        survivors: list[_Slot] = []
+        for slot, r in zip(live, results):
+            if isinstance(r, Success):
+                survivors.append(slot)
+                continue
+            if compensate:
+                self._compensate(slot.ctx, void=void)
+            slot.future.set_result(Failure(r.failure()))
+        return survivors
+
+
+def _hold_of(slot: _Slot) -> Hold:
+    assert slot.ctx.hold is not None
+    return slot.ctx.hold
+
+
+def _latest(slots: Sequence[_Slot]) -> Deadline | None:
+    # まとめ処理には一番遅い締め切りを渡す（早い締め切りの注文に全体を合わせない）
+    latest: Deadline | None = None
+    for slot in slots:
+        d = slot.ctx.deadline
+        if d is None:
+            return None
+        if latest is None or d.expires_at > latest.expires_at:
+            latest = d
+    return latest
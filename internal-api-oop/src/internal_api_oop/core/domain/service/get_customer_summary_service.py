@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from returns.result import Failure, Result
+
+from internal_api_oop.core.domain.model.customer import CustomerSummary
+from internal_api_oop.core.domain.model.errors import PlaceOrderError, ValidationError
+from internal_api_oop.core.domain.model.order import CustomerId
+from internal_api_oop.core.ports.inbound.get_customer_summary import (
+    CustomerSummaryView,
+    GetCustomerSummaryQuery,
+    GetCustomerSummaryUseCase,
+)
+from internal_api_oop.core.ports.outbound.orders import OrderRepository
+
+
+@dataclass(frozen=True)
+class GetCustomerSummaryDeps:
+    orders: OrderRepository
+
+
+@dataclass(frozen=True)
+class GetCustomerSummaryService(GetCustomerSummaryUseCase):
+    deps: GetCustomerSummaryDeps
+
+    def get_customer_summary(
+        self, query: GetCustomerSummaryQuery
+    ) -> Result[CustomerSummaryView, PlaceOrderError]:
+        cid = query.customer_id.strip()
+        if not cid:
+            return Failure(ValidationError(message="customer_id is required"))
+
+        # 集計は保存時に済んでいるので、ここでは 1 件引くだけ（注文を走査しない）
+        return self.deps.orders.customer_summary(CustomerId(cid)).map(_to_view)
+
+
+def _to_view(summary: CustomerSummary) -> CustomerSummaryView:
+    return CustomerSummaryView(
+        customer_id=summary.customer_id,
+        order_count=summary.order_count,
+        lifetime_total=summary.lifetime_total,
+        first_order_at=summary.first_order_at,
+        last_order_at=summary.last_order_at,
+    )
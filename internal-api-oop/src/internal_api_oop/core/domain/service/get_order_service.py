@@ -5,20 +5,26 @@ from uuid import UUID
 
 from returns.result import Failure, Result
 
-from internal_api_oop.core.domain.model.errors import PlaceOrderError, ValidationError
+from internal_api_oop.core.domain.model.errors import (
+    OrderNotFound,
+    PlaceOrderError,
+    ValidationError,
+)
 from internal_api_oop.core.domain.model.order import OrderId
+from internal_api_oop.core.domain.service.order_views import render_order_view
 from internal_api_oop.core.ports.inbound.get_order import (
     GetOrderQuery,
     GetOrderUseCase,
-    OrderLineView,
     OrderView,
 )
+from internal_api_oop.core.ports.outbound.order_views import OrderViewRepository
 from internal_api_oop.core.ports.outbound.orders import OrderRepository
 
 
 @dataclass(frozen=True)
 class GetOrderDeps:
     orders: OrderRepository
+    views: OrderViewRepository | None = None  # あれば読み取りモデルから返す
 
 
 @dataclass(frozen=True)
@@ -31,22 +37,12 @@ class GetOrderService(GetOrderUseCase):
         except Exception:  # noqa: BLE001
             return Failure(ValidationError(message="order_id must be a valid UUID"))
 
-        return self.deps.orders.get(oid).map(_to_view)
-
-
-def _to_view(order) -> OrderView:
-    lines = tuple(
-        OrderLineView(
-            sku=li.sku.value,
-            unit_price=li.unit_price,
-            quantity=li.quantity,
-            subtotal=li.subtotal(),
-        )
-        for li in order.items
-    )
-    return OrderView(
-        order_id=order.order_id,
-        customer_id=order.customer_id,
-        total=order.total(),
-        lines=lines,
-    )
+        if self.deps.views is not None:
+            found = self.deps.views.get_view(oid)
+            if not (
+                isinstance(found, Failure) and isinstance(found.failure(), OrderNotFound)
+            ):
+                return found
+            # 作成直後でまだ投影されていない注文は書き込み側から読む（read-your-writes）
+
+        return self.deps.orders.get(oid).map(render_order_view)
@@ -7,17 +7,20 @@ from returns.result import Failure, Result
 
 from internal_api_oop.core.domain.model.errors import PlaceOrderError, ValidationError
 from internal_api_oop.core.domain.model.order import CustomerId
+from internal_api_oop.core.domain.service.order_views import render_summary
 from internal_api_oop.core.ports.inbound.list_orders import (
     ListOrdersQuery,
     ListOrdersUseCase,
     OrderSummaryView,
 )
+from internal_api_oop.core.ports.outbound.order_views import OrderViewRepository
 from internal_api_oop.core.ports.outbound.orders import OrderRepository
 
 
 @dataclass(frozen=True)
 class ListOrdersDeps:
     orders: OrderRepository
+    views: OrderViewRepository | None = None  # あれば読み取りモデルから返す（結果整合）
 
 
 @dataclass(frozen=True)
@@ -52,6 +55,15 @@ class ListOrdersService(ListOrdersUseCase):
         if query.sort_dir not in {"asc", "desc"}:
             return Failure(ValidationError(message="sort_dir must be 'asc' or 'desc'"))
 
+        if self.deps.views is not None:
+            return self.deps.views.list_views(
+                query.offset,
+                query.limit,
+                customer_id=customer,
+                sort_by=query.sort_by,
+                sort_dir=query.sort_dir,
+            )
+
         return self.deps.orders.list(
             query.offset,
             query.limit,
@@ -62,11 +74,4 @@ class ListOrdersService(ListOrdersUseCase):
 
 
 def _to_summaries(orders) -> Sequence[OrderSummaryView]:
-    return tuple(
-        OrderSummaryView(
-            order_id=o.order_id,
-            customer_id=o.customer_id,
-            total=o.total(),
-        )
-        for o in orders
-    )
+    return tuple(render_summary(o) for o in orders)
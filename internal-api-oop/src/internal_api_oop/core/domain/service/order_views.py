@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from internal_api_oop.core.domain.model.order import Order
+from internal_api_oop.core.ports.inbound.get_order import OrderLineView, OrderView
+from internal_api_oop.core.ports.inbound.list_orders import OrderSummaryView
+
+# 注文 → 参照用ビューの変換。
+# get / list のサービスと読み取りモデル（投影時に 1 回だけ作る）で共有する。
+
+
+def render_order_view(order: Order) -> OrderView:
+    lines = tuple(
+        OrderLineView(
+            sku=li.sku.value,
+            unit_price=li.unit_price,
+            quantity=li.quantity,
+            subtotal=li.subtotal(),
+        )
+        for li in order.items
+    )
+    return OrderView(
+        order_id=order.order_id,
+        customer_id=order.customer_id,
+        total=order.total(),
+        lines=lines,
+    )
+
+
+def render_summary(order: Order) -> OrderSummaryView:
+    return OrderSummaryView(
+        order_id=order.order_id,
+        customer_id=order.customer_id,
+        total=order.total(),
+    )
@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import json
-from dataclasses import dataclass
+from concurrent.futures import Executor
+from dataclasses import dataclass, field, replace
 from datetime import timedelta
 from decimal import Decimal
 from decimal import Decimal as D
-from typing import Callable, Tuple
+from functools import cached_property
+from typing import Any, Callable, Mapping
 from uuid import UUID
 
 from returns.pipeline import flow
 from returns.pointfree import bind, map_
 from returns.result import Failure, Result, Success
 
+from internal_api_oop.core.domain.model.cart import PreparedCart, prepare_cart
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import (
+    DeadlineExceeded,
     IdempotencyFailed,
     IdempotencyInProgress,
     IdempotencyKeyConflict,
@@ -33,15 +38,43 @@ from internal_api_oop.core.domain.model.order import (
 from internal_api_oop.core.ports.inbound.place_order import (
     OrderReceipt,
     PlaceOrderCommand,
+    PlaceOrderLine,
     PlaceOrderUseCase,
 )
 from internal_api_oop.core.ports.outbound.events import EventPublisher, OrderPlaced
 from internal_api_oop.core.ports.outbound.idempotency import IdempotencyRepository
-from internal_api_oop.core.ports.outbound.inventory import InventoryGateway, Reservation
+from internal_api_oop.core.ports.outbound.inventory import (
+    Hold,
+    InventoryGateway,
+    Reservation,
+)
 from internal_api_oop.core.ports.outbound.orders import OrderRepository
-from internal_api_oop.core.ports.outbound.payment import ChargeRequest, PaymentGateway
+from internal_api_oop.core.ports.outbound.payment import (
+    Authorization,
+    ChargeRequest,
+    PaymentGateway,
+)
+from internal_api_oop.core.ports.outbound.tracing import SpanFactory
 
 Finalize = tuple[Callable[[OrderReceipt], None], Callable[[PlaceOrderError], None]]
+Stage = Callable[[Any], Result[Any, PlaceOrderError]]
+
+# prepare_executor との受け渡しの形（プロセス / サブインタプリタの境界は pickle で越えるので、
+# ドメインオブジェクトではなくタプルと文字列・Decimal だけで渡す）
+# (customer_id, payment_token, idempotency_key, ((sku, unit_price, quantity), ...))
+WireCommand = tuple[str, str, "str | None", tuple[tuple[str, Any, int], ...]]
+# 成功: (明細, SKU ごとの引当数, 合計額, 通貨, 明細のハッシュ, 冪等ハッシュ) / 検証エラー: メッセージ
+WirePrepared = (
+    tuple[
+        tuple[tuple[str, Decimal, int], ...],
+        tuple[tuple[str, int], ...],
+        Decimal,
+        str,
+        str,
+        "str | None",
+    ]
+    | str
+)
 
 
 @dataclass(frozen=True)
@@ -52,13 +85,28 @@ class PlaceOrderDeps:
     events: EventPublisher
     idempotency: IdempotencyRepository
     idempotency_ttl_seconds: int = 120  # IN_PROGRESS の寿命（例）
+    # 各ステージを始めるのに最低限必要な残り時間（秒）。足りなければ呼ばずに打ち切る
+    stage_min_seconds: Mapping[str, float] = field(default_factory=dict)
+    # 与信を在庫引当と並行に走らせる executor。None なら引当 → 与信の逐次実行
+    executor: Executor | None = None
+    # 指定するとコマンドの検証を子 span で囲む（ポート呼び出しの span は adapter 側）
+    tracer: SpanFactory | None = None
+    # 検証・明細の集計・冪等ハッシュ（副作用の無い CPU 処理）を投げる executor。
+    # プロセス / サブインタプリタのプールなら呼び出し元の GIL の外で走る。None ならその場で行う
+    prepare_executor: Executor | None = None
+    # False なら各ステージを returns の flow で繋いだ参照実装で走らせる（結果は同じ）
+    fused_pipeline: bool = True
 
 
 @dataclass(frozen=True)
 class PlaceOrderContext:
     order: Order
     payment_token: str
+    cart: PreparedCart
     idempotency_key: str | None = None
+    deadline: Deadline | None = None
+    hold: Hold | None = None
+    authorization: Authorization | None = None
 
 
 @dataclass(frozen=True)
@@ -68,11 +116,22 @@ class PlaceOrderService(PlaceOrderUseCase):
     def place_order(
         self, command: PlaceOrderCommand
     ) -> Result[OrderReceipt, PlaceOrderError]:
-        v = _validate_command(command)
+        tracer = self.deps.tracer
+        if tracer is None:
+            v, req_hash = self._validate(command)
+        else:
+            with tracer.span("validate", lines=len(command.lines)):
+                v, req_hash = self._validate(command)
         if isinstance(v, Failure):
             return v
         cmd = v.unwrap()
 
+        if cmd.deadline is not None and cmd.deadline.expired():
+            # スレッドプールの待ち行列で締め切りを過ぎたものは即座に捨てる
+            return Failure(
+                DeadlineExceeded(message="request deadline exceeded", stage="admission")
+            )
+
         # ---- no idempotency key: legacy behavior ---------------------------
         if cmd.idempotency_key is None:
             return self._run_once(cmd, order_id=OrderId.new(), finalize=None)
@@ -80,7 +139,8 @@ class PlaceOrderService(PlaceOrderUseCase):
         # ---- idempotency enabled ------------------------------------------
         customer = CustomerId(cmd.customer_id)
         key = cmd.idempotency_key
-        req_hash = _request_hash(cmd)
+        if req_hash is None:
+            req_hash = _request_hash(cmd)
 
         existing = self.deps.idempotency.get(customer, key)
         if isinstance(existing, Failure):
@@ -133,6 +193,16 @@ class PlaceOrderService(PlaceOrderUseCase):
 
         return self._run_once(cmd, order_id=order_id, finalize=(on_ok, on_ng))
 
+    def _validate(
+        self, command: PlaceOrderCommand
+    ) -> tuple[Result[PlaceOrderCommand, PlaceOrderError], str | None]:
+        """検証済みのコマンドと、executor 側で計算済みなら冪等ハッシュ。"""
+        executor = self.deps.prepare_executor
+        if executor is None or command.cart is not None:
+            return _validate_command(command), None
+        prepared = executor.submit(_prepare_wire, _encode_command(command)).result()
+        return _decode_prepared(command, prepared)
+
     def _resume(
         self, customer: CustomerId, cmd: PlaceOrderCommand, rec: IdempotencyRecord
     ) -> Result[OrderReceipt, PlaceOrderError]:
@@ -190,52 +260,195 @@ class PlaceOrderService(PlaceOrderUseCase):
     def _run_once(
         self, cmd: PlaceOrderCommand, order_id: OrderId, finalize: Finalize | None
     ) -> Result[OrderReceipt, PlaceOrderError]:
-        result = flow(
-            cmd,
+        if self.deps.fused_pipeline:
+            result = self._pipeline(cmd, order_id)
+        else:
+            result = self._run_flow(cmd, order_id)
+        _finalize(result, finalize)
+        return result
+
+    def _run_flow(
+        self, cmd: PlaceOrderCommand, order_id: OrderId
+    ) -> Result[OrderReceipt, PlaceOrderError]:
+        # 参照実装。_pipeline はこれと同じ順・同じ打ち切り方でステージを呼ぶ
+        return flow(
+            Success(cmd),
             bind(lambda c: _build_context(c, order_id)),
-            bind(self._reserve_inventory),
-            bind(self._charge_payment),
+            bind(self._hold_and_authorize),
+            bind(self._confirm_hold),
+            bind(self._capture_payment),
             bind(self._persist),
             bind(self._publish),
             map_(_to_receipt),
         )
 
-        if finalize is not None:
-            ok, ng = finalize
-            if isinstance(result, Success):
-                ok(result.unwrap())
-            else:
-                ng(result.failure())
-
-        return result
+    @cached_property
+    def _pipeline(
+        self,
+    ) -> Callable[[PlaceOrderCommand, OrderId], Result[OrderReceipt, PlaceOrderError]]:
+        # ステージの並びはインスタンスごとに 1 回だけ組む（リクエストごとに lambda や
+        # bind の包みを作らない）
+        return _fuse(
+            _build_context,
+            (
+                self._hold_and_authorize,
+                self._confirm_hold,
+                self._capture_payment,
+                self._persist,
+                self._publish,
+            ),
+            _to_receipt,
+        )
 
     # ---- side effects ------------------------------------------------------
 
-    def _reserve_inventory(
+    def _hold_and_authorize(
         self, ctx: PlaceOrderContext
     ) -> Result[PlaceOrderContext, PlaceOrderError]:
-        reservations = tuple(Reservation(li.sku, li.quantity) for li in ctx.order.items)
-        return self.deps.inventory.reserve(reservations).map(lambda _: ctx)
+        # 在庫の仮押さえと与信は互いに独立なので、executor があれば与信を先に投げて
+        # 仮押さえと重ねる（待ち時間は和ではなく遅い方の往復分になる）
+        executor = self.deps.executor
+        if executor is None:
+            held = self._hold_inventory(ctx)
+            if isinstance(held, Failure):
+                return held
+            ctx = replace(ctx, hold=held.unwrap())
+            return self._undo_on_failure(
+                ctx,
+                self._authorize_payment(ctx).map(
+                    lambda auth: replace(ctx, authorization=auth)
+                ),
+            )
 
-    def _charge_payment(
+        pending = executor.submit(self._authorize_payment, ctx)
+        # 片方が例外で抜けても、もう片方で取れた在庫・与信枠は戻してから投げ直す
+        try:
+            held = self._hold_inventory(ctx)
+        except BaseException:
+            try:
+                late = pending.result().value_or(None)
+            except Exception:
+                late = None  # 与信も例外なら戻すものはない（投げるのは仮押さえの例外）
+            self._compensate(replace(ctx, authorization=late))
+            raise
+        try:
+            authorized = pending.result()
+        except BaseException:
+            self._compensate(replace(ctx, hold=held.value_or(None)))
+            raise
+        ctx = replace(
+            ctx,
+            hold=held.value_or(None),
+            authorization=authorized.value_or(None),
+        )
+        if isinstance(held, Failure):
+            self._compensate(ctx)
+            return held
+        if isinstance(authorized, Failure):
+            self._compensate(ctx)
+            return authorized
+        return Success(ctx)
+
+    def _hold_inventory(self, ctx: PlaceOrderContext) -> Result[Hold, PlaceOrderError]:
+        budget = self._check_budget(ctx, "hold_inventory")
+        if budget is not None:
+            return Failure(budget)
+        return self.deps.inventory.hold(_reservations(ctx), deadline=ctx.deadline)
+
+    def _authorize_payment(
         self, ctx: PlaceOrderContext
-    ) -> Result[PlaceOrderContext, PlaceOrderError]:
+    ) -> Result[Authorization, PlaceOrderError]:
+        budget = self._check_budget(ctx, "authorize_payment")
+        if budget is not None:
+            return Failure(budget)
+        # order_id を与信キーにする：同じ order_id での再実行（IN_PROGRESS 復旧）でも安全
         req = ChargeRequest(
-            ctx.order.customer_id, ctx.order.total(), token=ctx.payment_token
+            ctx.order.customer_id,
+            ctx.cart.total,
+            token=ctx.payment_token,
+            idempotency_key=str(ctx.order.order_id.value),
+        )
+        return self.deps.payment.authorize(req, deadline=ctx.deadline)
+
+    def _confirm_hold(
+        self, ctx: PlaceOrderContext
+    ) -> Result[PlaceOrderContext, PlaceOrderError]:
+        # capture（取り消せない）より前に在庫を確定させる。期限切れならここで止まる
+        assert ctx.hold is not None
+        budget = self._check_budget(ctx, "confirm_hold")
+        if budget is not None:
+            self._compensate(ctx)
+            return Failure(budget)
+        return self._undo_on_failure(
+            ctx,
+            _keep(ctx, self.deps.inventory.confirm(ctx.hold, deadline=ctx.deadline)),
+        )
+
+    def _capture_payment(
+        self, ctx: PlaceOrderContext
+    ) -> Result[PlaceOrderContext, PlaceOrderError]:
+        assert ctx.authorization is not None
+        budget = self._check_budget(ctx, "capture_payment")
+        if budget is not None:
+            self._compensate(ctx)
+            return Failure(budget)
+        return self._undo_on_failure(
+            ctx,
+            _keep(
+                ctx, self.deps.payment.capture(ctx.authorization, deadline=ctx.deadline)
+            ),
         )
-        return self.deps.payment.charge(req).map(lambda _: ctx)
 
     def _persist(
         self, ctx: PlaceOrderContext
     ) -> Result[PlaceOrderContext, PlaceOrderError]:
-        return self.deps.orders.save(ctx.order).map(lambda _: ctx)
+        # capture 済みの決済は取り消せないので、ここから先は締め切りを見ずに最後まで進める
+        # （途中で諦めると「請求済みで注文なし」になる）。保存に失敗したら在庫だけ戻し、
+        # 返金は決済側との突き合わせに任せる
+        return self._undo_on_failure(
+            ctx, _keep(ctx, self.deps.orders.save(ctx.order)), void=False
+        )
 
     def _publish(
         self, ctx: PlaceOrderContext
     ) -> Result[PlaceOrderContext, PlaceOrderError]:
-        return self.deps.events.publish(OrderPlaced(ctx.order.order_id)).map(
-            lambda _: ctx
-        )
+        # 保存済みの注文は締め切りを過ぎても通知する（_persist と同じ理由）
+        published = self.deps.events.publish(OrderPlaced(ctx.order.order_id, ctx.order))
+        return _keep(ctx, published)
+
+    def _undo_on_failure(
+        self,
+        ctx: PlaceOrderContext,
+        result: Result[PlaceOrderContext, PlaceOrderError],
+        *,
+        void: bool = True,
+    ) -> Result[PlaceOrderContext, PlaceOrderError]:
+        if isinstance(result, Failure):
+            self._compensate(ctx, void=void)
+        return result
+
+    def _compensate(self, ctx: PlaceOrderContext, *, void: bool = True) -> None:
+        # 失敗したリクエストが握っている在庫・与信枠をすぐ戻す（期限切れを待たない）。
+        # リクエストは既に失敗なので締め切りは渡さない。戻せなくても期限切れで自然に戻る
+        if ctx.hold is not None:
+            _ = self.deps.inventory.release(ctx.hold)
+        if void and ctx.authorization is not None:
+            _ = self.deps.payment.void(ctx.authorization)
+
+    def _check_budget(
+        self, ctx: PlaceOrderContext, stage: str
+    ) -> DeadlineExceeded | None:
+        # クライアントが既に諦めた（or 間に合わない）処理でワーカーを塞がない
+        if ctx.deadline is None:
+            return None
+        remaining = ctx.deadline.remaining()
+        if remaining <= 0:
+            return DeadlineExceeded(message="request deadline exceeded", stage=stage)
+        if remaining < self.deps.stage_min_seconds.get(stage, 0.0):
+            return DeadlineExceeded(
+                message="insufficient time budget for stage", stage=stage
+            )
+        return None
 
 
 # ---- pure helpers ----------------------------------------------------------
@@ -246,7 +459,7 @@ def _validate_command(
 ) -> Result[PlaceOrderCommand, PlaceOrderError]:
     if not cmd.customer_id.strip():
         return Failure(ValidationError("customer_id is required"))
-    if not cmd.lines:
+    if cmd.cart is None and not cmd.lines:
         return Failure(ValidationError("at least one line item is required"))
     if not cmd.payment_token.strip():
         return Failure(ValidationError("payment_token is required"))
@@ -254,42 +467,140 @@ def _validate_command(
         return Failure(
             ValidationError("idempotency_key must be non-empty when provided")
         )
+    if cmd.cart is not None:
+        return Success(cmd)
+
+    # 明細の検証・集計・ハッシュは 1 パスで済ませ、以降は cart を使う
+    return prepare_cart(
+        (ln.sku, Decimal(ln.unit_price), ln.quantity) for ln in cmd.lines
+    ).map(lambda cart: replace(cmd, cart=cart))
+
+
+def _encode_command(cmd: PlaceOrderCommand) -> WireCommand:
+    return (
+        cmd.customer_id,
+        cmd.payment_token,
+        cmd.idempotency_key,
+        tuple((ln.sku, ln.unit_price, ln.quantity) for ln in cmd.lines),
+    )
+
+
+def _prepare_wire(wire: WireCommand) -> WirePrepared:
+    """prepare_executor 側で走る。_validate_command と _request_hash をそのまま使う。"""
+    customer_id, payment_token, key, lines = wire
+    cmd = PlaceOrderCommand(
+        customer_id=customer_id,
+        lines=[PlaceOrderLine(sku, price, qty) for sku, price, qty in lines],
+        payment_token=payment_token,
+        idempotency_key=key,
+    )
+    v = _validate_command(cmd)
+    if isinstance(v, Failure):
+        return v.failure().message  # 検証で返るのは ValidationError だけ
+    cmd = v.unwrap()
+    cart = cmd.cart
+    assert cart is not None
+    return (
+        tuple((i.sku.value, i.unit_price.amount, i.quantity) for i in cart.items),
+        cart.quantity_by_sku,
+        cart.total.amount,
+        cart.total.currency,
+        cart.lines_digest,
+        _request_hash(cmd) if key is not None else None,
+    )
 
-    for i, ln in enumerate(cmd.lines):
-        if not ln.sku.strip():
-            return Failure(ValidationError(f"lines[{i}].sku is required"))
-        if ln.quantity <= 0:
-            return Failure(ValidationError(f"lines[{i}].quantity must be > 0"))
-        if Decimal(ln.unit_price) <= 0:
-            return Failure(ValidationError(f"lines[{i}].unit_price must be > 0"))
 
-    return Success(cmd)
+def _decode_prepared(
+    cmd: PlaceOrderCommand, prepared: WirePrepared
+) -> tuple[Result[PlaceOrderCommand, PlaceOrderError], str | None]:
+    if isinstance(prepared, str):
+        return Failure(ValidationError(prepared)), None
+    lines, quantity_by_sku, total, currency, digest, req_hash = prepared
+    items: list[LineItem] = []
+    interned: dict[tuple[str, Decimal, int], LineItem] = {}  # CartBuilder と同じく共有する
+    for line in lines:
+        item = interned.get(line)
+        if item is None:
+            sku, price, qty = line
+            item = interned[line] = LineItem(Sku(sku), Money(price, currency), qty)
+        items.append(item)
+    cart = PreparedCart(tuple(items), quantity_by_sku, Money(total, currency), digest)
+    return Success(replace(cmd, cart=cart)), req_hash
 
 
 def _build_context(
     cmd: PlaceOrderCommand, order_id: OrderId
 ) -> Result[PlaceOrderContext, PlaceOrderError]:
-    items: Tuple[LineItem, ...] = tuple(
-        LineItem(
-            sku=Sku(ln.sku), unit_price=Money.of(ln.unit_price), quantity=ln.quantity
-        )
-        for ln in cmd.lines
-    )
+    assert cmd.cart is not None  # _validate_command で用意済み
+    # prepare_executor には投げない：明細は検証済みのカートのものをそのまま使い、ここでの
+    # 仕事は行数によらず一定。投げるとカートを pickle で往復させる分だけ遅くなる
     order = Order(
         order_id=order_id,
         customer_id=CustomerId(cmd.customer_id),
-        items=items,
-        created_at=now_utc(),
+        items=cmd.cart.items,
+        # v7 の id は作成時刻を含むので揃えておく（id 順 = created_at 順）
+        created_at=order_id.created_at() or now_utc(),
     )
     return Success(
         PlaceOrderContext(
             order=order,
             payment_token=cmd.payment_token,
+            cart=cmd.cart,
             idempotency_key=cmd.idempotency_key,
+            deadline=cmd.deadline,
         )
     )
 
 
+def _keep(
+    ctx: PlaceOrderContext, result: Result[Any, PlaceOrderError]
+) -> Result[PlaceOrderContext, PlaceOrderError]:
+    # result.map(lambda _: ctx) と同じ。成功の値は使わないので lambda を作らない
+    return result if isinstance(result, Failure) else Success(ctx)
+
+
+def _fuse(
+    build: Callable[[PlaceOrderCommand, OrderId], Result[Any, PlaceOrderError]],
+    stages: tuple[Stage, ...],
+    finish: Callable[[Any], OrderReceipt],
+) -> Callable[[PlaceOrderCommand, OrderId], Result[OrderReceipt, PlaceOrderError]]:
+    """
+    flow(Success(cmd), bind(build), bind(stage)..., map_(finish)) と同じく、最初の Failure を
+    そのまま返す 1 つの関数にまとめる。各ステージの Result は作られたものを使い回す。
+    """
+
+    def run(
+        cmd: PlaceOrderCommand, order_id: OrderId
+    ) -> Result[OrderReceipt, PlaceOrderError]:
+        result = build(cmd, order_id)
+        for stage in stages:
+            if isinstance(result, Failure):
+                return result
+            result = stage(result.unwrap())
+        if isinstance(result, Failure):
+            return result
+        return Success(finish(result.unwrap()))
+
+    return run
+
+
+def _finalize(
+    result: Result[OrderReceipt, PlaceOrderError], finalize: Finalize | None
+) -> None:
+    if finalize is None:
+        return
+    ok, ng = finalize
+    if isinstance(result, Success):
+        ok(result.unwrap())
+    else:
+        ng(result.failure())
+
+
+def _reservations(ctx: PlaceOrderContext) -> tuple[Reservation, ...]:
+    # 同じ SKU の行は 1 件の引当にまとめる
+    return tuple(Reservation(Sku(sku), qty) for sku, qty in ctx.cart.quantity_by_sku)
+
+
 def _order_to_receipt(order: Order) -> OrderReceipt:
     return OrderReceipt(
         order_id=order.order_id, customer_id=order.customer_id, total=order.total()
@@ -297,17 +608,20 @@ def _order_to_receipt(order: Order) -> OrderReceipt:
 
 
 def _to_receipt(ctx: PlaceOrderContext) -> OrderReceipt:
-    return _order_to_receipt(ctx.order)
+    # 合計は cart で計算済み（明細を歩き直さない）
+    return OrderReceipt(
+        order_id=ctx.order.order_id,
+        customer_id=ctx.order.customer_id,
+        total=ctx.cart.total,
+    )
 
 
 def _request_hash(cmd: PlaceOrderCommand) -> str:
+    assert cmd.cart is not None
     payload = {
         "customer_id": cmd.customer_id,
         "payment_token": cmd.payment_token,
-        "lines": [
-            {"sku": ln.sku, "unit_price": str(ln.unit_price), "quantity": ln.quantity}
-            for ln in cmd.lines
-        ],
+        "lines_sha256": cmd.cart.lines_digest,
     }
     blob = json.dumps(
         payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
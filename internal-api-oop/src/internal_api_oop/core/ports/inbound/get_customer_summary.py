@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+from returns.result import Result
+
+from internal_api_oop.core.domain.model.errors import PlaceOrderError
+from internal_api_oop.core.domain.model.order import CustomerId, Money
+
+
+@dataclass(frozen=True)
+class GetCustomerSummaryQuery:
+    customer_id: str
+
+
+@dataclass(frozen=True)
+class CustomerSummaryView:
+    customer_id: CustomerId
+    order_count: int
+    lifetime_total: Money
+    first_order_at: datetime
+    last_order_at: datetime
+
+
+class GetCustomerSummaryUseCase(Protocol):
+    def get_customer_summary(
+        self, query: GetCustomerSummaryQuery
+    ) -> Result[CustomerSummaryView, PlaceOrderError]: ...
@@ -6,6 +6,8 @@ from typing import Protocol, Sequence
 
 from returns.result import Result
 
+from internal_api_oop.core.domain.model.cart import PreparedCart
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PlaceOrderError
 from internal_api_oop.core.domain.model.order import CustomerId, Money, OrderId
 
@@ -23,6 +25,9 @@ class PlaceOrderCommand:
     lines: Sequence[PlaceOrderLine]
     payment_token: str
     idempotency_key: str | None = None
+    deadline: Deadline | None = None  # 冪等ハッシュには含めない
+    # 大口注文：受信時に明細を逐次組み立て済みなら lines の代わりにこちらを渡す
+    cart: PreparedCart | None = None
 
 
 @dataclass(frozen=True)
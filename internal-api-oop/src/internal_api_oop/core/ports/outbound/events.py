@@ -1,18 +1,28 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Protocol
+import time
+from dataclasses import dataclass, field
+from typing import Protocol, Sequence
 
 from returns.result import Result
 
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PlaceOrderError
-from internal_api_oop.core.domain.model.order import OrderId
+from internal_api_oop.core.domain.model.order import Order, OrderId
 
 
 @dataclass(frozen=True)
 class OrderPlaced:
     order_id: OrderId
+    order: Order  # 購読側（読み取りモデルなど）が書き込み側を引き直さなくて済むように載せる
+    occurred_at: float = field(default_factory=time.time)  # 発行時刻（投影の遅れの計測用）
 
 
 class EventPublisher(Protocol):
-    def publish(self, event: OrderPlaced) -> Result[None, PlaceOrderError]: ...
+    def publish(
+        self, event: OrderPlaced, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]: ...
+
+    def publish_many(
+        self, events: Sequence[OrderPlaced], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]: ...
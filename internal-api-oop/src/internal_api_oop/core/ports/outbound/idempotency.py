@@ -12,7 +12,7 @@ from internal_api_oop.core.domain.model.order import CustomerId, OrderId
 class IdempotencyRepository(Protocol):
     """
     実DBでは (customer_id, key) に UNIQUE 制約を貼り、
-    start/complete/fail はトランザクション内で行うのが前提。
+    start は INSERT で原子的に「最初の1件だけ勝つ」ようにする。
     """
 
     def get(
@@ -20,15 +20,25 @@ class IdempotencyRepository(Protocol):
     ) -> Result[IdempotencyRecord | None, PlaceOrderError]: ...
 
     def start(
-        self, customer_id: CustomerId, key: str, order_id: OrderId
+        self,
+        customer_id: CustomerId,
+        key: str,
+        order_id: OrderId,
+        request_hash: str,
     ) -> Result[None, PlaceOrderError]:
-        """キーが未登録なら IN_PROGRESS を登録（原子的であることが望ましい）。"""
+        """未登録なら IN_PROGRESS を登録。既に存在する場合は Failure を返す想定。"""
         ...
 
     def complete(
-        self, customer_id: CustomerId, key: str
+        self,
+        customer_id: CustomerId,
+        key: str,
+        response_snapshot_json: str,
     ) -> Result[None, PlaceOrderError]: ...
 
     def fail(
-        self, customer_id: CustomerId, key: str, previous_error: str
+        self,
+        customer_id: CustomerId,
+        key: str,
+        previous_error: str,
     ) -> Result[None, PlaceOrderError]: ...
@@ -5,6 +5,7 @@ from typing import Protocol, Sequence
 
 from returns.result import Result
 
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PlaceOrderError
 from internal_api_oop.core.domain.model.order import Sku
 
@@ -15,7 +16,35 @@ class Reservation:
     quantity: int
 
 
+@dataclass(frozen=True)
+class Hold:
+    """在庫の仮押さえ。confirm しないまま期限が来ると自動で在庫に戻る。"""
+
+    hold_id: str
+    reservations: tuple[Reservation, ...]
+
+
 class InventoryGateway(Protocol):
-    def reserve(
-        self, reservations: Sequence[Reservation]
+    def hold(
+        self, reservations: Sequence[Reservation], *, deadline: Deadline | None = None
+    ) -> Result[Hold, PlaceOrderError]: ...
+
+    def confirm(
+        self, hold: Hold, *, deadline: Deadline | None = None
     ) -> Result[None, PlaceOrderError]: ...
+
+    def release(
+        self, hold: Hold, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]: ...
+
+    # まとめ処理（1 往復で複数注文分）。結果は入力と同じ順で、注文ごとに成否が分かれる
+    def hold_many(
+        self,
+        batch: Sequence[Sequence[Reservation]],
+        *,
+        deadline: Deadline | None = None,
+    ) -> Sequence[Result[Hold, PlaceOrderError]]: ...
+
+    def confirm_many(
+        self, holds: Sequence[Hold], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[None, PlaceOrderError]]: ...
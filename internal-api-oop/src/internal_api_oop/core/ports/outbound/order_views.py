@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Protocol, Sequence
+
+from returns.result import Result
+
+from internal_api_oop.core.domain.model.errors import PlaceOrderError
+from internal_api_oop.core.domain.model.order import CustomerId, OrderId
+from internal_api_oop.core.ports.inbound.get_order import OrderView
+from internal_api_oop.core.ports.inbound.list_orders import OrderSummaryView
+
+
+# 参照専用の読み取りモデル（CQRS の read side）。書き込み側とは別の構造から、
+# 作成済みのビューをそのまま返す。書き込みからの反映は非同期なので結果整合。
+class OrderViewRepository(Protocol):
+    def get_view(self, order_id: OrderId) -> Result[OrderView, PlaceOrderError]: ...
+
+    def list_views(
+        self,
+        offset: int,
+        limit: int,
+        customer_id: CustomerId | None = None,
+        sort_by: str = "created_at",
+        sort_dir: str = "desc",
+    ) -> Result[Sequence[OrderSummaryView], PlaceOrderError]: ...
@@ -4,12 +4,20 @@ from typing import Protocol, Sequence
 
 from returns.result import Result
 
+from internal_api_oop.core.domain.model.customer import CustomerSummary
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PlaceOrderError
 from internal_api_oop.core.domain.model.order import CustomerId, Order, OrderId
 
 
 class OrderRepository(Protocol):
-    def save(self, order: Order) -> Result[OrderId, PlaceOrderError]: ...
+    def save(
+        self, order: Order, *, deadline: Deadline | None = None
+    ) -> Result[OrderId, PlaceOrderError]: ...
+
+    def save_many(
+        self, orders: Sequence[Order], *, deadline: Deadline | None = None
+    ) -> Sequence[Result[OrderId, PlaceOrderError]]: ...
 
     def get(self, order_id: OrderId) -> Result[Order, PlaceOrderError]: ...
 
@@ -21,3 +29,8 @@ class OrderRepository(Protocol):
         sort_by: str = "created_at",
         sort_dir: str = "desc",
     ) -> Result[Sequence[Order], PlaceOrderError]: ...
+
+    # save のたびに差分で更新される顧客ごとの集計（注文の無い顧客は CustomerNotFound）
+    def customer_summary(
+        self, customer_id: CustomerId
+    ) -> Result[CustomerSummary, PlaceOrderError]: ...
@@ -5,6 +5,7 @@ from typing import Protocol
 
 from returns.result import Result
 
+from internal_api_oop.core.domain.model.deadline import Deadline
 from internal_api_oop.core.domain.model.errors import PlaceOrderError
 from internal_api_oop.core.domain.model.order import CustomerId, Money
 
@@ -14,7 +15,26 @@ class ChargeRequest:
     customer_id: CustomerId
     amount: Money
     token: str
+    idempotency_key: str | None = None  # 再送しても二重与信にならないためのキー
+
+
+@dataclass(frozen=True)
+class Authorization:
+    """与信（枠の確保）。capture で確定、void で解放する。"""
+
+    authorization_id: str
+    amount: Money
 
 
 class PaymentGateway(Protocol):
-    def charge(self, request: ChargeRequest) -> Result[None, PlaceOrderError]: ...
+    def authorize(
+        self, request: ChargeRequest, *, deadline: Deadline | None = None
+    ) -> Result[Authorization, PlaceOrderError]: ...
+
+    def capture(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]: ...
+
+    def void(
+        self, authorization: Authorization, *, deadline: Deadline | None = None
+    ) -> Result[None, PlaceOrderError]: ...
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Any, ContextManager, Protocol
+
+
+class SpanFactory(Protocol):
+    """
+    core 側から子 span を切るための最小限の口（ポート呼び出しの span は adapter 側で付ける）。
+    採っていないリクエストでは何もしない context manager を返す想定。
+    """
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Any]: ...